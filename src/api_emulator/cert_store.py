@@ -0,0 +1,241 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# TLS Certificate Store
+#
+# Keeps the HTTPS certificate and key of each emulator on disk so that a
+# restarted emulator reuses them instead of generating a new key pair (see
+# TLS_CERT_DIR in emulator.py). Certificates are stored by name, the xname of
+# the emulated BMC or the hostname, as <name>.crt and <name>.key.
+#
+# A stored certificate is reused as long as it matches the requested name,
+# key type and issuer and is not about to expire. Otherwise a new key pair and
+# certificate are generated. Certificates are self-signed unless a local CA is
+# given, in which case they are issued by the CA so that clients of a whole
+# fleet of emulators only need to trust the CA. A CA and certificates for a
+# list of names can be created ahead of time with:
+#
+#   python3 -m api_emulator.cert_store -dir <dir> -ca-cert ca.crt -ca-key ca.key <name> [...]
+
+import argparse
+import datetime
+import logging
+import os
+import time
+
+from cryptography import x509
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from cryptography.x509.oid import NameOID
+
+KEY_TYPES = ['RSA', 'ECDSA']
+
+# Certificates are valid for 10 years and replaced 30 days before they expire
+VALID_DAYS = 10 * 365
+RENEW_DAYS = 30
+
+ORGANIZATION = 'Hewlett Packard Enterprise Development LP'
+
+class CertStoreError(Exception):
+    pass
+
+def generate_key(key_type):
+    """
+    Generates a private key, RSA 2048 or ECDSA P-256
+    """
+    if key_type.upper() == 'ECDSA':
+        return ec.generate_private_key(ec.SECP256R1())
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+def key_type_of(key):
+    if isinstance(key, ec.EllipticCurvePrivateKey):
+        return 'ECDSA'
+    return 'RSA'
+
+def subject(name):
+    return x509.Name([
+        x509.NameAttribute(NameOID.COUNTRY_NAME, 'US'),
+        x509.NameAttribute(NameOID.ORGANIZATION_NAME, ORGANIZATION),
+        x509.NameAttribute(NameOID.COMMON_NAME, name),
+    ])
+
+def build_certificate(name, key, issuer_name=None, issuer_key=None, ca=False):
+    """
+    Returns a certificate for name and key, signed with sha256 by issuer_key
+    (self-signed if no issuer is given)
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if issuer_key is None:
+        issuer_name, issuer_key = subject(name), key
+    builder = x509.CertificateBuilder() \
+        .subject_name(subject(name)) \
+        .issuer_name(issuer_name) \
+        .public_key(key.public_key()) \
+        .serial_number(x509.random_serial_number()) \
+        .not_valid_before(now - datetime.timedelta(minutes=5)) \
+        .not_valid_after(now + datetime.timedelta(days=VALID_DAYS)) \
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+    if not ca:
+        builder = builder.add_extension(x509.SubjectAlternativeName([x509.DNSName(name)]), critical=False)
+    return builder.sign(issuer_key, hashes.SHA256())
+
+def write_pem(path, data, mode=0o644):
+    """
+    Writes path through a temporary file so a reader never sees a partial file
+    """
+    tmp_path = '%s.%d.tmp' % (path, os.getpid())
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def key_pem(key):
+    return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                             serialization.NoEncryption())
+
+def read_certificate(cert_file, key_file):
+    with open(cert_file, 'rb') as f:
+        cert = x509.load_pem_x509_certificate(f.read())
+    with open(key_file, 'rb') as f:
+        # The RSA key checks take longer than generating an ECDSA key. The
+        # key is compared against the certificate before it is used.
+        key = serialization.load_pem_private_key(f.read(), password=None, unsafe_skip_rsa_key_validation=True)
+    return cert, key
+
+class CertStore(object):
+    """
+    Directory of TLS certificates and keys by name
+
+    Arguments:
+        directory - Where the certificates and keys are kept
+        key_type  - 'RSA' or 'ECDSA', the type of key for new certificates
+        ca_cert   - Certificate file of the CA that issues the certificates,
+                    or None for self-signed certificates
+        ca_key    - Key file of the CA
+    """
+    def __init__(self, directory, key_type='RSA', ca_cert=None, ca_key=None):
+        if key_type.upper() not in KEY_TYPES:
+            raise CertStoreError('Unknown key type: ' + key_type)
+        self.directory = directory
+        self.key_type = key_type.upper()
+        self.ca = None
+        if ca_cert:
+            if not ca_key:
+                raise CertStoreError('A CA certificate needs a CA key')
+            try:
+                self.ca = read_certificate(ca_cert, ca_key)
+            except (OSError, ValueError) as e:
+                raise CertStoreError('Can not load CA %s: %s' % (ca_cert, e))
+
+    def paths(self, name):
+        base = os.path.join(self.directory, name)
+        return base + '.crt', base + '.key'
+
+    def valid(self, name, cert, key):
+        """
+        True if the stored certificate and key can be reused for name
+        """
+        if cert.public_key().public_numbers() != key.public_key().public_numbers():
+            return False
+        if key_type_of(key) != self.key_type:
+            return False
+        if not isinstance(cert.signature_hash_algorithm, hashes.SHA256):
+            return False
+        names = cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+        if not names or names[0].value != name:
+            return False
+        renew = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=RENEW_DAYS)
+        if cert.not_valid_after_utc < renew:
+            return False
+        issuer = self.ca[0] if self.ca else cert
+        try:
+            cert.verify_directly_issued_by(issuer)
+        except (ValueError, TypeError, InvalidSignature):
+            return False
+        return True
+
+    def certificate(self, name):
+        """
+        Returns the (certificate file, key file) for name, generating a new
+        key and certificate unless a valid one is stored
+        """
+        start = time.time()
+        cert_file, key_file = self.paths(name)
+        try:
+            cert, key = read_certificate(cert_file, key_file)
+            if self.valid(name, cert, key):
+                logging.info('Reusing TLS certificate %s (%.1f ms)' % (cert_file, (time.time() - start) * 1000))
+                return cert_file, key_file
+        except (OSError, ValueError):
+            pass
+
+        os.makedirs(self.directory, exist_ok=True)
+        key = generate_key(self.key_type)
+        if self.ca:
+            cert = build_certificate(name, key, self.ca[0].subject, self.ca[1])
+        else:
+            cert = build_certificate(name, key)
+        # Write the key first, a certificate without its key is not reused
+        write_pem(key_file, key_pem(key), 0o600)
+        write_pem(cert_file, cert.public_bytes(serialization.Encoding.PEM))
+        logging.info('Generated %s TLS certificate %s (%.1f ms)' %
+                     (self.key_type, cert_file, (time.time() - start) * 1000))
+        return cert_file, key_file
+
+def create_ca(ca_cert, ca_key, key_type='RSA', name='Redfish Interface Emulator CA'):
+    """
+    Creates a local CA certificate and key
+    """
+    key = generate_key(key_type)
+    cert = build_certificate(name, key, ca=True)
+    write_pem(ca_key, key_pem(key), 0o600)
+    write_pem(ca_cert, cert.public_bytes(serialization.Encoding.PEM))
+
+def main():
+    argparser = argparse.ArgumentParser(description='Create TLS certificates for emulators ahead of time')
+    argparser.add_argument('names', nargs='*', help='xnames or hostnames to create certificates for')
+    argparser.add_argument('-dir', type=str, default='certs', help='Certificate store directory')
+    argparser.add_argument('-key-type', type=str, default='RSA', choices=KEY_TYPES, help='Type of the keys')
+    argparser.add_argument('-ca-cert', type=str, default=None, help='CA certificate file, created if it does not exist')
+    argparser.add_argument('-ca-key', type=str, default=None, help='CA key file')
+    args = argparser.parse_args()
+
+    if args.ca_cert and not os.path.exists(args.ca_cert):
+        if not args.ca_key:
+            argparser.error('-ca-key is required with -ca-cert')
+        create_ca(args.ca_cert, args.ca_key, args.key_type)
+        print('Created CA %s' % args.ca_cert)
+    store = CertStore(args.dir, args.key_type, args.ca_cert, args.ca_key)
+    for name in args.names:
+        print('%s %s' % store.certificate(name))
+
+if __name__ == '__main__':
+    main()
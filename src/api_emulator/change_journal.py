@@ -0,0 +1,111 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Change Journal
+#
+# Records the paths of the resources that change while the emulator runs,
+# so that clients can ask what changed since they last looked instead of
+# crawling the tree again. Each emulator instance has its own journal, which
+# is started once its resources are set up (see resource_manager.py), so
+# loading the mockup is not recorded.
+#
+# Each change gets the next journal version. Only the last entries are
+# kept, a client that asks for changes older than those is told that the
+# list is incomplete and has to read the resources again.
+
+import datetime
+import threading
+from collections import deque
+
+# Entries kept by default, see CHANGE_JOURNAL_SIZE in emulator.py
+JOURNAL_SIZE = 1000
+
+class ChangeJournal():
+    """
+    Arguments:
+        size - Number of entries kept
+    """
+    def __init__(self, size=JOURNAL_SIZE):
+        self.entries = deque(maxlen=max(size, 1))
+        self.version = 0
+        self.changed = threading.Condition()
+        # Paths changed since the journal started or take_paths() was called,
+        # kept apart from the entries so that dropped entries are not missed
+        self.paths = set()
+        # Functions called with (path, deleted) after each change, e.g. to
+        # drop the cached response of the resource (see response_cache.py)
+        self.listeners = []
+
+    def record(self, path, deleted=False):
+        """
+        Records a change of the resource at path, its '@odata.id', or that
+        it was deleted
+        """
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds')
+        with self.changed:
+            self.version += 1
+            self.entries.append((self.version, path, now, deleted))
+            self.paths.add(path)
+            self.changed.notify_all()
+        for listener in self.listeners:
+            listener(path, deleted)
+
+    def take_paths(self):
+        """
+        Returns the paths changed since the journal started or since the last
+        call, and starts a new set
+        """
+        with self.changed:
+            paths, self.paths = self.paths, set()
+        return paths
+
+    def since(self, version, wait=0):
+        """
+        Returns (version, complete, changes) for the changes after version.
+        changes holds (version, path, time, deleted) of the last change of
+        each path, oldest first. complete is False if changes after version have been
+        dropped from the journal, or if version is newer than the journal,
+        e.g. when the emulator was restarted. If version is the current
+        version, waits up to wait seconds for a change.
+        """
+        with self.changed:
+            if wait > 0:
+                self.changed.wait_for(lambda: self.version != version, wait)
+            current = self.version
+            entries = [e for e in self.entries if e[0] > version]
+        if version < current:
+            complete = entries[0][0] == version + 1
+        else:
+            complete = version == current
+        latest = {}
+        for entry in entries:
+            latest.pop(entry[1], None)
+            latest[entry[1]] = entry
+        return current, complete, list(latest.values())
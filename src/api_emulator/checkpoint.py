@@ -0,0 +1,155 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Checkpoints
+#
+# A checkpoint is the complete state of an emulator instance in one file, so
+# that a long running BMC can be frozen and booted again later, or a warmed
+# up BMC cloned into many identical ones. GET /redfish/v1/Emulator/Checkpoint
+# returns the checkpoint of an instance, and with CHECKPOINT (see emulator.py)
+# the instances that emulate the mockup of the checkpoint boot from it.
+#
+# A checkpoint is a snapshot (see snapshot.py) of every resource of the
+# instance as it is: the identities that the loader randomized, and the
+# resources that clients changed, added or deleted. Its state holds what is
+# not kept in documents: the accounts with their passwords, the firmware
+# updates that are queued, and the power transitions in progress.
+#
+# Booting from a checkpoint loads it like a snapshot, without walking or
+# randomizing the mockup. The loader then sets up the dynamic resources
+# from the restored resources as it does for the state store, keeping the
+# subscriptions and sessions, after which the updates are queued again and
+# the power transitions are finished.
+
+import logging
+import os
+import sys
+
+from . import instance
+from .link_graph import link_graph
+from .path_trie import canonical
+from .snapshot import Snapshot, SnapshotError, write_snapshot
+from .static_loader import static_dir
+from .redfish.redfish_auth import auth, User, ROLES
+from .redfish import computer_system_api, chassis_api, manager_api
+from .redfish.update_service_api import PendingUpdates, ResumeUpdates
+
+CHECKPOINT_EXT = '.checkpoint'
+
+# Dynamic resources whose power transitions are kept
+POWER_MODULES = [computer_system_api, chassis_api, manager_api]
+
+# Opened checkpoints by file name, one is booted by many instances
+_checkpoints = {}
+
+def open_checkpoint(path):
+    """
+    Returns the Snapshot of the checkpoint file path, which is opened on the
+    first call. Raises SnapshotError if the file is not a checkpoint.
+    """
+    checkpoint = _checkpoints.get(path)
+    if checkpoint is None:
+        checkpoint = Snapshot(path)
+        if checkpoint.state is None:
+            raise SnapshotError('%s is a snapshot, not a checkpoint' % path)
+        checkpoint = _checkpoints.setdefault(path, checkpoint)
+    return checkpoint
+
+def checkpoint_for(config_data, mockup):
+    """
+    Returns the checkpoint of config_data['checkpoint'] if it is a checkpoint
+    of mockup, otherwise None
+    """
+    path = config_data.get('checkpoint')
+    if not path:
+        return None
+    checkpoint = open_checkpoint(path)
+    if checkpoint.state['mockup'] != mockup:
+        return None
+    return checkpoint
+
+def write_checkpoint(inst, path):
+    """
+    Writes the checkpoint of instance inst to the file path and returns the
+    number of resources in it
+    """
+    resource_dictionary = inst.resource_dictionary
+    documents = {}
+    for p, obj in resource_dictionary.walk(''):
+        raw = obj.raw
+        documents[p] = bytes(raw) if raw is not None else obj.view
+    with instance.activate(inst):
+        # Resources that only dynamic resources hold, e.g. added accounts,
+        # sessions and subscriptions
+        documents.update(instance.dynamic_documents(inst))
+        links = link_graph(inst).outgoing
+        state = {
+            'instance': inst.name,
+            'mockup': inst.mockup,
+            'users': [(u.username, u.password, u.role) for u in auth.get_users().values()],
+            'updates': PendingUpdates(),
+            'resets': [(module.__name__, ident) for module in POWER_MODULES
+                       for ident, thread in module.members_reset_thread.items()
+                       if thread is not None and thread.is_alive() and not thread.cancelled()]
+        }
+    base_dir = static_dir(inst.mockup, 'redfish')
+    artifacts = dict(getattr(resource_dictionary, 'base', resource_dictionary).artifacts)
+    artifacts.update(resource_dictionary.artifacts)
+    artifacts = {p: os.path.relpath(a.path, base_dir) for p, a in artifacts.items()}
+    count = write_snapshot(path, documents.items(), artifacts, state, links)
+    logging.info('Wrote checkpoint of %s with %d resources to %s' % (inst.name, count, path))
+    return count
+
+def restore_checkpoint(inst, checkpoint):
+    """
+    Restores what instance inst needs besides the resources of the
+    checkpoint, which load_static() loaded. Called before the loader runs.
+    """
+    state = checkpoint.state
+    with instance.activate(inst):
+        auth.set_users({username: User(username, password, role, ROLES.get(role, {}))
+                        for username, password, role in state['users']})
+    inst.restored |= set(canonical(p) for p in checkpoint.paths())
+    inst.checkpoint = state
+    logging.info('Booting %s from checkpoint %s of %s' % (inst.name, checkpoint.path, state['instance']))
+
+def resume_checkpoint(inst):
+    """
+    Queues the firmware updates of the checkpoint of instance inst again and
+    finishes its power transitions. Called once the loader has run.
+    """
+    state = inst.checkpoint
+    with instance.activate(inst):
+        ResumeUpdates(state['updates'])
+        for name, ident in state['resets']:
+            module = sys.modules[name]
+            if ident in module.members:
+                module.members_reset_thread[ident] = module.PowerOnWorker(ident)
+                module.members_reset_thread[ident].start()
@@ -0,0 +1,102 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Response Compression
+#
+# Responses are compressed with the content coding that the client prefers
+# in Accept-Encoding: gzip, or brotli (br) when the brotli package is
+# installed, which is not required. The compressed responses of static
+# resources are kept next to their JSON text by the response cache (see
+# response_cache.py), so they are compressed once, at a higher level.
+# Other responses are compressed on every request, and only when they are
+# at least COMPRESSION_THRESHOLD bytes, below which compression costs more
+# time than it saves. RESPONSE_COMPRESSION=Disable sends every response
+# uncompressed (see emulator.py).
+
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from flask import request
+
+from . import instance
+
+def gzip_compress(body, level):
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+def brotli_compress(body, level):
+    return brotli.compress(bytes(body), quality=level)
+
+# Compress function and the levels of kept and other responses by content
+# coding
+CODINGS = {'gzip': (gzip_compress, 9, 6)}
+if brotli is not None:
+    CODINGS['br'] = (brotli_compress, 9, 4)
+
+# Content codings in order of preference when a client accepts several
+OFFERS = [coding for coding in ('br', 'gzip') if coding in CODINGS]
+
+def negotiate():
+    """
+    Returns the content coding of the response to the current request, or
+    None to send it uncompressed
+    """
+    if instance.current().compression_threshold is None or 'HTTP_ACCEPT_ENCODING' not in request.environ:
+        return None
+    return request.accept_encodings.best_match(OFFERS)
+
+def compress(body, coding, kept=False):
+    """
+    Returns body compressed with the content coding, at the higher level
+    if the response is kept
+    """
+    function, kept_level, level = CODINGS[coding]
+    return function(body, kept_level if kept else level)
+
+def compressible(body):
+    """
+    Whether a response that is not kept is large enough to be compressed
+    """
+    threshold = instance.current().compression_threshold
+    return threshold is not None and len(body) >= threshold
+
+def set_coding(resp, coding):
+    """
+    Sets the Content-Encoding of the response resp, None if it is not
+    compressed, and Vary: Accept-Encoding, and returns it
+    """
+    if instance.current().compression_threshold is not None:
+        resp.vary.add('Accept-Encoding')
+        if coding is not None and resp.status_code != 304:
+            resp.headers['Content-Encoding'] = coding
+    return resp
@@ -0,0 +1,394 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Emulator Instance
+#
+# An Instance is one emulated BMC: its Flask app and routes, its resource
+# dictionary, the state of the dynamic resource modules, and its startup
+# report. Any number of instances can live in one process.
+#
+# The instance that the code runs for is the current instance. It is set
+# for each request by InstanceDispatcher, which picks the instance from the
+# host name of the request, and by activate() while an instance is set up.
+# Everything else runs for the default instance, the one created by g.py.
+#
+# Dynamic resource modules keep their per-instance state in InstanceDict
+# and InstanceState objects, which look up the current instance on each
+# access. Threads do not inherit the current instance, worker threads that
+# use the state of an instance are InstanceThreads.
+#
+# Resources that worker threads change while requests read them are kept in
+# VersionedDicts. Their documents are never modified once published, a
+# change publishes a new version of the document instead.
+#
+# Once its resources are set up an instance records the changes of its
+# resources in its change journal (see change_journal.py). Assigning or
+# deleting a document in an InstanceDict records its '@odata.id', changes
+# made to a document in place are recorded with InstanceDict.changed() or
+# record_change().
+
+import contextvars
+import logging
+import marshal
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+from flask import Flask
+from flask_restful import Api
+
+from .path_trie import canonical
+from .resource_dictionary import ResourceDictionary
+from .startup_report import StartupReport
+
+_current = contextvars.ContextVar('emulator_instance')
+
+# The instances other than the default, by name
+instances = {}
+
+# The instance created by g.py
+default = None
+
+class InstanceError(Exception):
+    pass
+
+class Instance():
+    """
+    Arguments:
+        name   - Name of the instance, the host name that its requests use
+        mockup - Mockup folder of the instance
+        app    - Flask app, a new one is created if not given
+    """
+    def __init__(self, name, mockup=None, app=None):
+        self.name = name
+        self.mockup = mockup
+        self.app = app or Flask(__name__)
+        self.api = Api(self.app)
+        self.state = {}
+        self.resource_dictionary = ResourceDictionary()
+        self.report = StartupReport(self)
+        self.resource_manager = None
+        self.journal = None
+        # Baseline that a reset returns to, see pristine.py
+        self.pristine = None
+        # Incremented by each reset, worker threads started before a reset
+        # stop changing resources
+        self.generation = 0
+        # Canonical paths of the resources restored by the state store or
+        # from a checkpoint
+        self.restored = set()
+        # State of the checkpoint the instance was booted from, see
+        # checkpoint.py
+        self.checkpoint = None
+        # (journal version, LinkGraph) of the last link graph, see
+        # link_graph.py
+        self.link_graph = None
+        # Responses to GETs, None if RESPONSE_CACHE is disabled, see
+        # response_cache.py
+        self.response_cache = None
+        # Whether responses are pretty JSON rather than compact, see
+        # JSON_OUTPUT in emulator.py
+        self.pretty = True
+        # Size from which responses that are not kept are compressed, None
+        # if RESPONSE_COMPRESSION is disabled, see compression.py
+        self.compression_threshold = None
+
+def current():
+    """
+    Returns the instance the code runs for
+    """
+    return _current.get(default)
+
+@contextmanager
+def activate(instance):
+    """
+    Makes instance the current instance in the body of the with statement
+    """
+    token = _current.set(instance)
+    try:
+        yield instance
+    finally:
+        _current.reset(token)
+
+def create_default(app):
+    """
+    Creates the default instance for the Flask app of g.py
+    """
+    global default
+    default = Instance('default', app=app)
+    return default
+
+def create(name, mockup):
+    """
+    Creates and returns an instance that is served for requests to the host
+    name. Its resources are set up by emulator.py.
+    """
+    if name in instances or name == default.name:
+        raise InstanceError('Duplicate emulator instance %s' % name)
+    instance = Instance(name, mockup)
+    # Same JSON output as the default instance, see emulator.py
+    instance.api.representations = default.api.representations
+    if not instances:
+        default.app.wsgi_app = InstanceDispatcher(default.app.wsgi_app)
+    instances[name] = instance
+    logging.info('Created emulator instance %s for mockup %s' % (name, mockup))
+    return instance
+
+class InstanceDispatcher():
+    """
+    WSGI middleware in front of the default instance's app that sends each
+    request to the app of the instance named by the host name of the request.
+    Requests for other host names go to the default instance.
+    """
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        host = environ.get('HTTP_HOST') or environ.get('SERVER_NAME', '')
+        instance = instances.get(host.rsplit(':', 1)[0].lower())
+        if instance is None:
+            return self.wsgi_app(environ, start_response)
+        with activate(instance):
+            return instance.app.wsgi_app(environ, start_response)
+
+def record_change(document, collection=False, deleted=False):
+    """
+    Records a change of a dynamic resource document in the change journal
+    of the current instance, or that it was deleted, and a change of the
+    collection it is a member of if collection is True. Documents without
+    an '@odata.id' are not recorded.
+    """
+    journal = current().journal
+    if journal is None or not isinstance(document, dict):
+        return
+    path = document.get('@odata.id')
+    if isinstance(path, str):
+        journal.record(path, deleted)
+        if collection:
+            journal.record(path.rstrip('/').rsplit('/', 1)[0])
+
+class InstanceThread(threading.Thread):
+    """
+    Thread that runs for the instance that was current when it was created
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.instance = current()
+        self.generation = self.instance.generation
+        run = self.run
+
+        def run_for_instance():
+            with activate(self.instance):
+                run()
+        self.run = run_for_instance
+
+    def cancelled(self):
+        """
+        Returns True if the instance was reset after the thread was created
+        """
+        return self.instance.generation != self.generation
+
+class InstanceDict(MutableMapping):
+    """
+    Dictionary of the current instance. A module level
+
+        members = InstanceDict(__name__, 'members')
+
+    behaves like a module level dictionary, but each instance has its own.
+    """
+    def __init__(self, module, name):
+        self.key = '%s.%s' % (module, name)
+
+    def _dict(self):
+        return current().state.setdefault(self.key, {})
+
+    def __getitem__(self, key):
+        return self._dict()[key]
+
+    def __setitem__(self, key, value):
+        d = self._dict()
+        added = key not in d
+        d[key] = value
+        record_change(value, added)
+
+    def __delitem__(self, key):
+        record_change(self._dict().pop(key), True, True)
+
+    def changed(self, key):
+        """
+        Records a change made in place to the document of key
+        """
+        record_change(self._dict()[key])
+
+    def __contains__(self, key):
+        return key in self._dict()
+
+    def __iter__(self):
+        return iter(self._dict())
+
+    def __len__(self):
+        return len(self._dict())
+
+    def copy(self):
+        return self._dict().copy()
+
+class VersionedStore():
+    """
+    Published documents of a VersionedDict for one instance, with the
+    version number of each key and the lock that serializes the writers
+    """
+    def __init__(self):
+        self.documents = {}
+        self.versions = {}
+        self.lock = threading.Lock()
+
+    def publish(self, key, document):
+        previous = self.documents.get(key)
+        self.versions[key] = self.versions.get(key, 0) + 1
+        self.documents[key] = document
+        if previous is not None and previous is not document:
+            # Most dynamic resources are static resources that the loader
+            # handed out, the catch-all route answers their GETs from the
+            # resource dictionary
+            current().resource_dictionary.replace_configuration(previous, document)
+        record_change(document, previous is None)
+
+class VersionedDict(InstanceDict):
+    """
+    InstanceDict of documents that are read while other threads change them.
+    A published document is never modified, so a request can serialize the
+    document it got without a lock and without seeing a partial change.
+    Writers change a copy and publish it as the next version:
+
+        with members.edit(ident) as system:
+            system['PowerState'] = 'Off'
+            system['Status']['State'] = 'Disabled'
+
+    Assigning a document publishes it as is, the caller must not modify it
+    afterwards. Writers of the same dictionary are serialized, an edit must
+    not start another edit of the same dictionary. Version numbers start at
+    1 and are not reused when a key is deleted and assigned again.
+    """
+    def _store(self):
+        state = current().state
+        store = state.get(self.key)
+        if store is None:
+            store = state.setdefault(self.key, VersionedStore())
+        return store
+
+    def _dict(self):
+        return self._store().documents
+
+    def __setitem__(self, key, value):
+        store = self._store()
+        with store.lock:
+            store.publish(key, value)
+
+    def __delitem__(self, key):
+        store = self._store()
+        with store.lock:
+            record_change(store.documents.pop(key), True, True)
+
+    def changed(self, key):
+        raise TypeError('Documents of a VersionedDict are not changed in place, use edit()')
+
+    def version(self, key):
+        """
+        Returns the version number of the document of key, 0 if it was
+        never published
+        """
+        return self._store().versions.get(key, 0)
+
+    @contextmanager
+    def edit(self, key):
+        """
+        Yields a copy of the document of key and publishes it as the next
+        version at the end of the with statement, unless the body raises
+        """
+        store = self._store()
+        with store.lock:
+            # The documents only hold JSON types, which marshal copies
+            # faster than copy.deepcopy
+            document = marshal.loads(marshal.dumps(store.documents[key]))
+            yield document
+            store.publish(key, document)
+
+class InstanceState():
+    """
+    Module variables of the current instance, for variables that are
+    assigned rather than modified in place. A module level
+
+        state = InstanceState(__name__, collection_config={})
+
+    gives each instance its own state.collection_config, initially {}.
+    Defaults are copied for each instance.
+    """
+    def __init__(self, module, **defaults):
+        object.__setattr__(self, 'key', module)
+        object.__setattr__(self, 'defaults', defaults)
+
+    def _vars(self):
+        state = current().state
+        variables = state.get(self.key)
+        if variables is None:
+            variables = state[self.key] = {k: copy_default(v) for k, v in self.defaults.items()}
+        return variables
+
+    def __getattr__(self, name):
+        try:
+            return self._vars()[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self._vars()[name] = value
+
+def copy_default(value):
+    if isinstance(value, (dict, list)):
+        return type(value)(value)
+    return value
+
+def dynamic_documents(inst):
+    """
+    Returns the documents that the dynamic resources of instance inst keep
+    in InstanceDicts, VersionedDicts and InstanceStates, by canonical path
+    """
+    documents = {}
+    for values in list(inst.state.values()):
+        if isinstance(values, VersionedStore):
+            values = values.documents
+        if not isinstance(values, dict):
+            continue
+        for value in list(values.values()):
+            if isinstance(value, dict):
+                path = value.get('@odata.id')
+                if isinstance(path, str):
+                    documents[canonical(path)] = value
+    return documents
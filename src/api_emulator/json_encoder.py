@@ -0,0 +1,116 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# JSON Encoder
+#
+# Encodes the documents of the responses. By default (JSON_ENCODER=Auto,
+# see emulator.py) pretty JSON is encoded with the json module of the
+# standard library, so that it does not change with the packages that are
+# installed, and compact JSON with the fastest encoder that is installed:
+# orjson, then ujson, then the json module. JSON_ENCODER can also pick one
+# encoder for both. Neither orjson nor ujson is required. A document that
+# the selected encoder can not encode, e.g. an integer that does not fit in
+# 64 bits, is encoded with the json module instead.
+#
+# Compact JSON has no whitespace between its tokens. Pretty JSON is
+# indented by 4 spaces, or by 2 with orjson, which has no other indent.
+# orjson also encodes NaN and Infinity as null.
+
+import json
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+def json_dumps(document, pretty):
+    if pretty:
+        return json.dumps(document, indent=4).encode()
+    return json.dumps(document, separators=(',', ':')).encode()
+
+def orjson_dumps(document, pretty):
+    option = orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(document, option=option)
+
+def ujson_dumps(document, pretty):
+    return ujson.dumps(document, indent=4 if pretty else 0, escape_forward_slashes=False).encode()
+
+# (name, module, dumps) of the encoders, fastest first
+ENCODERS = [('orjson', orjson, orjson_dumps),
+            ('ujson', ujson, ujson_dumps),
+            ('json', json, json_dumps)]
+
+# Name of the selected encoder, and its functions for pretty and compact JSON
+encoder = 'json'
+_pretty_dumps = json_dumps
+_dumps = json_dumps
+
+def installed():
+    """
+    Returns the names of the encoders that are installed, fastest first
+    """
+    return [name for name, module, dumps in ENCODERS if module is not None]
+
+def select(name='Auto'):
+    """
+    Selects the encoder by name, and returns its name. 'Auto' selects the
+    fastest one that is installed for compact JSON and the json module for
+    pretty JSON.
+    """
+    global encoder, _pretty_dumps, _dumps
+    auto = name.lower() == 'auto'
+    for n, module, dumps in ENCODERS:
+        if module is not None and (auto or name.lower() == n):
+            encoder, _dumps = n, dumps
+            _pretty_dumps = json_dumps if auto else dumps
+            logging.info('Using JSON encoder %s%s' % (n, ' for compact JSON' if auto and n != 'json' else ''))
+            return n
+    raise ValueError('JSON encoder %s is not installed' % name)
+
+def dumps(document, pretty=True):
+    """
+    Returns the JSON text of document, as bytes
+    """
+    try:
+        if pretty:
+            return _pretty_dumps(document, pretty)
+        return _dumps(document, pretty)
+    except (TypeError, ValueError, OverflowError):
+        return json_dumps(document, pretty)
+
+select()
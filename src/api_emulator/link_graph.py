@@ -0,0 +1,170 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Link Graph
+#
+# The '@odata.id' links between the resources of an emulator instance: the
+# resources each one links to and is linked from, the links that lead to no
+# resource, and the resources that nothing links to. A crawler such as HSM
+# discovery follows the links, so dangling links cost it a 404 each, and an
+# orphaned resource is only found by a client that knows its path.
+#
+# The links of a resource are found once and kept on its Member until the
+# resource is handed out for modification (see Member.configuration), after
+# which they are found again each time. Snapshots store the links of their
+# documents (see build_snapshot() in static_loader.py), so resources loaded
+# from a snapshot, lazily or as JSON text, need not be parsed for
+# them. The graph of an instance is built on first use and again after
+# changes are recorded in its change journal.
+
+from .path_trie import REST_BASE, canonical
+
+def document_links(document, path=None):
+    """
+    Returns the canonical paths that document links to, in the order of
+    first appearance. The '@odata.id' of the document itself, fragments
+    (e.g. Power#/PowerControl/0) and links of path to itself are left out.
+    """
+    links = {}
+    stack = [document]
+    top = True
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key == '@odata.id':
+                    if not top and isinstance(item, str):
+                        target = canonical(item.split('#', 1)[0])
+                        if target != path:
+                            links[target] = None
+                elif isinstance(item, (dict, list)):
+                    stack.append(item)
+        elif isinstance(value, list):
+            stack.extend(value)
+        top = False
+    return tuple(links)
+
+def member_links(path, obj):
+    """
+    Returns the links of the resource object obj at canonical path
+    """
+    links = getattr(obj, 'links', None)
+    if links is None or obj.claimed:
+        links = document_links(obj.view, path)
+        if not obj.claimed:
+            obj.links = links
+    return links
+
+def resolves(resource_dictionary, path):
+    """
+    Whether a link to canonical path leads to a resource or artifact
+    """
+    for get in (resource_dictionary.find_object, resource_dictionary.get_artifact):
+        try:
+            get(path)
+            return True
+        except KeyError:
+            pass
+    return False
+
+def link_path(path):
+    """
+    Returns the '@odata.id' form of canonical path
+    """
+    return REST_BASE + '/' + path if path else REST_BASE + '/'
+
+class LinkGraph():
+    """
+    Arguments:
+        resource_dictionary - Resource dictionary of the instance
+        documents           - Documents kept only by dynamic resources, by
+                              canonical path, e.g. accounts added by clients
+    """
+    def __init__(self, resource_dictionary, documents={}):
+        # Links of each resource
+        self.outgoing = {}
+        for path, obj in resource_dictionary.walk(''):
+            if path not in documents:
+                self.outgoing[path] = member_links(path, obj)
+        for path, document in documents.items():
+            self.outgoing[path] = document_links(document, path)
+        # Resources linking to each linked resource
+        self.incoming = {}
+        # Resources linking to each path that no resource has
+        self.dangling = {}
+        for path, links in self.outgoing.items():
+            for target in links:
+                if target in self.outgoing or resolves(resource_dictionary, target):
+                    self.incoming.setdefault(target, []).append(path)
+                else:
+                    self.dangling.setdefault(target, []).append(path)
+        # Resources that nothing links to, other than the ServiceRoot
+        self.orphans = [path for path in self.outgoing if path and path not in self.incoming]
+        self.links = sum(len(links) for links in self.outgoing.values())
+
+    def summary(self):
+        """
+        Returns the counts, the dangling links and the orphaned resources
+        """
+        return {
+            'Resources': len(self.outgoing),
+            'Links': self.links,
+            'DanglingLinks': [{'Link': link_path(target), 'LinkedFrom': [link_path(p) for p in sources]}
+                              for target, sources in sorted(self.dangling.items())],
+            'Orphans': [link_path(p) for p in sorted(self.orphans)]
+        }
+
+    def resource(self, path):
+        """
+        Returns the links of the resource at canonical path and the resources
+        linking to it. Raises KeyError if there is no such resource.
+        """
+        links = self.outgoing[path]
+        return {
+            'Path': link_path(path),
+            'Links': [link_path(p) for p in links],
+            'LinkedFrom': [link_path(p) for p in self.incoming.get(path, [])],
+            'DanglingLinks': [link_path(p) for p in links if p in self.dangling]
+        }
+
+def link_graph(inst):
+    """
+    Returns the link graph of instance inst, which is built again if
+    changes were recorded in its change journal since the last call
+    """
+    version = inst.journal.version if inst.journal is not None else 0
+    cached = inst.link_graph
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    # instance.py imports this module through static_loader.py
+    from .instance import dynamic_documents
+    graph = LinkGraph(inst.resource_dictionary, dynamic_documents(inst))
+    inst.link_graph = (version, graph)
+    return graph
@@ -36,28 +36,36 @@ import re
 import strgen
 import random
 
+from . import instance
+
 # Resource and SubResource imports
 from .redfish.computer_system_api import ComputerSystemAPI, CreateComputerSystem, ResetAction_API
 from .redfish.chassis_api import ChassisAPI, CreateChassis, ChassisResetActionAPI
 from .redfish.manager_api import ManagerAPI, CreateManager, ManagerResetActionAPI
-from .redfish.update_service_api import UpdateServiceAPI, CreateFirmwareTarget, SimpleUpdateAPI, UpdateServiceConfigAPI
+from .redfish.update_service_api import UpdateServiceAPI, CreateFirmwareTarget, SimpleUpdateAPI, UpdateServiceConfigAPI, RestoreUpdateConfig
 from .redfish.templates.subscriptions import get_subscription_instance
 from .redfish.event_generator import EventGenerator
-from .redfish.event_service_api import CreateEventService
+from .redfish.event_service_api import CreateEventService, RestoreSubscription
 from .redfish.account_service_api import CreateAccountService, CreateAccount, AccountCollectionAPI, AccountAPI
-from .redfish.session_service_api import CreateSessionService, SessionCollectionAPI, SessionAPI
+from .redfish.session_service_api import CreateSessionService, CreateSession, SessionCollectionAPI, SessionAPI
+from .redfish.redfish_auth import auth, Session
 from .redfish.manager_network_protocol_api import ManagerNetworkProtocolAPI, CreateNetworkProtocol
+from .link_graph import resolves
+from .path_trie import canonical
 
 import api_emulator.redfish.power_control_api as generic_power
-import api_emulator.redfish.hpe_cray_ex_power_control_api as hpe_cray_ex_power
-import api_emulator.redfish.proliant_ilo_power_control_api as ilo_power
-import api_emulator.redfish.hpe_cray_ex_certificate_service_api as hpe_cray_ex_cert
-# import api_emulator.redfish.proliant_ilo_certificate_service_api as ilo_cert
 import api_emulator.redfish.templates.events as generic_events
-import api_emulator.redfish.templates.hpe_cray_ex_events as hpe_cray_ex_events
-import api_emulator.redfish.templates.proliant_ilo_events as ilo_events
-import api_emulator.redfish.templates.gigabyte_events as gb_events
-import api_emulator.redfish.templates.intel_events as intel_events
+
+# Vendor specific power, certificate and event template modules are imported
+# by the init_* methods only once the mockup is detected to need them. This
+# keeps them off the cold start path of every other mockup.
+
+# Id of the member at path of the given collection, e.g. 'Node0' for
+# 'Chassis/Node0' of 'Chassis'
+def member_id(collection, path):
+    if path.startswith(collection + '/'):
+        return path[len(collection) + 1:]
+    return path
 
 # GenericCustom
 #
@@ -122,24 +130,43 @@ class Loader:
         else:
             self.mac_schema = 'Random'
 
-        self.randomize()
+        report = instance.current().report
+        if instance.current().checkpoint is None:
+            with report.phase('randomize'):
+                self.randomize()
+        # else the identities randomized before the checkpoint are kept
 
         # Add dynamic resources here. This will override any previously loaded static URL
-        self.init_power_limit()
-        self.init_system_reset()
-        self.init_chassis_reset()
-        self.init_manager_reset()
-        self.init_update_service()
-        self.init_event_service()
-        self.init_account_service()
-        self.init_session_service()
-        self.init_cert_service()
-        self.init_manager_network_protocol()
+        for init in [self.init_power_limit,
+                     self.init_system_reset,
+                     self.init_chassis_reset,
+                     self.init_manager_reset,
+                     self.init_update_service,
+                     self.init_event_service,
+                     self.init_account_service,
+                     self.init_session_service,
+                     self.init_cert_service,
+                     self.init_manager_network_protocol]:
+            # Each one is a phase of the startup report
+            with report.phase(init.__name__):
+                init()
+
+    # Paths of the members of collection that lead to a resource, found the
+    # way the link graph finds dangling links (see link_graph.py). A member
+    # link of the mockup that leads nowhere is logged and left out, rather
+    # than failing the init_* method that looks it up. Raises KeyError if
+    # there is no such collection.
+    def members(self, collection):
+        paths = self.resource_dictionary.members(collection)
+        found = [p for p in paths if resolves(self.resource_dictionary, p)]
+        if len(found) < len(paths):
+            logging.warning('Skipping dangling members of %s: %s' % (collection, sorted(set(paths) - set(found))))
+        return found
 
     def init_power_limit(self):
         try:
-            chassisCollection = self.resource_dictionary.get_resource('Chassis')
-            if len(chassisCollection['Members']) == 0:
+            chassisPaths = self.members('Chassis')
+            if len(chassisPaths) == 0:
                 # Found chassis collection with no members. Don't create a dynamic resource.
                 return
         except:
@@ -152,24 +179,25 @@ class Loader:
         is_hpe_ilo_power = False
         is_generic_power = False
         power_limit_schema = ''
-        for chassis in chassisCollection['Members']:
-            ch_id = chassis['@odata.id'].replace('/redfish/v1/Chassis/', '')
-            ch_config = self.resource_dictionary.get_resource('Chassis/%s' % ch_id)
+        for path in chassisPaths:
+            ch_id = member_id('Chassis', path)
+            ch_config = self.resource_dictionary.get_view(path)
             if 'Controls' in ch_config:
+                import api_emulator.redfish.hpe_cray_ex_power_control_api as hpe_cray_ex_power
                 is_hpe_cray_ex_power = True
-                pwrControls = self.resource_dictionary.get_resource('Chassis/%s/Controls' % ch_id)
-                for pwrControl in pwrControls['Members']:
-                    control_id = pwrControl['@odata.id'].replace('/redfish/v1/Chassis/%s/Controls/' % ch_id, '')
-                    config = self.resource_dictionary.get_resource('Chassis/%s/Controls/%s' % (ch_id, control_id))
-                    hpe_cray_ex_power.CreatePower(ch_id, control_id, config)
+                controls = 'Chassis/%s/Controls' % ch_id
+                for control_path in self.members(controls):
+                    config = self.resource_dictionary.get_resource(control_path)
+                    hpe_cray_ex_power.CreatePower(ch_id, member_id(controls, control_path), config)
             elif 'Power' in ch_config:
                 power = self.resource_dictionary.get_resource('Chassis/%s/Power' % ch_id)
                 if 'PowerControl' in power and len(power['PowerControl']) > 0:
-                    try:
-                        power_config = self.resource_dictionary.get_resource('Chassis/%s/Power/AccPowerService/PowerLimit' % ch_id)
+                    power_limits = self.resource_dictionary.find_type('HpeServerAccPowerLimit', 'Chassis/%s/Power' % ch_id)
+                    if power_limits:
+                        import api_emulator.redfish.proliant_ilo_power_control_api as ilo_power
                         is_hpe_ilo_power = True
-                        ilo_power.CreatePower(ch_id, power_config)
-                    except:
+                        ilo_power.CreatePower(ch_id, self.resource_dictionary.get_resource(power_limits[0]))
+                    else:
                         is_generic_power = True
                         generic_power.CreatePower(ch_id, power)
         # Add the callbacks
@@ -187,8 +215,8 @@ class Loader:
 
     def init_system_reset(self):
         try:
-            systems = self.resource_dictionary.get_resource('Systems')
-            if len(systems['Members']) == 0:
+            systemPaths = self.members('Systems')
+            if len(systemPaths) == 0:
                 # Found systems collection with no members. Don't create a dynamic resource.
                 return
         except:
@@ -197,9 +225,9 @@ class Loader:
         # System Reset Actions
         #
         found = False
-        for system in systems['Members']:
-            sys_id = system['@odata.id'].replace('/redfish/v1/Systems/', '')
-            config = self.resource_dictionary.get_resource('Systems/' + sys_id)
+        for path in systemPaths:
+            sys_id = member_id('Systems', path)
+            config = self.resource_dictionary.get_resource(path)
             if 'Actions' in config and '#ComputerSystem.Reset' in config['Actions']:
                 rst_actions = []
                 if 'ResetType@Redfish.AllowableValues' in config['Actions']['#ComputerSystem.Reset']:
@@ -217,8 +245,8 @@ class Loader:
 
     def init_chassis_reset(self):
         try:
-            collection = self.resource_dictionary.get_resource('Chassis')
-            if len(collection['Members']) == 0:
+            paths = self.members('Chassis')
+            if len(paths) == 0:
                 # Found chassis collection with no members. Don't create a dynamic resource.
                 return
         except:
@@ -227,9 +255,9 @@ class Loader:
         # Chassis Reset Actions
         #
         found = False
-        for member in collection['Members']:
-            id = member['@odata.id'].replace('/redfish/v1/Chassis/', '')
-            config = self.resource_dictionary.get_resource('Chassis/' + id)
+        for path in paths:
+            id = member_id('Chassis', path)
+            config = self.resource_dictionary.get_resource(path)
             if 'Actions' in config and '#Chassis.Reset' in config['Actions']:
                 rst_actions = []
                 if 'ResetType@Redfish.AllowableValues' in config['Actions']['#Chassis.Reset']:
@@ -247,8 +275,8 @@ class Loader:
 
     def init_manager_reset(self):
         try:
-            collection = self.resource_dictionary.get_resource('Managers')
-            if len(collection['Members']) == 0:
+            paths = self.members('Managers')
+            if len(paths) == 0:
                 # Found Managers collection with no members. Don't create a dynamic resource.
                 return
         except:
@@ -257,9 +285,9 @@ class Loader:
         # Manager Reset Actions
         #
         found = False
-        for member in collection['Members']:
-            id = member['@odata.id'].replace('/redfish/v1/Managers/', '')
-            config = self.resource_dictionary.get_resource('Managers/' + id)
+        for path in paths:
+            id = member_id('Managers', path)
+            config = self.resource_dictionary.get_resource(path)
             if 'Actions' in config and '#Manager.Reset' in config['Actions']:
                 rst_actions = []
                 if 'ResetType@Redfish.AllowableValues' in config['Actions']['#Manager.Reset']:
@@ -277,7 +305,7 @@ class Loader:
 
     def init_update_service(self):
         try:
-            updateService = self.resource_dictionary.get_resource('UpdateService/FirmwareInventory')
+            targetPaths = self.members('UpdateService/FirmwareInventory')
             # Found Update Service
         except:
             return
@@ -286,10 +314,12 @@ class Loader:
         #
         g.api.add_resource(UpdateServiceAPI, '/redfish/v1/UpdateService/FirmwareInventory/<string:ident>')
         g.api.add_resource(SimpleUpdateAPI, '/redfish/v1/UpdateService/SimpleUpdate')
-        for member in updateService['Members']:
-            target_id = member['@odata.id'].replace('/redfish/v1/UpdateService/FirmwareInventory/', '')
-            config = self.resource_dictionary.get_resource('UpdateService/FirmwareInventory/' + target_id)
-            CreateFirmwareTarget(target_id, config)
+        for path in targetPaths:
+            config = self.resource_dictionary.get_resource(path)
+            CreateFirmwareTarget(member_id('UpdateService/FirmwareInventory', path), config)
+        if 'UpdateService/FirmwareInventory/Config' in instance.current().restored:
+            # Configuration kept by the state store or a checkpoint
+            RestoreUpdateConfig(self.resource_dictionary.get_resource('UpdateService/FirmwareInventory/Config'))
 
         # Firmware Update Configurations
         g.api.add_resource(UpdateServiceConfigAPI, '/redfish/v1/UpdateService/FirmwareInventory/Config')
@@ -304,13 +334,17 @@ class Loader:
         # Event Service
         #
         sub_config = self.resource_dictionary.get_resource('EventService/Subscriptions')
-        # Remove any existing subscriptions in our static mockup
-        sub_config['Members'] = []
-        sub_config['Members@odata.count'] = 0
+        restored = 'EventService/Subscriptions' in instance.current().restored
+        if not restored:
+            # Remove any existing subscriptions in our static mockup
+            sub_config['Members'] = []
+            sub_config['Members@odata.count'] = 0
         sub_generator = get_subscription_instance
         CreateEventService(eventService, sub_config, sub_generator)
-
-        self.get_event_template()
+        if restored:
+            # Subscriptions kept by the state store or a checkpoint
+            for path in self.members('EventService/Subscriptions'):
+                RestoreSubscription(member_id('EventService/Subscriptions', path), self.resource_dictionary.get_resource(path))
 
         # Here we tell the event generator what templates to use for forming
         # redfish events. Since not all BMC types form events the same way.
@@ -330,11 +364,10 @@ class Loader:
         g.api.add_resource(AccountCollectionAPI, '/redfish/v1/AccountService/Accounts')
         g.api.add_resource(AccountAPI, '/redfish/v1/AccountService/Accounts/<string:ident>')
         account_schema = ''
-        for member in accountService['Members']:
-            account_id = member['@odata.id'].replace('/redfish/v1/AccountService/Accounts/', '')
-            config = self.resource_dictionary.get_resource('AccountService/Accounts/' + account_id)
+        for path in self.members('AccountService/Accounts'):
+            config = self.resource_dictionary.get_resource(path)
             account_schema = config['@odata.type']
-            CreateAccount(account_id, config)
+            CreateAccount(member_id('AccountService/Accounts', path), config)
         CreateAccountService(accountService, account_schema)
 
     def init_session_service(self):
@@ -349,9 +382,16 @@ class Loader:
         g.api.add_resource(SessionCollectionAPI, '/redfish/v1/SessionService/Sessions')
         g.api.add_resource(SessionAPI, '/redfish/v1/SessionService/Sessions/<string:ident>')
         sessionService = self.resource_dictionary.get_resource('SessionService/Sessions')
-        # Remove any existing sessions in our static mockup
-        sessionService['Members'] = []
-        sessionService['Members@odata.count'] = 0
+        if 'SessionService/Sessions' in instance.current().restored:
+            # Sessions kept by the state store or a checkpoint
+            for path in self.members('SessionService/Sessions'):
+                config = self.resource_dictionary.get_resource(path)
+                CreateSession(config['Id'], config)
+                auth.start_session(Session(config['UserName'], config['Id']))
+        else:
+            # Remove any existing sessions in our static mockup
+            sessionService['Members'] = []
+            sessionService['Members@odata.count'] = 0
         CreateSessionService(sessionService)
 
     def init_cert_service(self):
@@ -373,14 +413,13 @@ class Loader:
         except:
             pass
         if not is_hpe_cray_ex_cert:
-            try:
-                # Determine if this is the proliant iLO Certificate Service
-                securityService = self.resource_dictionary.get_resource('Managers/1/SecurityService/HttpsCert')
-                if '#HpeHttpsCert.ImportCertificate' in securityService['Actions']:
+            # Determine if this is the proliant iLO Certificate Service
+            for path in self.resource_dictionary.find_type('HpeHttpsCert', 'Managers'):
+                securityService = self.resource_dictionary.get_view(path)
+                if '#HpeHttpsCert.ImportCertificate' in securityService.get('Actions', {}):
                     is_proliant_ilo_cert = True
-            except:
-                pass
         if is_hpe_cray_ex_cert:
+            import api_emulator.redfish.hpe_cray_ex_certificate_service_api as hpe_cray_ex_cert
             g.api.add_resource(hpe_cray_ex_cert.ReplaceCertificateAPI, '/redfish/v1/CertificateService/Actions/CertificateService.ReplaceCertificate')
             certCollection = self.resource_dictionary.get_resource('Managers/BMC/NetworkProtocol/HTTPS/Certificates')
             for member in certCollection['Members']['Certificates']:
@@ -389,6 +428,7 @@ class Loader:
                 hpe_cray_ex_cert.CreateCert(cert_id, cert_config)
         elif is_proliant_ilo_cert:
             # TODO: Add this schema
+            # import api_emulator.redfish.proliant_ilo_certificate_service_api as ilo_cert
             pass
 
     def init_manager_network_protocol(self):
@@ -397,10 +437,9 @@ class Loader:
         #
         found_network_protocol = False
         try:
-            collection = self.resource_dictionary.get_resource('Managers')
-            for member in collection['Members']:
-                manager_id = member['@odata.id'].replace('/redfish/v1/Managers/', '')
-                manager = self.resource_dictionary.get_resource('Managers/%s' % manager_id)
+            for path in self.members('Managers'):
+                manager_id = member_id('Managers', path)
+                manager = self.resource_dictionary.get_view(path)
                 if 'NetworkProtocol' in manager:
                     found_network_protocol = True
                     config = self.resource_dictionary.get_resource('Managers/%s/NetworkProtocol' % manager_id)
@@ -414,44 +453,41 @@ class Loader:
     def get_type(self):
         return self.BMC_Type
 
+    # Returns the paths of the registries in the mockup whose prefix is the
+    # given one, e.g. 'CrayAlerts' for the CrayAlerts.1.0.0 registry.
+    def find_registry(self, prefix):
+        paths = []
+        for path in self.resource_dictionary.find_type('MessageRegistryFile', 'Registries'):
+            registry = self.resource_dictionary.get_view(path).get('Registry', '')
+            if registry.split('.')[0] == prefix:
+                paths.append(path)
+        return paths
+
     # Tries to determine if the event record schema is one of the known sets. Otherwise, use the generic.
     def get_event_template(self):
-        while True:
-            try:
-                # Intel
-                eventRegistry = self.resource_dictionary.get_resource('Registries/EventingMessages/Alert.1.0.0.json')
-                templates = intel_events.GetEventRecordTemplates()
-                logging.info('Using Intel redfish event schema')
-                break
-            except:
-                pass
-            try:
-                # Gigabyte
-                eventRegistry = self.resource_dictionary.get_resource('Registries/EventLog.1.0.0.json')
-                templates = gb_events.GetEventRecordTemplates()
-                logging.info('Using Gigabyte redfish event schema')
-                break
-            except:
-                pass
-            try:
-                # HPE Cray EX
-                eventRegistry = self.resource_dictionary.get_resource('Registries/CrayAlerts.1.0.0.json')
-                templates = hpe_cray_ex_events.GetEventRecordTemplates()
-                logging.info('Using HPE Cray EX redfish event schema')
-                break
-            except:
-                pass
-            try:
-                # Proliant iLO
-                eventRegistry = self.resource_dictionary.get_resource('Registries/iLOEvents')
-                templates = ilo_events.GetEventRecordTemplates()
-                logging.info('Using Proliant iLO redfish event schema')
-                break
-            except:
-                pass
+        if self.find_registry('Alert'):
+            # Intel
+            import api_emulator.redfish.templates.intel_events as intel_events
+            templates = intel_events.GetEventRecordTemplates()
+            logging.info('Using Intel redfish event schema')
+        elif self.find_registry('EventLog'):
+            # Gigabyte
+            import api_emulator.redfish.templates.gigabyte_events as gb_events
+            templates = gb_events.GetEventRecordTemplates()
+            logging.info('Using Gigabyte redfish event schema')
+        elif self.find_registry('CrayAlerts'):
+            # HPE Cray EX
+            import api_emulator.redfish.templates.hpe_cray_ex_events as hpe_cray_ex_events
+            templates = hpe_cray_ex_events.GetEventRecordTemplates()
+            logging.info('Using HPE Cray EX redfish event schema')
+        elif self.find_registry('iLOEvents'):
+            # Proliant iLO
+            import api_emulator.redfish.templates.proliant_ilo_events as ilo_events
+            templates = ilo_events.GetEventRecordTemplates()
+            logging.info('Using Proliant iLO redfish event schema')
+        else:
             templates = generic_events.GetEventRecordTemplates()
             logging.info('Using generic redfish event schema')
-            break
         return templates
 
     def randomize(self):
@@ -465,7 +501,7 @@ class Loader:
         if 'Chassis' in base:
             chassisCollection = self.resource_dictionary.get_resource('Chassis')
             for member in chassisCollection['Members']:
-                path = member['@odata.id'].replace('/redfish/v1/', '')
+                path = member['@odata.id']
                 chassis = self.resource_dictionary.get_resource(path)
                 if 'SerialNumber' in chassis:
                     sn = chassis['SerialNumber']
@@ -476,7 +512,7 @@ class Loader:
                         foundSNs[sn] = rndSN
                         chassis['SerialNumber'] = rndSN
                 if 'Assembly' in chassis:
-                    url = chassis['Assembly']['@odata.id'].replace('/redfish/v1/', '')
+                    url = chassis['Assembly']['@odata.id']
                     page = self.resource_dictionary.get_resource(url)
                     for assembly in page['Assemblies']:
                         if 'SerialNumber' in assembly:
@@ -488,11 +524,11 @@ class Loader:
                                 foundSNs[sn] = rndSN
                                 assembly['SerialNumber'] = rndSN
                 if 'NetworkAdapters' in chassis:
-                    url = chassis['NetworkAdapters']['@odata.id'].replace('/redfish/v1/', '')
+                    url = chassis['NetworkAdapters']['@odata.id']
                     collection_page = self.resource_dictionary.get_resource(url)
                     if 'Members' in collection_page:
                         for memberUrl in collection_page['Members']:
-                            url = memberUrl['@odata.id'].replace('/redfish/v1/', '')
+                            url = memberUrl['@odata.id']
                             page = self.resource_dictionary.get_resource(url)
                             if 'SerialNumber' in page:
                                 sn = page['SerialNumber']
@@ -503,7 +539,7 @@ class Loader:
                                     foundSNs[sn] = rndSN
                                     page['SerialNumber'] = rndSN
                 if 'Power' in chassis:
-                    url = chassis['Power']['@odata.id'].replace('/redfish/v1/', '')
+                    url = chassis['Power']['@odata.id']
                     power = self.resource_dictionary.get_resource(url)
                     if 'PowerSupplies' in power:
                         for power_supply in power["PowerSupplies"]:
@@ -517,11 +553,11 @@ class Loader:
                     if 'Hpe' in chassis['Oem']:
                         if 'Links' in chassis['Oem']['Hpe']:
                             if 'Devices' in chassis['Oem']['Hpe']['Links']:
-                                url = chassis['Oem']['Hpe']['Links']['Devices']['@odata.id'].replace('/redfish/v1/', '')
+                                url = chassis['Oem']['Hpe']['Links']['Devices']['@odata.id']
                                 collection_page = self.resource_dictionary.get_resource(url)
                                 if 'Members' in collection_page:
                                     for memberUrl in collection_page['Members']:
-                                        url = memberUrl['@odata.id'].replace('/redfish/v1/', '')
+                                        url = memberUrl['@odata.id']
                                         page = self.resource_dictionary.get_resource(url)
                                         if 'SerialNumber' in page:
                                             sn = page['SerialNumber']
@@ -536,7 +572,7 @@ class Loader:
             for i in range(len(systems['Members'])):
                 member = systems['Members'][i]
             # for member in systems['Members']:
-                path = member['@odata.id'].replace('/redfish/v1/', '')
+                path = member['@odata.id']
                 system = self.resource_dictionary.get_resource(path)
                 if 'SerialNumber' in system:
                     sn = system['SerialNumber']
@@ -548,10 +584,10 @@ class Loader:
                         system['SerialNumber'] = rndSN
                 for collection in ['Memory', 'Processors']:
                     if collection in system:
-                        url = system[collection]['@odata.id'].replace('/redfish/v1/', '')
+                        url = system[collection]['@odata.id']
                         collection_page = self.resource_dictionary.get_resource(url)
                         for memberUrl in collection_page['Members']:
-                            url = memberUrl['@odata.id'].replace('/redfish/v1/', '')
+                            url = memberUrl['@odata.id']
                             page = self.resource_dictionary.get_resource(url)
                             if 'SerialNumber' in page:
                                 sn = page['SerialNumber']
@@ -562,12 +598,12 @@ class Loader:
                                     foundSNs[sn] = rndSN
                                     page['SerialNumber'] = rndSN
                 if 'EthernetInterfaces' in system:
-                    url = system['EthernetInterfaces']['@odata.id'].replace('/redfish/v1/', '')
+                    url = system['EthernetInterfaces']['@odata.id']
                     collection_page = self.resource_dictionary.get_resource(url)
                     for memberUrl in collection_page['Members']:
-                        url = memberUrl['@odata.id'].replace('/redfish/v1/', '')
+                        url = memberUrl['@odata.id']
                         page = self.resource_dictionary.get_resource(url)
-                        if self.mac_schema == 'Mountain' and url.startswith("Managers/"):
+                        if self.mac_schema == 'Mountain' and canonical(url).startswith("Managers/"):
                             # Only mountain BMCs have algorithmic MACs
                             fields = [int(s) for s in re.findall(r'-?\d+\.?\d*', self.xname)]
                             charFields = [s for s in re.findall(r'-?\D+\.?\D*', self.xname)]
@@ -0,0 +1,221 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Path Trie
+#
+# The resources of a ResourceDictionary are kept by their canonical path
+# below the REST base, e.g. 'Chassis/Node0/Power', in a PathTrie. A path is
+# canonical when it has no empty, '.' or '..' segments and no leading or
+# trailing '/'. The service root is ''.
+#
+# Lookups accept any path that names the same resource, including the
+# '@odata.id' of the resource, so callers need neither os.path.normpath nor
+# to strip '/redfish/v1/' themselves. The trie also lists the children of a
+# path and walks the resources below a prefix without scanning all of them.
+
+from collections.abc import MutableMapping
+
+# REST base that absolute paths start with
+REST_BASE = '/redfish/v1'
+
+# Value of a node that only leads to resources below it
+_EMPTY = object()
+
+def split_path(path):
+    """
+    Returns the segments of the canonical form of path
+
+    Arguments:
+        path - Path below the REST base, or absolute path starting with it
+    """
+    segments = []
+    for segment in path.split('/'):
+        if segment == '' or segment == '.':
+            continue
+        if segment == '..':
+            if segments:
+                segments.pop()
+            continue
+        segments.append(segment)
+    if path.startswith('/') and segments[:2] == ['redfish', 'v1']:
+        del segments[:2]
+    return segments
+
+def canonical(path):
+    """
+    Returns the canonical form of path, see split_path()
+    """
+    if path.startswith(REST_BASE + '/'):
+        p = path[len(REST_BASE) + 1:]
+    elif path == REST_BASE:
+        return ''
+    else:
+        p = path
+    # Only paths with empty, '.' or '..' segments need to be split
+    if '//' in p or '/.' in p or p.startswith('.'):
+        return '/'.join(split_path(path))
+    return p.strip('/')
+
+class _Node(object):
+    __slots__ = ('path', 'value', 'children')
+
+    def __init__(self, path):
+        self.path = path
+        self.value = _EMPTY
+        self.children = {}
+
+class PathTrie(MutableMapping):
+    """
+    Mapping of canonical paths to resources, kept as a tree of path segments.
+
+    Nodes that hold a resource are also indexed by their canonical path and
+    by their '@odata.id', so looking up a resource by either, the common
+    cases, is a single dict lookup. Other paths are looked up after
+    canonicalizing them. Nodes that only lead to resources are found segment by
+    segment, in O(depth).
+    """
+
+    def __init__(self):
+        self.root = _Node('')
+        # Nodes that hold a resource, by canonical path
+        self.index = {}
+        # The same nodes by '@odata.id'
+        self.ids = {}
+
+    def node(self, path):
+        """
+        Returns the node of path whether or not it holds a resource, or None
+        """
+        node = self.index.get(path) or self.ids.get(path)
+        if node is None:
+            path = canonical(path)
+            node = self.index.get(path)
+            if node is None:
+                node = self.root
+                for segment in path.split('/') if path else []:
+                    node = node.children.get(segment)
+                    if node is None:
+                        return None
+        return node
+
+    def __getitem__(self, path):
+        node = self.index.get(path) or self.ids.get(path) or self.index.get(canonical(path))
+        if node is None:
+            raise KeyError(path)
+        return node.value
+
+    def get(self, path, default=None):
+        node = self.index.get(path) or self.ids.get(path) or self.index.get(canonical(path))
+        if node is None:
+            return default
+        return node.value
+
+    def __contains__(self, path):
+        return path in self.index or path in self.ids or canonical(path) in self.index
+
+    def __setitem__(self, path, value):
+        node = self.index.get(path)
+        if node is None:
+            node = self.root
+            for segment in split_path(path):
+                child = node.children.get(segment)
+                if child is None:
+                    if node.path:
+                        child = _Node(node.path + '/' + segment)
+                    else:
+                        child = _Node(segment)
+                    node.children[segment] = child
+                node = child
+            self.index[node.path] = node
+            for odata_id in self.odata_ids(node.path):
+                self.ids[odata_id] = node
+        node.value = value
+
+    def __delitem__(self, path):
+        segments = split_path(path)
+        nodes = [self.root]
+        for segment in segments:
+            node = nodes[-1].children.get(segment)
+            if node is None:
+                raise KeyError(path)
+            nodes.append(node)
+        node = nodes[-1]
+        if node.value is _EMPTY:
+            raise KeyError(path)
+        node.value = _EMPTY
+        del self.index[node.path]
+        for odata_id in self.odata_ids(node.path):
+            del self.ids[odata_id]
+        # Drop the nodes that no longer lead to a resource
+        for i in range(len(segments), 0, -1):
+            node = nodes[i]
+            if node.value is not _EMPTY or node.children:
+                break
+            del nodes[i - 1].children[segments[i - 1]]
+
+    @staticmethod
+    def odata_ids(path):
+        """
+        Returns the '@odata.id' forms of canonical path
+        """
+        if path:
+            return [REST_BASE + '/' + path]
+        return [REST_BASE, REST_BASE + '/']
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def children(self, path):
+        """
+        Returns the canonical paths one segment below path that hold a
+        resource or lead to one
+        """
+        node = self.node(path)
+        if node is None:
+            return []
+        return [child.path for child in node.children.values()]
+
+    def walk(self, path):
+        """
+        Yields (path, resource) for the resource at path and each resource
+        below it, parents before their children
+        """
+        node = self.node(path)
+        if node is None:
+            return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.value is not _EMPTY:
+                yield node.path, node.value
+            stack.extend(reversed(list(node.children.values())))
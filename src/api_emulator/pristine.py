@@ -0,0 +1,180 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Pristine State
+#
+# The state of an emulator instance right after its resources are set up,
+# which DELETE /redfish/v1/reset returns the instance to without setting it
+# up again. Flask routes cannot be registered twice, so setting up the
+# resources again is not an option, and restarting the emulator for each
+# test case is slow.
+#
+# A reset only undoes what changed. The change journal (change_journal.py)
+# has the paths of the resources changed since the last reset. Documents
+# that dynamic resources change in place are put back from a marshal copy
+# taken at startup. Documents of VersionedDicts are never changed, the
+# version published at startup is published again. The dictionaries and
+# module variables of the dynamic resources are shallow copies, which puts
+# back deleted members and removes added ones, e.g. accounts, sessions and
+# event subscriptions. Worker threads and queued firmware updates started
+# before the reset are cancelled (see Instance.generation).
+#
+# Resources that the static watcher reloaded from the mockup stay as they
+# are. If the instance was restored from the state store the restored
+# state is the pristine state.
+
+import logging
+import marshal
+import time
+
+from .instance import VersionedStore, activate, record_change
+from .path_trie import canonical
+
+_MISSING = object()
+
+def is_document(value):
+    return isinstance(value, dict) and isinstance(value.get('@odata.id'), str)
+
+class Pristine():
+    """
+    Arguments:
+        inst - Instance whose resources are set up
+    """
+    def __init__(self, inst):
+        self.instance = inst
+        # Shallow copies of the InstanceDicts, VersionedDicts and
+        # InstanceStates, by state key
+        self.state = {}
+        # Shallow copies of the dictionaries that these hold, e.g. the
+        # users of redfish_auth, by (state key, name)
+        self.maps = {}
+        # (document, marshal copy) of the documents changed in place, by
+        # canonical path
+        self.documents = {}
+        for key, values in inst.state.items():
+            if isinstance(values, VersionedStore):
+                self.state[key] = dict(values.documents)
+                continue
+            if not isinstance(values, dict):
+                continue
+            self.state[key] = dict(values)
+            for name, value in values.items():
+                if is_document(value):
+                    self.keep(value)
+                elif isinstance(value, dict):
+                    self.maps[(key, name)] = dict(value)
+                    for item in value.values():
+                        if is_document(item):
+                            self.keep(item)
+
+    def keep(self, document):
+        self.documents[canonical(document['@odata.id'])] = (document, marshal.dumps(document))
+
+    def reset(self):
+        """
+        Returns the instance to its pristine state and returns the number of
+        documents put back or removed
+        """
+        inst = self.instance
+        start = time.time()
+        # Canonical paths of the documents put back so far
+        self.restored = set()
+        with activate(inst):
+            inst.generation += 1
+            for path in inst.journal.take_paths():
+                path = canonical(path)
+                kept = self.documents.get(path)
+                if kept is not None and path not in self.restored:
+                    document, image = kept
+                    document.clear()
+                    document.update(marshal.loads(image))
+                    record_change(document)
+                    self.restored.add(path)
+            for key in [k for k in inst.state if k not in self.state]:
+                # Created after startup, e.g. by the first firmware update
+                values = inst.state.pop(key)
+                if isinstance(values, VersionedStore):
+                    values = values.documents
+                self.record(values, {})
+            for key, pristine in self.state.items():
+                values = inst.state[key]
+                if isinstance(values, VersionedStore):
+                    self.republish(values, pristine)
+                else:
+                    self.restore(values, pristine)
+            for (key, name), pristine in self.maps.items():
+                self.restore(inst.state[key][name], pristine)
+            # The documents are pristine again, the next reset need not put
+            # them back. A reset is meant to run while the instance is idle.
+            inst.journal.take_paths()
+        count = len(self.restored)
+        logging.info('Reset emulator instance %s, %d documents in %.1f ms' %
+                     (inst.name, count, (time.time() - start) * 1000))
+        return count
+
+    def restore(self, values, pristine):
+        if len(values) == len(pristine) and all(pristine.get(k, _MISSING) is v for k, v in values.items()):
+            return
+        self.record(values, pristine)
+        values.clear()
+        values.update(pristine)
+
+    def record(self, values, pristine):
+        """
+        Records the documents of pristine that replace those of values, and
+        the documents of values that are removed
+        """
+        present = set(id(v) for v in values.values())
+        paths = set()
+        for value in pristine.values():
+            if is_document(value):
+                path = canonical(value['@odata.id'])
+                paths.add(path)
+                if id(value) not in present and path not in self.restored:
+                    record_change(value, True)
+                    self.restored.add(path)
+        kept = set(id(v) for v in pristine.values())
+        for value in values.values():
+            if is_document(value) and id(value) not in kept:
+                path = canonical(value['@odata.id'])
+                if path not in paths and path not in self.restored:
+                    record_change(value, True, True)
+                    self.restored.add(path)
+
+    def republish(self, store, pristine):
+        with store.lock:
+            for key in [k for k in store.documents if k not in pristine]:
+                document = store.documents.pop(key)
+                record_change(document, True, True)
+                self.restored.add(canonical(document['@odata.id']))
+            for key, document in pristine.items():
+                if store.documents.get(key) is not document:
+                    store.publish(key, document)
+                    self.restored.add(canonical(document['@odata.id']))
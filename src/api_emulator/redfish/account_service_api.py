@@ -48,10 +48,11 @@ from flask_restful import reqparse, Api, Resource
 
 from .redfish_auth import auth, Privilege, ROLES, User
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceDict, InstanceState
 
-collection_config = {}
-members = {}
-account_schema = '#ManagerAccount.v1_0_0.ManagerAccount'
+members = InstanceDict(__name__, 'members')
+state = InstanceState(__name__, collection_config={},
+                      account_schema='#ManagerAccount.v1_0_0.ManagerAccount')
 
 # AccountCollectionAPI
 #
@@ -74,7 +75,7 @@ class AccountCollectionAPI(Resource):
     # HTTP GET
     def get(self):
         logging.info('%s %s called' % (self.apiName, request.method))
-        return collection_config, 200
+        return state.collection_config, 200
 
     # HTTP PUT
     def put(self):
@@ -105,10 +106,10 @@ class AccountCollectionAPI(Resource):
             name = raw_dict['UserName']
             if 'Name' in raw_dict:
                 name = raw_dict['Name']
-            id = collection_config['Members@odata.count'] + 1
+            id = state.collection_config['Members@odata.count'] + 1
             new_account_config = {
                 '@odata.id': '/redfish/v1/AccountService/Accounts/{}'.format(id),
-                '@odata.type': '{}'.format(account_schema),
+                '@odata.type': '{}'.format(state.account_schema),
                 'Description': '{}'.format(description),
                 'Enabled': True,
                 'Id': '{}'.format(id),
@@ -127,8 +128,8 @@ class AccountCollectionAPI(Resource):
             }
             newUser = User(username, password, role, privileges)
             auth.add_user(newUser)
-            collection_config['Members'].append(new_account_link)
-            collection_config['Members@odata.count'] += 1
+            state.collection_config['Members'].append(new_account_link)
+            state.collection_config['Members@odata.count'] += 1
             members[new_account_config['Id']] = new_account_config
             resp = success_response(new_account_config['@odata.id'], 201)
         except Exception:
@@ -237,13 +238,13 @@ class AccountAPI(Resource):
                     auth.add_user(newUser)
                     auth.delete_user(members[ident]['UserName'])
                 else:
-                    # Non-username change just modifies user fields
-                    user.password = newPassword
-                    user.role = newRole
-                    user.privileges = newPrivileges
+                    # Non-username change replaces the user, the User objects
+                    # of the default users are shared by all instances
+                    auth.add_user(User(newUsername, newPassword, newRole, newPrivileges))
                 members[ident]['UserName'] = newUsername
                 members[ident]['RoleId'] = newRole
                 members[ident]['Links']['Role']['@odata.id'] = newRoleLink
+                members.changed(ident)
                 resp = success_response('Resource patched', 200)
         except Exception:
             traceback.print_exc()
@@ -256,10 +257,10 @@ class AccountAPI(Resource):
         try:
             resp = error_404_response(request.path)
             if ident in members:
-                for i in range(len(collection_config['Members'])):
-                    if collection_config['Members'][i]['@odata.id'] == members[ident]['@odata.id']:
-                        del collection_config['Members'][i]
-                        collection_config['Members@odata.count'] -= 1
+                for i in range(len(state.collection_config['Members'])):
+                    if state.collection_config['Members'][i]['@odata.id'] == members[ident]['@odata.id']:
+                        del state.collection_config['Members'][i]
+                        state.collection_config['Members@odata.count'] -= 1
                         auth.delete_user(members[ident]['UserName'])
                         del members[ident]
                         resp = success_response('Resource deleted', 200)
@@ -276,12 +277,10 @@ class AccountAPI(Resource):
 # This resource is affected by AccountCollectionAPI() and AccountAPI().
 #
 def CreateAccountService(config, acc_schema):
-    global collection_config
-    global account_schema
 
     logging.debug('added config for AccountService')
-    collection_config = config
-    account_schema = acc_schema
+    state.collection_config = config
+    state.account_schema = acc_schema
 
 # CreateAccount
 #
@@ -290,7 +289,6 @@ def CreateAccountService(config, acc_schema):
 # These resources are affected by AccountCollectionAPI() and AccountAPI()
 #
 def CreateAccount(id, config):
-    global members
 
     logging.debug('added config for AccountService/%s - %s' % (id, config['UserName']))
     members[id] = config
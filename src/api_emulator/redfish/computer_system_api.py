@@ -52,10 +52,11 @@ from .redfish_auth import auth, Privilege
 from .event_generator import GenEvent, GenEventRecord
 from .event_service_api import send_event
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceDict, InstanceThread, VersionedDict
 
-members = {}
-members_actions = {}
-members_reset_thread = {}
+members = VersionedDict(__name__, 'members')
+members_actions = InstanceDict(__name__, 'members_actions')
+members_reset_thread = InstanceDict(__name__, 'members_reset_thread')
 
 reboot_actions = ['GracefulRestart', 'ForceRestart', 'PushPowerButton']
 off_actions = ['Off', 'ForceOff', 'GracefulShutdown', 'Nmi']
@@ -67,39 +68,50 @@ default_actions = ['ForceOff', 'On', 'Off']
 #
 # Worker thread for performing emulated asynchronous computer system power resets.
 #
-class ResetWorker(Thread):
+class ResetWorker(InstanceThread):
     def __init__(self, sys_id):
         super(ResetWorker, self).__init__()
         self.sys_id = sys_id
 
     def run(self):
-        members[self.sys_id]['PowerState'] = 'Off'
-        members[self.sys_id]['Status']['State'] = 'Disabled'
+        set_power_state(self.sys_id, 'Off', 'Disabled')
         send_power_event(self.sys_id, 'Off')
         sleep(5)
-        members[self.sys_id]['PowerState'] = 'PoweringOn'
-        members[self.sys_id]['Status']['State'] = 'Starting'
+        if self.cancelled():
+            return
+        set_power_state(self.sys_id, 'PoweringOn', 'Starting')
         send_power_event(self.sys_id, 'On')
         sleep(5)
-        members[self.sys_id]['PowerState'] = 'On'
-        members[self.sys_id]['Status']['State'] = 'Enabled'
+        if self.cancelled():
+            return
+        set_power_state(self.sys_id, 'On', 'Enabled')
 
 # PowerOnWorker
 #
 # Worker thread for performing emulated asynchronous computer system power on actions.
 #
-class PowerOnWorker(Thread):
+class PowerOnWorker(InstanceThread):
     def __init__(self, sys_id):
         super(PowerOnWorker, self).__init__()
         self.sys_id = sys_id
 
     def run(self):
-        members[self.sys_id]['PowerState'] = 'PoweringOn'
-        members[self.sys_id]['Status']['State'] = 'Starting'
+        set_power_state(self.sys_id, 'PoweringOn', 'Starting')
         send_power_event(self.sys_id, 'On')
         sleep(5)
-        members[self.sys_id]['PowerState'] = 'On'
-        members[self.sys_id]['Status']['State'] = 'Enabled'
+        if self.cancelled():
+            return
+        set_power_state(self.sys_id, 'On', 'Enabled')
+
+# set_power_state
+#
+# Publishes a new version of the computer system with the PowerState and the
+# Status.State of a power transition.
+#
+def set_power_state(id, power_state, state):
+    with members.edit(id) as member:
+        member['PowerState'] = power_state
+        member['Status']['State'] = state
 
 def send_power_event(id, power_state):
     ooc = members[id]['@odata.id']
@@ -258,8 +270,7 @@ class ResetAction_API(Resource):
                                 members_reset_thread[ident].start()
                         elif value in off_actions:
                             logging.info('Powering Off')
-                            members[ident]['PowerState'] = 'Off'
-                            members[ident]['Status']['State'] = 'Disabled'
+                            set_power_state(ident, 'Off', 'Disabled')
                             send_power_event(ident, 'Off')
                         elif value in on_actions:
                             logging.info('Starting reset thread')
@@ -0,0 +1,213 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Emulator API File
+
+"""
+Dynamic resources:
+ - Emulator
+    GET /redfish/v1/Emulator/StartupReport - Startup phase timings
+    GET /redfish/v1/Emulator/Changes?since={version}&wait={seconds}
+                                           - Resources changed since a version
+    GET /redfish/v1/Emulator/Links[?path={path}]
+                                           - Link graph of the resources
+    GET /redfish/v1/Emulator/Checkpoint    - Checkpoint file of the emulator
+    DELETE /redfish/v1/reset               - Reset to the state at startup
+
+These resources are about the emulator itself rather than the emulated BMC.
+They are not linked from the ServiceRoot.
+"""
+
+import g
+
+import os, sys, tempfile, traceback
+import logging
+from flask import request, Response
+from flask_restful import Resource
+
+from .redfish_auth import auth, Privilege
+from .response import simple_error_response, error_404_response
+from .. import instance
+from ..link_graph import link_graph
+from ..path_trie import canonical
+
+# StartupReportAPI
+#
+# Returns the startup report of the emulator instance, see
+# api_emulator/startup_report.py
+#
+class StartupReportAPI(Resource):
+    method_decorators = {'get': [auth.auth_required(priv={Privilege.Login})]}
+
+    def __init__(self, **kwargs):
+        self.apiName = 'StartupReportAPI'
+
+    # HTTP GET
+    def get(self):
+        logging.info('%s %s called' % (self.apiName, request.method))
+        try:
+            resp = instance.current().report.summary(), 200
+        except Exception:
+            traceback.print_exc()
+            resp = simple_error_response('Server encountered an unexpected Error', 500)
+        return resp
+
+# Longest wait of a long-polling GET of the changes, in seconds
+MAX_WAIT = 60
+
+# ChangesAPI
+#
+# Returns the resources of the emulator instance that changed after the
+# journal version in the 'since' query parameter (default 0), see
+# api_emulator/change_journal.py. 'Version' in the response is the version
+# to pass as 'since' next time. If nothing changed yet the GET waits up to
+# 'wait' seconds (default 0, at most MAX_WAIT) for a change. 'Complete' is
+# false if changes have been dropped from the journal since that version,
+# in which case the client has to read the resources again.
+#
+class ChangesAPI(Resource):
+    method_decorators = {'get': [auth.auth_required(priv={Privilege.Login})]}
+
+    def __init__(self, **kwargs):
+        self.apiName = 'ChangesAPI'
+
+    # HTTP GET
+    def get(self):
+        logging.info('%s %s called' % (self.apiName, request.method))
+        try:
+            since = int(request.args.get('since', 0))
+            wait = min(float(request.args.get('wait', 0)), MAX_WAIT)
+        except ValueError:
+            return simple_error_response('Invalid since or wait parameter', 400)
+        try:
+            journal = instance.current().journal
+            version, complete, changes = journal.since(since, wait)
+            resp = {
+                'Version': version,
+                'Since': since,
+                'Complete': complete,
+                'Changes': [{'Path': path, 'Version': v, 'Time': t, 'Deleted': deleted}
+                            for v, path, t, deleted in changes]
+            }, 200
+        except Exception:
+            traceback.print_exc()
+            resp = simple_error_response('Server encountered an unexpected Error', 500)
+        return resp
+
+# LinksAPI
+#
+# Returns the link graph of the emulator instance, see
+# api_emulator/link_graph.py: the counts of resources and links, the links
+# that lead to no resource and the resources that nothing links to. With the
+# 'path' query parameter, e.g. ?path=/redfish/v1/Chassis/Node0, it returns
+# the links of that resource and the resources linking to it instead.
+#
+class LinksAPI(Resource):
+    method_decorators = {'get': [auth.auth_required(priv={Privilege.Login})]}
+
+    def __init__(self, **kwargs):
+        self.apiName = 'LinksAPI'
+
+    # HTTP GET
+    def get(self):
+        logging.info('%s %s called' % (self.apiName, request.method))
+        try:
+            graph = link_graph(instance.current())
+            path = request.args.get('path')
+            if path is None:
+                resp = graph.summary(), 200
+            else:
+                try:
+                    resp = graph.resource(canonical(path)), 200
+                except KeyError:
+                    resp = error_404_response(path)
+        except Exception:
+            traceback.print_exc()
+            resp = simple_error_response('Server encountered an unexpected Error', 500)
+        return resp
+
+# CheckpointAPI
+#
+# Returns the checkpoint file of the emulator instance, which CHECKPOINT
+# boots emulator instances from, see api_emulator/checkpoint.py. It holds
+# the account passwords, so it takes the privilege to configure users.
+#
+class CheckpointAPI(Resource):
+    method_decorators = {'get': [auth.auth_required(priv={Privilege.ConfigureUsers})]}
+
+    def __init__(self, **kwargs):
+        self.apiName = 'CheckpointAPI'
+
+    # HTTP GET
+    def get(self):
+        logging.info('%s %s called' % (self.apiName, request.method))
+        # Imported on first use like the other optional parts
+        from ..checkpoint import write_checkpoint, CHECKPOINT_EXT
+        try:
+            inst = instance.current()
+            fd, path = tempfile.mkstemp(suffix=CHECKPOINT_EXT)
+            os.close(fd)
+            try:
+                write_checkpoint(inst, path)
+                with open(path, 'rb') as f:
+                    data = f.read()
+            finally:
+                os.unlink(path)
+            filename = '%s-%s%s' % (inst.name, inst.mockup, CHECKPOINT_EXT)
+            resp = Response(data, 200, mimetype='application/octet-stream',
+                            headers={'Content-Disposition': 'attachment; filename="%s"' % filename})
+        except Exception:
+            traceback.print_exc()
+            resp = simple_error_response('Server encountered an unexpected Error', 500)
+        return resp
+
+# ResetAPI
+#
+# Returns the emulator instance to the state it had right after startup by
+# undoing the changes since then, see api_emulator/pristine.py. Routes are
+# not registered again, so the reset is fast enough to run between test
+# cases.
+#
+class ResetAPI(Resource):
+    method_decorators = {'delete': [auth.auth_required(priv={Privilege.ConfigureComponents})]}
+
+    def __init__(self, **kwargs):
+        self.apiName = 'ResetAPI'
+
+    # HTTP DELETE
+    def delete(self):
+        logging.info('%s %s called' % (self.apiName, request.method))
+        try:
+            count = instance.current().pristine.reset()
+            resp = {'Message': 'Emulator reset successfully', 'ResetResources': count}, 200
+        except Exception:
+            traceback.print_exc()
+            resp = simple_error_response('Internal Server Error', 500)
+        return resp
@@ -35,6 +35,8 @@ import datetime
 import copy
 from uuid import uuid4
 
+from ..instance import InstanceState
+
 _GENERIC = \
 {
     "EventType": "",
@@ -46,8 +48,7 @@ _GENERIC = \
     "Context": "{Context}"
 }
 
-templates = {}
-count = 1
+state = InstanceState(__name__, templates={}, count=1)
 
 # GenEvent
 #
@@ -78,17 +79,15 @@ def GenEventRecord(schemaType='Power', **wildcards):
     """
     Event record constructor
     """
-    global count
-    
     # See if we want to use one of our predefined event
     # schemas to more closely mimic our bmc_type.
-    if schemaType in templates:
-        wildcards['count'] = count
-        count += 1
+    if schemaType in state.templates:
+        wildcards['count'] = state.count
+        state.count += 1
         wildcards['uuid'] = str(uuid4())
         wildcards['rnd_str'] = strgen.StringGenerator('[A-Z]{3}[0-9]{10}').render()
         wildcards['timestamp'] = datetime.datetime.now().isoformat()
-        template = templates[schemaType]
+        template = state.templates[schemaType]
 
         config = copy.deepcopy(template)
         # Apply event type defaults
@@ -117,5 +116,4 @@ def GenEventRecord(schemaType='Power', **wildcards):
 # Initialize the EventGenerator with the templates to use for generating events.
 class EventGenerator:
     def __init__(self, eventTemplates):
-        global templates
-        templates = eventTemplates
+        state.templates = eventTemplates
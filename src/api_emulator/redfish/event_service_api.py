@@ -52,16 +52,14 @@ from flask_restful import reqparse, Api, Resource
 
 from .redfish_auth import auth, Privilege
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceDict, InstanceState, record_change
 
 from threading import Thread
 
-e_config = {}
-s_config = {}
-s_generator = None
-members = {}
+members = InstanceDict(__name__, 'members')
+state = InstanceState(__name__, e_config={}, s_config={}, s_generator=None, id=1)
 required = {'Destination'}  # Fields required for POST subscription
 eventTemplates = {}
-id = 1
 
 NOT_FOUND_ERROR = {"Status": 404, "Message": "Attribute Does Not Exist"}
 INTERNAL_ERROR = 500
@@ -134,7 +132,7 @@ class EventServiceAPI(Resource):
     def get(self):
         logging.info('EventServiceAPI GET called')
         try:
-            resp = e_config, 200
+            resp = state.e_config, 200
         except Exception:
             traceback.print_exc()
             resp = simple_error_response('Server encountered an unexpected Error', 500)
@@ -143,12 +141,12 @@ class EventServiceAPI(Resource):
     # HTTP PUT
     def put(self):
         logging.info('EventServiceAPI PUT called')
-        return error_not_allowed_response(e_config['@odata.id'], 'PUT', {'Allow': self.allow})
+        return error_not_allowed_response(state.e_config['@odata.id'], 'PUT', {'Allow': self.allow})
 
     # HTTP POST
     def post(self):
         logging.info('EventServiceAPI POST called')
-        return error_not_allowed_response(e_config['@odata.id'], 'POST', {'Allow': self.allow})
+        return error_not_allowed_response(state.e_config['@odata.id'], 'POST', {'Allow': self.allow})
 
     # HTTP PATCH
     def patch(self):
@@ -158,9 +156,10 @@ class EventServiceAPI(Resource):
             resp = success_response('PATCH request successful', 200)
             for key, value in raw_dict.items():
                 if key in {'DeliveryRetryAttempts', 'DeliveryRetryIntervalSeconds'}:
-                    e_config[key] = value
+                    state.e_config[key] = value
                 else:
                     resp = simple_error_response('Invalid setting for PATCH', 400)
+            record_change(state.e_config)
         except Exception:
             traceback.print_exc()
             resp = simple_error_response('Server encountered an unexpected Error', 500)
@@ -169,7 +168,7 @@ class EventServiceAPI(Resource):
     # HTTP DELETE
     def delete(self):
         logging.info('EventServiceAPI DELETE called')
-        return error_not_allowed_response(e_config['@odata.id'], 'DELETE', {'Allow': self.allow})
+        return error_not_allowed_response(state.e_config['@odata.id'], 'DELETE', {'Allow': self.allow})
 
 # SubscriptionCollectionAPI
 #
@@ -192,7 +191,7 @@ class SubscriptionCollectionAPI(Resource):
     def get(self):
         logging.info('SubscriptionCollectionAPI GET called')
         try:
-            resp = s_config, 200
+            resp = state.s_config, 200
         except Exception:
             traceback.print_exc()
             resp = simple_error_response('Server encountered an unexpected Error', 500)
@@ -201,23 +200,22 @@ class SubscriptionCollectionAPI(Resource):
     # HTTP PUT
     def put(self):
         logging.info('SubscriptionCollectionAPI PUT called')
-        return error_not_allowed_response(s_config['@odata.id'], 'PUT', {'Allow': self.allow})
+        return error_not_allowed_response(state.s_config['@odata.id'], 'PUT', {'Allow': self.allow})
 
     # HTTP POST
     def post(self):
-        global id
         logging.info('SubscriptionCollectionAPI POST called')
         raw_dict = request.get_json(force=True)
         for field in required:
             if field not in raw_dict:
                 return simple_error_response('%s is required' % (field) , 400)
-        ident = '%d' % id
+        ident = '%d' % state.id
         
         destination = raw_dict.get('Destination', '')
         event_types = raw_dict.get('EventTypes', '')
-        if 'EventTypesForSubscription' in e_config:  # XD224 Paradise does not have this field
+        if 'EventTypesForSubscription' in state.e_config:  # XD224 Paradise does not have this field
             for evType in event_types:
-                if evType not in e_config['EventTypesForSubscription']:
+                if evType not in state.e_config['EventTypesForSubscription']:
                     return 'Invalid EventType %s' % evType, 400
 
         if 'Context' in raw_dict:
@@ -229,18 +227,18 @@ class SubscriptionCollectionAPI(Resource):
         else:
             registry_prefixes = None
         CreateSubscription(ident, destination, event_types, context, registry_prefixes)
-        id += 1
+        state.id += 1
         return success_response('/redfish/v1/EventService/Subscriptions/%s' % ident, 201)
 
     # HTTP PATCH
     def patch(self):
         logging.info('SubscriptionCollectionAPI PATCH called')
-        return error_not_allowed_response(s_config['@odata.id'], 'PATCH', {'Allow': self.allow})
+        return error_not_allowed_response(state.s_config['@odata.id'], 'PATCH', {'Allow': self.allow})
 
     # HTTP DELETE
     def delete(self):
         logging.info('SubscriptionCollectionAPI DELETE called')
-        return error_not_allowed_response(s_config['@odata.id'], 'DELETE', {'Allow': self.allow})
+        return error_not_allowed_response(state.s_config['@odata.id'], 'DELETE', {'Allow': self.allow})
 
 # SubscriptionAPI
 #
@@ -307,11 +305,12 @@ class SubscriptionAPI(Resource):
                         return 'Field %s is not patchable' % field, 400
                     else:
                         if field == 'RegistryPrefixes' and value != []:
-                            if 'EventTypesForSubscription' in e_config:  # XD224 Paradise does not have this field
+                            if 'EventTypesForSubscription' in state.e_config:  # XD224 Paradise does not have this field
                                 for evType in value:
-                                    if evType not in e_config['EventTypesForSubscription']:
+                                    if evType not in state.e_config['EventTypesForSubscription']:
                                         return 'Invalid EventType %s' % evType, 400
                         members[ident][field] = value
+                members.changed(ident)
                 resp = success_response('PATCH request successful', 200)
         except Exception:
             traceback.print_exc()
@@ -329,11 +328,11 @@ class SubscriptionAPI(Resource):
                 # "Members": [
                 #   { "@odata.id": "/redfish/v1/EventService/Subscriptions/1" },
                 #   { "@odata.id": "/redfish/v1/EventService/Subscriptions/2" } ]
-                for i in range(len(s_config['Members'])):
-                    if data_id == s_config['Members'][i]['@odata.id']:
-                        del s_config['Members'][i]
+                for i in range(len(state.s_config['Members'])):
+                    if data_id == state.s_config['Members'][i]['@odata.id']:
+                        del state.s_config['Members'][i]
+                        state.s_config['Members@odata.count'] -= 1
                         del members[ident]
-                        s_config['Members@odata.count'] -= 1
                         resp = success_response('Resource deleted', 200)
                         break
         except Exception:
@@ -350,21 +349,30 @@ class SubscriptionAPI(Resource):
 def CreateEventService(event_config, sub_config, sub_generator):
     logging.info('CreateEventService put called')
     try:
-        global e_config
-        global s_config
-        global s_generator
-        e_config = event_config
-        s_config = sub_config
-        s_generator = sub_generator
+        state.e_config = event_config
+        state.s_config = sub_config
+        state.s_generator = sub_generator
         g.api.add_resource(EventServiceAPI,             '/redfish/v1/EventService')
         g.api.add_resource(SubscriptionCollectionAPI,   '/redfish/v1/EventService/Subscriptions')
         g.api.add_resource(SubscriptionAPI,             '/redfish/v1/EventService/Subscriptions/<string:ident>')
-        resp = e_config, 200
+        resp = state.e_config, 200
     except Exception:
         traceback.print_exc()
         resp = simple_error_response('Server encountered an unexpected Error', 500)
     return resp
 
+# RestoreSubscription
+#
+# Called internally to recreate an event subscription that was kept by the
+# state store (see api_emulator/state_store.py). The subscription is already
+# a member of the restored collection.
+def RestoreSubscription(ident, config):
+    logging.debug('restored config for EventService/Subscriptions/%s' % ident)
+    members[ident] = config
+    # New subscriptions get ids after the restored ones
+    if ident.isdigit():
+        state.id = max(state.id, int(ident) + 1)
+
 # CreateSubscription
 #
 # Called internally to create an instance of an event subscription resource for the EventService.
@@ -374,16 +382,16 @@ def CreateSubscription(ident, destination, event_types, context=None, registry_p
     wildcards = {}
     try:
         wildcards['id'] = ident
-        config = s_generator(wildcards)
+        config = state.s_generator(wildcards)
         config['Destination'] = destination
         config['EventTypes'] = event_types
         if context is not None:
             config['Context'] = context
         if registry_prefixes is not None:
             config['RegistryPrefixes'] = registry_prefixes
+        state.s_config['Members'].append({'@odata.id': config['@odata.id']})
+        state.s_config['Members@odata.count'] += 1
         members[ident] = config
-        s_config['Members'].append({'@odata.id': config['@odata.id']})
-        s_config['Members@odata.count'] += 1
         resp = config, 200
     except Exception:
         traceback.print_exc()
@@ -47,8 +47,9 @@ from flask_restful import reqparse, Api, Resource
 
 from .redfish_auth import auth, Privilege
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceDict
 
-members = {}
+members = InstanceDict(__name__, 'members')
 
 required_post_fields = [
     'CertificateString',
@@ -229,6 +230,7 @@ class ReplaceCertificateAPI(Resource):
                         newCert[field] = raw_dict[field]
             for field in newCert:
                 members[cert_id][field] = newCert[field]
+            members.changed(cert_id)
             resp = success_response('POST Successful', 200)
         except Exception:
             traceback.print_exc()
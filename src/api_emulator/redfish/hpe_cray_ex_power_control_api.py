@@ -47,8 +47,9 @@ from flask_restful import reqparse, Api, Resource
 
 from .redfish_auth import auth, Privilege
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceDict, record_change
 
-members = {}
+members = InstanceDict(__name__, 'members')
 
 # applyControlPatch
 #
@@ -91,6 +92,7 @@ def applyControlPatch(raw_dict, ch_id, ident):
         if resp[1] == 200:
             control['SetPoint'] = newSetPoint
             control['ControlMode'] = newControlMode
+            record_change(control)
     else:
         resp = simple_error_response('Control is disabled for %s/Controls/%s' % (ch_id, ident), 400)
     return resp
@@ -52,10 +52,11 @@ from .redfish_auth import auth, Privilege
 from .event_generator import GenEvent, GenEventRecord
 from .event_service_api import send_event
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceDict, InstanceThread, VersionedDict
 
-members = {}
-members_actions = {}
-members_reset_thread = {}
+members = VersionedDict(__name__, 'members')
+members_actions = InstanceDict(__name__, 'members_actions')
+members_reset_thread = InstanceDict(__name__, 'members_reset_thread')
 
 reboot_actions = ['GracefulRestart', 'ForceRestart', 'PushPowerButton']
 off_actions = ['Off', 'ForceOff', 'GracefulShutdown', 'Nmi']
@@ -67,7 +68,7 @@ default_actions = ['ForceOff', 'On', 'Off']
 #
 # Worker thread for performing emulated asynchronous manager power resets.
 #
-class ResetWorker(Thread):
+class ResetWorker(InstanceThread):
     def __init__(self, sys_id):
         super(ResetWorker, self).__init__()
         self.sys_id = sys_id
@@ -75,23 +76,27 @@ class ResetWorker(Thread):
     def run(self):
         # Managers don't have PowerState. It is assumed that they are 'On' if they're reachable
         # members[self.sys_id]['PowerState'] = 'Off'
-        members[self.sys_id]['Status']['State'] = 'Disabled'
+        set_state(self.sys_id, 'Disabled')
         # No events for managers
         # send_power_event(self.sys_id, 'Off')
         sleep(5)
+        if self.cancelled():
+            return
         # members[self.sys_id]['PowerState'] = 'PoweringOn'
-        members[self.sys_id]['Status']['State'] = 'Starting'
+        set_state(self.sys_id, 'Starting')
         # No events for managers
         # send_power_event(self.sys_id, 'On')
         sleep(5)
+        if self.cancelled():
+            return
         # members[self.sys_id]['PowerState'] = 'On'
-        members[self.sys_id]['Status']['State'] = 'Enabled'
+        set_state(self.sys_id, 'Enabled')
 
 # PowerOnWorker
 #
 # Worker thread for performing emulated asynchronous manager power on actions.
 #
-class PowerOnWorker(Thread):
+class PowerOnWorker(InstanceThread):
     def __init__(self, sys_id):
         super(PowerOnWorker, self).__init__()
         self.sys_id = sys_id
@@ -99,12 +104,23 @@ class PowerOnWorker(Thread):
     def run(self):
         # Managers don't have PowerState. It is assumed that they are 'On' if they're reachable
         # members[self.sys_id]['PowerState'] = 'PoweringOn'
-        members[self.sys_id]['Status']['State'] = 'Starting'
+        set_state(self.sys_id, 'Starting')
         # No events for managers
         # send_power_event(self.sys_id, 'On')
         sleep(5)
+        if self.cancelled():
+            return
         # members[self.sys_id]['PowerState'] = 'On'
-        members[self.sys_id]['Status']['State'] = 'Enabled'
+        set_state(self.sys_id, 'Enabled')
+
+# set_state
+#
+# Publishes a new version of the manager with the Status.State of a power
+# transition.
+#
+def set_state(id, state):
+    with members.edit(id) as member:
+        member['Status']['State'] = state
 
 def send_power_event(id, power_state):
     ooc = members[id]['@odata.id']
@@ -262,7 +278,7 @@ class ManagerResetActionAPI(Resource):
                         elif value in off_actions:
                             logging.info('Powering Off')
                             # members[ident]['PowerState'] = 'Off'
-                            members[ident]['Status']['State'] = 'Disabled'
+                            set_state(ident, 'Disabled')
                             # No events for managers
                             # send_power_event(ident, 'Off')
                         elif value in on_actions:
@@ -46,8 +46,9 @@ from flask_restful import reqparse, Api, Resource
 
 from .redfish_auth import auth, Privilege
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceDict
 
-members = {}
+members = InstanceDict(__name__, 'members')
 
 typeMap = {
     'Oem': {
@@ -159,6 +160,7 @@ class ManagerNetworkProtocolAPI(Resource):
                         newNTP[field] = raw_dict['NTP'][field]
                 config['Oem'] = newOem
                 config['NTP'] = newNTP
+                members.changed(m_id)
                 resp = success_response('Patch Successful', 200)
         except Exception:
             traceback.print_exc()
@@ -46,8 +46,9 @@ from flask_restful import reqparse, Api, Resource
 
 from .redfish_auth import auth, Privilege
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceDict
 
-members = {}
+members = InstanceDict(__name__, 'members')
 
 # applyPatch
 #
@@ -94,6 +95,7 @@ def applyPatch(raw_dict, ch_id):
                 control['PowerLimit'] = {'LimitInWatts': newLimits[i]}
             else:
                 control['PowerLimit']['LimitInWatts'] = newLimits[i]
+    members.changed(ch_id)
     return success_response('Patch Successful', 200)
 
 # PowerAPI
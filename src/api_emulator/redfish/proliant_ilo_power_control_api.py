@@ -47,8 +47,9 @@ from flask_restful import reqparse, Api, Resource
 
 from .redfish_auth import auth, Privilege
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceDict, record_change
 
-members = {}
+members = InstanceDict(__name__, 'members')
 
 # applylimit
 #
@@ -74,6 +75,7 @@ def applyLimit(raw_dict, member):
             newLimits.append({'idx': i, 'limit': newLimitInWatts})
     for limit in range(len(newLimits)):
         member['PowerLimits'][limit['idx']]['PowerLimitInWatts'] = limit['limit']
+    record_change(member)
     return success_response('Patch Successful', 200)
 
 # AccPowerServiceAPI
@@ -43,14 +43,21 @@ import g
 import sys, traceback
 import logging
 import copy
-from flask import Flask, request, make_response, render_template
+from flask import Flask, Response, request, make_response, render_template, send_file
 from flask_restful import reqparse, Api, Resource
 
 from .redfish_auth import auth, Privilege
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from .. import instance
+from ..instance import InstanceState
+from ..compression import negotiate, compress, compressible, set_coding
+from ..response_cache import member_response, conditional, pretty
 
 members = {}
-resourceManager = None
+state = InstanceState(__name__, resourceManager=None)
+
+# Size of the chunks that resources kept as JSON text are sent in
+RAW_CHUNK_SIZE = 64 * 1024
 
 class PathError(Exception):
     pass
@@ -64,7 +71,7 @@ class RedfishBaseAPI(Resource):
 
         try:
             # Fetch ServiceRoot
-            config = resourceManager.configuration
+            config = state.resourceManager.configuration
             resp = config, 200
         except Exception:
             traceback.print_exc()
@@ -118,10 +125,31 @@ class RedfishAPI(Resource):
     def get(self, path):
 
         try:
-            config = self.get_configuration(resourceManager, path)
-            resp = config, 200
+            # One lookup in the path trie for both the JSON text and the view
+            try:
+                member = state.resourceManager.resource_dictionary.find_object(path)
+            except KeyError as e:
+                raise PathError("Resource not found: {}".format(e))
+            raw = member.raw
+            if not member.claimed and instance.current().response_cache is not None:
+                # The resource can not change, its response is kept on the member
+                body, tag, coding = member_response(member, pretty(), negotiate())
+                if body is raw:
+                    resp = conditional(self.send_text(raw), tag)
+                else:
+                    resp = conditional(Response(body, 200, mimetype='application/json'), tag)
+                resp = set_coding(resp, coding)
+            elif raw is not None:
+                coding = negotiate()
+                if coding is not None and compressible(raw):
+                    resp = Response(compress(raw, coding), 200, mimetype='application/json')
+                else:
+                    resp, coding = self.send_text(raw), None
+                resp = set_coding(resp, coding)
+            else:
+                resp = member.view, 200
         except PathError:
-            resp = error_404_response(request.path)
+            resp = self.send_artifact(state.resourceManager, path)
         except Exception:
             traceback.print_exc()
             resp = simple_error_response('Internal Server Error', 500)
@@ -133,17 +161,54 @@ class RedfishAPI(Resource):
         Helper function to follow the given path starting with the given object
 
         Arguments:
-            obj  - Beginning object to start searching down.  obj should have a get_resource()
+            obj  - Beginning object to start searching down.  obj should have a get_view()
             path - Path of object to get
 
         """
 
         try:
-            config = obj.get_resource(path)
+            config = obj.get_view(path)
         except (IndexError, AttributeError, TypeError, AssertionError, KeyError) as e:
             raise PathError("Resource not found: {}".format(e))
         return config
 
+    @staticmethod
+    def send_text(raw):
+        """
+        Helper function to send a resource that is kept as JSON text as is.
+        The text is streamed in chunks rather than copied in one piece.
+
+        Arguments:
+            raw - The JSON text
+        """
+        def chunks():
+            for start in range(0, len(raw), RAW_CHUNK_SIZE):
+                yield bytes(raw[start:start + RAW_CHUNK_SIZE])
+
+        return Response(chunks(), 200, mimetype='application/json',
+                        headers={'Content-Length': str(len(raw))})
+
+    @staticmethod
+    def send_artifact(obj, path):
+        """
+        Helper function to serve the non-JSON mockup file (e.g. $metadata/index.xml)
+        at the given path, or a 404 if there is none.
+
+        The file is handed to the WSGI server, which can send it without
+        reading it into memory. Clients can revalidate with the ETag and
+        Last-Modified headers.
+
+        Arguments:
+            obj  - Object with a get_artifact()
+            path - Path of the artifact
+        """
+        try:
+            artifact = obj.get_artifact(path)
+        except KeyError:
+            return error_404_response(request.path)
+        resp = send_file(artifact.path, mimetype=artifact.content_type, conditional=True)
+        resp.cache_control.no_cache = True
+        return resp
+
 def CreateRedfishBase(resource_manager):
-    global resourceManager
-    resourceManager = resource_manager
\ No newline at end of file
+    state.resourceManager = resource_manager
\ No newline at end of file
@@ -39,6 +39,7 @@ from flask import request
 
 from .response import error_unauthorized_response
 from ..static_loader import Member
+from ..instance import InstanceState
 
 class AuthConfigError(Exception):
     pass
@@ -106,17 +107,30 @@ DEFAULT_USERS = {
 ROLES = {'Administrator': ADMIN_USER.privileges, 'Operator': OPERATOR_USER.privileges, 'ReadOnly': GUEST_USER.privileges}
 
 class Session:
-    def __init__(self, username):
+    def __init__(self, username, sessionId=None):
         self.username = username
-        self.sessionId = strgen.StringGenerator('[A-Z]{3}[0-9]{10}').render()
+        self.sessionId = sessionId or strgen.StringGenerator('[A-Z]{3}[0-9]{10}').render()
         self.token = '{}SESSION{}'.format(self.sessionId, username)
 
 # this is the Base HTTP Auth class that is used to derive the Redfish "Basic or Token Auth" class
+# Accounts and sessions of each emulator instance
+state = InstanceState(__name__, users=DEFAULT_USERS, sessions={})
+
 class RedfishAuth(object):
     def __init__(self):
         self.realm = "CSM_Redfish_Emulator"
-        self.users = DEFAULT_USERS.copy()
-        self.sessions = {}
+
+    @property
+    def users(self):
+        return state.users
+
+    @users.setter
+    def users(self, users):
+        state.users = users
+
+    @property
+    def sessions(self):
+        return state.sessions
 
     def auth_error(self, scheme):
         headers = {'WWW-Authenticate': '{0} realm="{1}"'.format(scheme, self.realm)}
@@ -243,7 +257,6 @@ class RedfishAuth(object):
         # Get all of the accounts defined in the mockup
         for member in accounts_config.configuration['Members']:
             url = member['@odata.id']
-            url = url.replace('/redfish/v1/', '')
             account_config = resource_dictionary.get_resource(url)
             accounts[account_config['UserName']] = account_config
             account_schema = account_config['@odata.type']
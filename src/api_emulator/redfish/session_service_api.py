@@ -48,9 +48,10 @@ from flask_restful import reqparse, Api, Resource
 
 from .redfish_auth import auth, Privilege, Session
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceDict, InstanceState
 
-collection_config = {}
-members = {}
+members = InstanceDict(__name__, 'members')
+state = InstanceState(__name__, collection_config={})
 
 # SessionCollectionAPI
 #
@@ -73,7 +74,7 @@ class SessionCollectionAPI(Resource):
     # HTTP GET
     def get(self):
         logging.info('%s %s called' % (self.apiName, request.method))
-        return collection_config, 200
+        return state.collection_config, 200
 
     # HTTP PUT
     def put(self):
@@ -112,8 +113,8 @@ class SessionCollectionAPI(Resource):
                 '@odata.id': '{}'.format(new_session_config['@odata.id'])
             }
             auth.start_session(session)
-            collection_config['Members'].append(new_session_link)
-            collection_config['Members@odata.count'] += 1
+            state.collection_config['Members'].append(new_session_link)
+            state.collection_config['Members@odata.count'] += 1
             members[new_session_config['Id']] = new_session_config
             resp = success_response(new_session_config['@odata.id'], 201, {'X-Auth-Token': session.token})
         except Exception:
@@ -209,10 +210,10 @@ class SessionAPI(Resource):
                     # Check for additional privileges needed for modifying someone else's session.
                     if not current_user.privileges[Privilege.ConfigureUsers.name]:
                         return auth.auth_error('Basic')
-                for i in range(len(collection_config['Members'])):
-                    if collection_config['Members'][i]['@odata.id'] == members[ident]['@odata.id']:
-                        del collection_config['Members'][i]
-                        collection_config['Members@odata.count'] -= 1
+                for i in range(len(state.collection_config['Members'])):
+                    if state.collection_config['Members'][i]['@odata.id'] == members[ident]['@odata.id']:
+                        del state.collection_config['Members'][i]
+                        state.collection_config['Members@odata.count'] -= 1
                         auth.stop_session(ident)
                         del members[ident]
                         resp = success_response('Resource deleted', 200)
@@ -228,10 +229,9 @@ class SessionAPI(Resource):
 # This resource is affected by SessionCollectionAPI() and SessionAPI().
 #
 def CreateSessionService(config):
-    global collection_config
 
     logging.debug('added config for SessionService')
-    collection_config = config
+    state.collection_config = config
 
 # CreateSession
 #
@@ -239,7 +239,6 @@ def CreateSessionService(config):
 # These resources are affected by SessionCollectionAPI() and SessionAPI()
 #
 def CreateSession(id, config):
-    global members
 
     logging.debug('added config for SessionService/%s - %s' % (id, config['UserName']))
     members[id] = config
@@ -49,14 +49,18 @@ from queue import Queue
 from threading import Thread
 from time import sleep
 from .response import success_response, simple_error_response, error_404_response, error_not_allowed_response
+from ..instance import InstanceState, VersionedDict, current, activate, record_change
 from .redfish_auth import auth, Privilege
 
-members = {}
-configAPI = {}
+members = VersionedDict(__name__, 'members')
+state = InstanceState(__name__, configAPI={})
 q = Queue(maxsize = 10)
+# The update that UpdateWorker() is applying
+running = None
 
 _CONFIG_TEMPLATE = \
 {
+  "@odata.id": "/redfish/v1/UpdateService/FirmwareInventory/Config",
   "Id": "UpdateServiceConfigInfo",
   "Name": "UpdateServiceConfig",
   "Description": "Use PATCH operations to set the below values to affect Update Service actions.",
@@ -96,12 +100,19 @@ class firmware_update:
     def __init__(self, imageURI, target):
         self.imageURI = imageURI
         self.target = target
-        self.updateTime = configAPI['CurrentValues']['UpdateTime']
-        if target in configAPI['CurrentValues']['Fail']:
+        # The update is applied to the emulator instance that queued it
+        self.instance = current()
+        self.generation = self.instance.generation
+        self.updateTime = state.configAPI['CurrentValues']['UpdateTime']
+        if target in state.configAPI['CurrentValues']['Fail']:
             self.fail = True
         else:
             self.fail = False
 
+    def cancelled(self):
+        # Updates queued before the instance was reset are dropped
+        return self.instance.generation != self.generation
+
 # UpdateWorker
 #
 # Worker thread for performing emulated asynchronous SimpleUpdates. Updates are
@@ -113,21 +124,68 @@ class UpdateWorker(Thread):
     def __init__(self):
         super(UpdateWorker, self).__init__()
 
+    def next_update(self):
+        # Like q.get(), but the update becomes the running one while q.mutex
+        # is held, so that PendingUpdates() always sees it in one or the other
+        global running
+        with q.not_empty:
+            running = None
+            while not q.queue:
+                q.not_empty.wait()
+            running = q.queue.popleft()
+            q.not_full.notify()
+        return running
+
     def run(self):
         logging.info('Starting update thread')
         while True:
-            update = q.get()
+            update = self.next_update()
+            if update.cancelled():
+                continue
             logging.info('Starting update - Image = %s, Target = %s, UpdateTime = %d, Fail = %s' % (update.imageURI, update.target, update.updateTime, update.fail))
             #TODO: Make this follow the image URL
             if update.updateTime > 0:
                 sleep(update.updateTime)
-            if update.fail:
-                members[update.target]['Status']['Health'] = 'ERROR'
-            else:
-                members[update.target]['Status']['Health'] = 'OK'
-                members[update.target]['Version'] = update.imageURI
+                if update.cancelled():
+                    continue
+            with activate(update.instance):
+                with members.edit(update.target) as target:
+                    if update.fail:
+                        target['Status']['Health'] = 'ERROR'
+                    else:
+                        target['Status']['Health'] = 'OK'
+                        target['Version'] = update.imageURI
             logging.info('Starting complete for %s' % update.target)
 
+# PendingUpdates
+#
+# Returns (imageURI, target, updateTime, fail) of the updates of the current
+# emulator instance that are queued or being applied, oldest first. Used by
+# checkpoints, see api_emulator/checkpoint.py.
+#
+def PendingUpdates():
+    inst = current()
+    with q.mutex:
+        updates = list(q.queue)
+        update = running
+    if update is not None:
+        updates.insert(0, update)
+    return [(u.imageURI, u.target, u.updateTime, u.fail) for u in updates
+            if u.instance is inst and not u.cancelled()]
+
+# ResumeUpdates
+#
+# Queues the updates returned by PendingUpdates() again for the current
+# emulator instance. Updates that were being applied start over.
+#
+def ResumeUpdates(updates):
+    for imageURI, target, updateTime, fail in updates:
+        if target in members:
+            update = firmware_update(imageURI, target)
+            update.updateTime = updateTime
+            update.fail = fail
+            q.put(update)
+
 # Start the SimpleUpdate worker thread.
 worker = UpdateWorker().start()
 
@@ -154,7 +212,7 @@ class UpdateServiceConfigAPI(Resource):
     def get(self):
         logging.info('UpdateServiceConfigAPI GET called')
         try:
-            resp = configAPI, 200
+            resp = state.configAPI, 200
         except Exception:
             traceback.print_exc()
             resp = simple_error_response('Server encountered an unexpected Error', 500)
@@ -163,12 +221,12 @@ class UpdateServiceConfigAPI(Resource):
     # HTTP PUT
     def put(self):
         logging.info('UpdateServiceConfigAPI PUT called')
-        return error_not_allowed_response(configAPI['@odata.id'], 'PUT', {'Allow': self.allow})
+        return error_not_allowed_response(state.configAPI['@odata.id'], 'PUT', {'Allow': self.allow})
 
     # HTTP POST
     def post(self):
         logging.info('UpdateServiceConfigAPI POST called')
-        return error_not_allowed_response(configAPI['@odata.id'], 'POST', {'Allow': self.allow})
+        return error_not_allowed_response(state.configAPI['@odata.id'], 'POST', {'Allow': self.allow})
 
     # HTTP PATCH
     def patch(self):
@@ -177,13 +235,13 @@ class UpdateServiceConfigAPI(Resource):
         logging.info(raw_dict)
         tempValues = {}
         try:
-            resp = configAPI['CurrentValues'], 200
+            resp = state.configAPI['CurrentValues'], 200
             for setting in {'Fail', 'Hang', 'UpdateTime'}:
                 if setting in raw_dict:
                     value = raw_dict[setting]
                     if setting == 'Fail':
                         for target in value:
-                            if target not in configAPI['Parameters'][0]['AllowableValues']:
+                            if target not in state.configAPI['Parameters'][0]['AllowableValues']:
                                 resp = simple_error_response('Invalid target for Fail, %s' % target, 400)
                                 return resp
                     else:
@@ -192,9 +250,10 @@ class UpdateServiceConfigAPI(Resource):
                             return resp
                     tempValues[setting] = value
                 else:
-                    tempValues[setting] = configAPI['CurrentValues'][setting]
-            configAPI['CurrentValues'] = tempValues
-            resp = configAPI['CurrentValues'], 200
+                    tempValues[setting] = state.configAPI['CurrentValues'][setting]
+            state.configAPI['CurrentValues'] = tempValues
+            record_change(state.configAPI)
+            resp = state.configAPI['CurrentValues'], 200
         except Exception:
             traceback.print_exc()
             resp = simple_error_response('Server encountered an unexpected Error', 500)
@@ -203,7 +262,7 @@ class UpdateServiceConfigAPI(Resource):
     # HTTP DELETE
     def delete(self):
         logging.info('UpdateServiceAPI DELETE called')
-        return error_not_allowed_response(configAPI['@odata.id'], 'DELETE', {'Allow': self.allow})
+        return error_not_allowed_response(state.configAPI['@odata.id'], 'DELETE', {'Allow': self.allow})
 
 # UpdateServiceAPI
 #
@@ -298,18 +357,25 @@ def CreateFirmwareTarget(target_id, config):
     logging.info('CreateFirmwareTarget put called')
     try:
         global wildcards
-        global configAPI
         logging.debug('added config for %s' % target_id)
         members[target_id]=config
-        configAPI = copy.deepcopy(_CONFIG_TEMPLATE)
+        state.configAPI = copy.deepcopy(_CONFIG_TEMPLATE)
         for member in members.keys():
-            configAPI['Parameters'][0]['AllowableValues'].append(member)
+            state.configAPI['Parameters'][0]['AllowableValues'].append(member)
         resp = config, 200
     except Exception:
         traceback.print_exc()
         resp = simple_error_response('Server encountered an unexpected Error', 500)
     return resp
 
+# RestoreUpdateConfig
+#
+# Called internally to set the UpdateServiceConfigAPI() values kept by the
+# state store or a checkpoint, once the firmware targets are created.
+#
+def RestoreUpdateConfig(config):
+    state.configAPI['CurrentValues'] = config['CurrentValues']
+
 # SimpleUpdateAPI
 #
 # This services SimpleUpdate POST requests to emulate firmware updates.
@@ -350,9 +416,9 @@ class SimpleUpdateAPI(Resource):
         update_targets = []
         
         try:
-            if configAPI['CurrentValues']['Hang'] > 0:
-                logging.info('Hanging for %d seconds' % configAPI['CurrentValues']['Hang'])
-                sleep(configAPI['CurrentValues']['Hang'])
+            if state.configAPI['CurrentValues']['Hang'] > 0:
+                logging.info('Hanging for %d seconds' % state.configAPI['CurrentValues']['Hang'])
+                sleep(state.configAPI['CurrentValues']['Hang'])
                 logging.info('Finished hanging')
                 return simple_error_response('Hung', 500)
             
@@ -377,7 +443,8 @@ class SimpleUpdateAPI(Resource):
             for target in update_targets:
                 update = firmware_update(imageURI, target)
                 q.put(update)
-                members[target]['Status']['Health'] = 'UPDATING'
+                with members.edit(target) as inventory:
+                    inventory['Status']['Health'] = 'UPDATING'
             resp = success_response('Request Secceeded', 200)
         except Exception:
             traceback.print_exc()
@@ -33,53 +33,363 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 # Resource Dictionary
+#
+# Each ResourceDictionary holds the static resources of one emulator
+# instance (see instance.py), so several can live in one process. Instances
+# that emulate the same mockup can share it, see OverlayResourceDictionary.
 
-# Variable to store resource dictionary
 import logging
-import os.path
 
-resdict = {}
+from . import static_loader
+from .path_trie import PathTrie, REST_BASE, canonical
+
+def split_type(odata_type):
+    """
+    Returns the namespace and version of an @odata.type, e.g. ('Chassis',
+    'v1_10_0') for '#Chassis.v1_10_0.Chassis'. The version of unversioned
+    types is None.
+    """
+    parts = odata_type.lstrip('#').split('.')
+    if len(parts) > 2:
+        return parts[0], parts[1]
+    return parts[0], None
+
+def collection_members(config):
+    """
+    Returns the paths of the Members of a collection resource, or None if
+    config is not a collection
+    """
+    if not isinstance(config, dict) or not isinstance(config.get('Members'), list):
+        return None
+    return [canonical(m['@odata.id']) for m in config['Members']
+            if isinstance(m, dict) and isinstance(m.get('@odata.id'), str)]
+
+def below(path, scope):
+    """
+    Whether canonical path is scope or below it
+    """
+    return scope == '' or path == scope or path.startswith(scope + '/')
 
 class ResourceDictionary(object):
+    """
+    Static resources of an emulator instance.
+
+    Resources are looked up by their path below the REST base, which may
+    also be given as the '@odata.id' of the resource, see path_trie.py.
+
+    The resources are also indexed by the namespace of their @odata.type
+    (see find_type()) and, for collections, by their members (see
+    members()). Loaders use these rather than probing the paths a mockup
+    might use. The indexes are built on first use, for the part of the
+    mockup that is asked for, so loading the mockup does not pay for them.
+    """
 
     def __init__(self):
         logging.info('Init ResourceDictionary.')
+        # Resources (static_loader.Member), by canonical path
+        self.resdict = PathTrie()
+        # Non-JSON files of the mockup (static_loader.Artifact), by canonical path
+        self.artifacts = {}
+        # {path: @odata.type} of the resources, by namespace, and the
+        # @odata.type of each path. Only the resources at and below the
+        # paths in scopes are indexed.
+        self.types = {}
+        self.typed = {}
+        self.scopes = []
+        # Member paths of the collections that members() was asked for
+        self.collections = {}
+        # change_journal.ChangeJournal that records the resources added and
+        # deleted once the resources are set up, see resource_manager.py
+        self.journal = None
 
+    def __len__(self):
+        return len(self.resdict)
 
     def get_resource(self, path):
-        if path != '':
-            p = os.path.normpath(path)
-        else:
-            p = path
-        obj = resdict[p].configuration
+        obj = self.resdict[path].configuration
         return obj
 
+    def get_view(self, path):
+        """
+        Like get_resource() but for read-only use. The returned object must
+        not be modified, it may be shared with other resources.
+        """
+        return self.resdict[path].view
+
+    def get_raw(self, path):
+        """
+        Returns the resource as JSON text if it is kept that way (see
+        static_loader.RawMember), otherwise None
+        """
+        return self.resdict[path].raw
+
     def get_object(self, path):
-        if path != '':
-            p = os.path.normpath(path)
-        else:
-            p = path
-        return resdict[p]
+        return self.resdict[path]
+
+    def find_object(self, path):
+        """
+        Like get_object() but for read-only use, e.g. to answer a GET
+        """
+        return self.resdict[path]
+
+    def replace_configuration(self, old, new):
+        """
+        Makes new the configuration of the resource whose configuration is
+        old, e.g. when a dynamic resource publishes a new version of a
+        resource it got from get_resource(). Nothing is replaced if old is
+        no longer the configuration of the resource at its @odata.id.
+        """
+        try:
+            obj = self.find_object(old['@odata.id'])
+        except (KeyError, TypeError):
+            return
+        if obj.config is old:
+            obj.config = new
 
     def add_resource(self, path, obj):
-        if path != '':
-            p = os.path.normpath(path)
-        else:
-            p = path
-        resdict[p] = obj
+        p = canonical(path)
+        self.resdict[p] = obj
+        if self.scopes:
+            self.unindex(p)
+            if self.indexed(p):
+                self.index(p, obj)
+        if self.journal is not None:
+            self.journal.record(REST_BASE + '/' + p)
         return obj
 
     def delete_resource(self, path):
-        if path != '':
-            p = os.path.normpath(path)
-        else:
-            p = path
-        del resdict[p]
+        p = canonical(path)
+        del self.resdict[p]
+        self.unindex(p)
+        if self.journal is not None:
+            self.journal.record(REST_BASE + '/' + p, True)
+
+    def indexed(self, path):
+        """
+        Whether the resources at canonical path are indexed by type
+        """
+        return any(below(path, scope) for scope in self.scopes)
+
+    def index(self, path, obj):
+        """
+        Adds the resource obj at canonical path to the type index
+        """
+        odata_type = obj.odata_type
+        if isinstance(odata_type, str):
+            self.typed[path] = odata_type
+            self.types.setdefault(split_type(odata_type)[0], {})[path] = odata_type
+
+    def unindex(self, path):
+        """
+        Removes the resource at canonical path from the indexes
+        """
+        odata_type = self.typed.pop(path, None)
+        if odata_type is not None:
+            del self.types[split_type(odata_type)[0]][path]
+        self.collections.pop(path, None)
+
+    def find_type(self, namespace, path='', version=None):
+        """
+        Returns the paths of the resources at or below path whose @odata.type
+        is in namespace, e.g. 'Chassis', and if given of version, e.g.
+        'v1_10_0'.
+
+        The first call for a path indexes the resources below it, which
+        parses those not parsed yet (see STATIC_LAZY). Large resources kept
+        as JSON text are not parsed, their type is read from the text.
+        """
+        scope = canonical(path)
+        if not self.indexed(scope):
+            for p, obj in self.resdict.walk(scope):
+                self.index(p, obj)
+            self.scopes.append(scope)
+        return [p for p, odata_type in self.types.get(namespace, {}).items()
+                if below(p, scope) and (version is None or split_type(odata_type)[1] == version)]
+
+    def members(self, path):
+        """
+        Returns the paths of the members of the collection at path, or [] if
+        it is not a collection. Collections that were handed out for
+        modification are read again each time, their members may change.
+        """
+        p = canonical(path)
+        obj = self.resdict[p]
+        if obj.claimed:
+            return collection_members(obj.view) or []
+        members = self.collections.get(p)
+        if members is None:
+            members = self.collections[p] = collection_members(obj.view) or []
+        return list(members)
+
+    def children(self, path):
+        """
+        Returns the paths one segment below path that hold a resource or
+        lead to one
+        """
+        return self.resdict.children(path)
+
+    def walk(self, path):
+        """
+        Yields (path, resource object) for the resource at path and each
+        resource below it
+        """
+        return self.resdict.walk(path)
+
+    def add_artifact(self, path, artifact):
+        self.artifacts[canonical(path)] = artifact
+        return artifact
+
+    def get_artifact(self, path):
+        return self.artifacts[canonical(path)]
 
     def print_dictionary(self):
-        for x in resdict:
+        for x in self.resdict:
             print('Key: ')
             print(x)
             print('Value: ')
-            print(resdict[x])
+            print(self.resdict[x])
+
+
+class OverlayResourceDictionary(ResourceDictionary):
+    """
+    Resource dictionary of an emulator instance that shares its mockup with
+    other instances.  The mockup is loaded once into base, which is never
+    modified.  self.resdict only holds the resources that this instance has
+    added, or accessed for modification.
+
+    Reads of the other resources fall through to base.  get_object() first
+    gives the instance its own copy of the resource (see
+    static_loader.SharedMember), so the memory of an instance grows with the
+    resources it modifies rather than with the size of the mockup.
+
+    Arguments:
+        base - ResourceDictionary with the mockup, shared by the instances
+    """
+
+    def __init__(self, base):
+        super().__init__()
+        self.base = base
+        # Resources of base that were deleted from this instance
+        self.deleted = set()
+        # Resources that were added to this instance, which are indexed
+        # here rather than in base
+        self.added = set()
+
+    def __len__(self):
+        added = sum(1 for p in self.resdict if p not in self.base.resdict)
+        return len(self.base) + added - len(self.deleted)
+
+    def get_resource(self, path):
+        return self.get_object(path).configuration
+
+    def get_view(self, path):
+        return self.find_object(path).view
+
+    def get_raw(self, path):
+        return self.find_object(path).raw
+
+    def get_object(self, path):
+        """
+        Returns the resource object of this instance.  Callers may modify the
+        resource through its .configuration, so a resource of base is first
+        wrapped in a SharedMember of this instance, which copies the document
+        on that first modification.
+        """
+        obj = self.resdict.get(path)
+        if obj is None:
+            if self.deleted and canonical(path) in self.deleted:
+                raise KeyError(path)
+            obj = self.resdict[path] = static_loader.SharedMember(self.base.resdict[path].view)
+        return obj
+
+    def find_object(self, path):
+        """
+        Like get_object() but for read-only use, resources of base are
+        returned as they are.
+        """
+        obj = self.resdict.get(path)
+        if obj is None:
+            if self.deleted and canonical(path) in self.deleted:
+                raise KeyError(path)
+            obj = self.base.resdict[path]
+        return obj
+
+    def add_resource(self, path, obj):
+        p = canonical(path)
+        self.deleted.discard(p)
+        self.added.add(p)
+        return super().add_resource(p, obj)
+
+    def delete_resource(self, path):
+        p = canonical(path)
+        if p in self.base.resdict:
+            if p in self.deleted:
+                raise KeyError(path)
+            self.deleted.add(p)
+            self.resdict.pop(p, None)
+        else:
+            del self.resdict[p]
+        self.added.discard(p)
+        self.unindex(p)
+        if self.journal is not None:
+            self.journal.record(REST_BASE + '/' + p, True)
+
+    def rebase(self, path, deleted=False):
+        """
+        Called when the resource at path of base was reloaded, or
+        deleted, by the mockup watcher (see static_watcher.py).  The
+        instance then sees the resource of base, unless it has added,
+        deleted or modified its own.
+        """
+        p = canonical(path)
+        obj = self.resdict.get(p)
+        if p in self.added or p in self.deleted or (obj is not None and obj.claimed):
+            if deleted:
+                # What the instance has at path is now its own
+                self.deleted.discard(p)
+                if obj is not None and p not in self.added:
+                    self.added.add(p)
+                    if self.indexed(p):
+                        self.index(p, obj)
+            return
+        self.resdict.pop(p, None)
+        self.unindex(p)
+        if self.journal is not None:
+            self.journal.record(REST_BASE + '/' + p, deleted)
+
+    def find_type(self, namespace, path='', version=None):
+        # The other resources of this instance are copies of those in base
+        found = [p for p in self.base.find_type(namespace, path, version)
+                 if p not in self.deleted and p not in self.added]
+        return found + [p for p in super().find_type(namespace, path, version) if p in self.added]
+
+    def members(self, path):
+        p = canonical(path)
+        obj = self.resdict.get(p)
+        if p in self.added or (obj is not None and obj.claimed):
+            return super().members(p)
+        if p in self.deleted:
+            raise KeyError(path)
+        return self.base.members(p)
+
+    def children(self, path):
+        found = []
+        for child in self.base.resdict.children(path) + self.resdict.children(path):
+            # Skip the children whose resources were all deleted
+            if child not in found and next(self.walk(child), None) is not None:
+                found.append(child)
+        return found
+
+    def walk(self, path):
+        for p, obj in self.base.resdict.walk(path):
+            if p not in self.deleted:
+                yield p, self.resdict.get(p, obj)
+        for p, obj in self.resdict.walk(path):
+            if p not in self.base.resdict:
+                yield p, obj
 
+    def get_artifact(self, path):
+        p = canonical(path)
+        if p in self.artifacts:
+            return self.artifacts[p]
+        return self.base.artifacts[p]
@@ -44,15 +44,20 @@ import traceback
 # Local imports
 import g
 from . import utils
-from .resource_dictionary import ResourceDictionary
-from .static_loader import load_static
+from . import instance
+from .static_loader import load_static, load_shared_static, shared_watchers, static_dir
+from .resource_dictionary import OverlayResourceDictionary
+from .change_journal import ChangeJournal, JOURNAL_SIZE
+from .response_cache import ResponseCache, warm
+from .compression import OFFERS
+from .pristine import Pristine
 
 from .redfish.redfish_auth import auth
 from .redfish.redfish_api import RedfishAPI, RedfishBaseAPI, CreateRedfishBase
+from .redfish.emulator_api import StartupReportAPI, ChangesAPI, LinksAPI, CheckpointAPI, ResetAPI
 
 # BMC mockup imports
 from .loader import Loader
-from .ex235a_loader import EX235a
 
 # The ResourceManager __init__ method sets up the static and dynamic
 # resources.
@@ -117,28 +122,112 @@ class ResourceManager(object):
         self.uuid = str(uuid4())
         self.time = self.modified
 
-        # Load the static resources into the dictionary
+        # The resources are set up for the current emulator instance
+        self.instance = instance.current()
+        self.instance.resource_manager = self
+        if self.instance.mockup is None:
+            self.instance.mockup = copy.copy(g.staticfolder)
+        report = self.instance.report
 
-        self.resource_dictionary = ResourceDictionary()
-        mockupfolder = copy.copy(g.staticfolder)
+        # Load the static resources into the dictionary. Instances that
+        # emulate the same mockup share one copy of it.
 
-        self.Root = load_static(mockupfolder, 'redfish', mode, rest_base, self.resource_dictionary)
+        mockupfolder = self.instance.mockup
+
+        with report.phase('load_static'):
+            if mockupfolder in config_data.get('static_shared', []):
+                base = load_shared_static(mockupfolder, 'redfish', mode, rest_base, config_data)
+                self.instance.resource_dictionary = OverlayResourceDictionary(base)
+                self.Root = ''
+            else:
+                self.Root = load_static(mockupfolder, 'redfish', mode, rest_base, self.instance.resource_dictionary, config_data)
+        self.resource_dictionary = self.instance.resource_dictionary
+
+        # Boot from a checkpoint of the mockup. Only imported when
+        # CHECKPOINT is set.
+        if config_data.get('checkpoint'):
+            from .checkpoint import checkpoint_for, restore_checkpoint
+            checkpoint = checkpoint_for(config_data, mockupfolder)
+            if checkpoint is not None:
+                with report.phase('restore_checkpoint'):
+                    restore_checkpoint(self.instance, checkpoint)
+
+        # Put the resources kept by the state store on top of the mockup.
+        # Only imported when STATE_DB is set.
+        self.state_store = None
+        if config_data.get('state_db'):
+            from .state_store import open_store
+            with report.phase('restore_state'):
+                self.state_store = open_store(config_data['state_db'], config_data.get('state_db_interval', 1))
+                self.instance.restored |= self.state_store.restore(self.instance)
+
+        # Watch the mockup folder for changes. Started once the dynamic
+        # resources are set up. A shared mockup has one watcher for all of
+        # the instances, see load_shared_static().
+        self.watcher = None
+        if isinstance(self.resource_dictionary, OverlayResourceDictionary):
+            self.watcher = shared_watchers.get(mockupfolder)
+            if self.watcher is not None:
+                self.watcher.overlays.append(self.resource_dictionary)
+        elif config_data.get('static_watch', 'Disable').lower() != 'disable':
+            base_dir = static_dir(mockupfolder, 'redfish')
+            if os.path.isdir(base_dir):
+                from .static_watcher import StaticWatcher
+                with report.phase('static_watcher'):
+                    self.watcher = StaticWatcher(base_dir, self.resource_dictionary, config_data)
+            else:
+                logging.warning('Can not watch %s, it is not a mockup folder' % base_dir)
 
         # Sync auth with the Mockup's Account Service
         # This will add accounts that were specified via ENV or the default accounts
-        auth.sync_with_account_service(self.resource_dictionary)
+        with report.phase('sync_with_account_service'):
+            auth.sync_with_account_service(self.resource_dictionary)
 
-        # Add the base resource
-        g.api.add_resource(RedfishBaseAPI, '/redfish/v1/')
-        # This is a catch all for any static resource defined above by the Mockup that is not defined below as a dynamic resource.
-        g.api.add_resource(RedfishAPI, '/redfish/v1/<path:path>')
-        CreateRedfishBase(self)
+        with report.phase('register_routes'):
+            # Add the base resource
+            g.api.add_resource(RedfishBaseAPI, '/redfish/v1/')
+            # This is a catch all for any static resource defined above by the Mockup that is not defined below as a dynamic resource.
+            g.api.add_resource(RedfishAPI, '/redfish/v1/<path:path>')
+            CreateRedfishBase(self)
+            # Not linked from the ServiceRoot
+            g.api.add_resource(StartupReportAPI, '/redfish/v1/Emulator/StartupReport')
+            g.api.add_resource(ChangesAPI, '/redfish/v1/Emulator/Changes')
+            g.api.add_resource(LinksAPI, '/redfish/v1/Emulator/Links')
+            g.api.add_resource(CheckpointAPI, '/redfish/v1/Emulator/Checkpoint')
+            g.api.add_resource(ResetAPI, '/redfish/v1/reset', '/redfish/v1/reset/')
 
         if 'EX235a' == mockupfolder:
+            from .ex235a_loader import EX235a
             self.BMC = EX235a(self.resource_dictionary, config_data)
         else:
             self.BMC = Loader(self.resource_dictionary, config_data, mockupfolder)
 
+        if self.instance.checkpoint is not None:
+            from .checkpoint import resume_checkpoint
+            resume_checkpoint(self.instance)
+
+        # Record the changes of the resources from here on
+        self.instance.journal = ChangeJournal(config_data.get('change_journal_size', JOURNAL_SIZE))
+        self.resource_dictionary.journal = self.instance.journal
+        with report.phase('pristine'):
+            self.instance.pristine = Pristine(self.instance)
+        self.instance.pretty = config_data.get('json_output', 'Pretty').lower() != 'compact'
+        codings = []
+        if config_data.get('response_compression', 'Enable').lower() != 'disable':
+            self.instance.compression_threshold = config_data.get('compression_threshold', 1024)
+            codings = OFFERS
+        response_cache = config_data.get('response_cache', 'Enable').lower()
+        if response_cache != 'disable':
+            self.instance.response_cache = ResponseCache(self.instance.journal)
+            if response_cache == 'warm':
+                with report.phase('response_cache'):
+                    warm(self.resource_dictionary, self.instance.pretty, codings)
+        if self.state_store is not None:
+            self.state_store.attach(self.instance)
+
+        if self.watcher is not None and self.watcher.ident is None:
+            self.watcher.start()
+
     @property
     def configuration(self):
         """
@@ -154,3 +243,21 @@ class ResourceManager(object):
         """
         obj = self.resource_dictionary.get_resource(path)
         return obj
+
+    def get_view(self, path):
+        """
+        Call Resource_Dictionary's get_view
+        """
+        return self.resource_dictionary.get_view(path)
+
+    def get_raw(self, path):
+        """
+        Call Resource_Dictionary's get_raw
+        """
+        return self.resource_dictionary.get_raw(path)
+
+    def get_artifact(self, path):
+        """
+        Call Resource_Dictionary's get_artifact
+        """
+        return self.resource_dictionary.get_artifact(path)
@@ -0,0 +1,204 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Response Cache
+#
+# The JSON text of the responses to GETs, encoded once and sent again until
+# the resource changes, with an ETag that clients can revalidate it with
+# (If-None-Match). Encoding is most of the work of a GET of a large
+# resource, e.g. a message registry.
+#
+# A static resource that has not been claimed (see Member in
+# static_loader.py) never changes, so its responses are kept on its Member,
+# which instances that share the mockup share too. The responses of other
+# documents, claimed static resources and those of dynamic resources, are
+# kept per emulator instance by their '@odata.id'. They are dropped when the
+# change journal records a change of the path, and encoded again when a GET
+# returns another document for the path, e.g. a new version of a
+# VersionedDict. Documents without an '@odata.id' are not kept, the journal
+# can not tell when they change.
+#
+# A resource has a compact and a pretty response, see json_encoder.py, and
+# each of these a compressed response for each content coding, see
+# compression.py. Each is encoded on its first GET and has its own ETag.
+# The responses of static resources are always compressed when the client
+# accepts it, other responses only from COMPRESSION_THRESHOLD bytes.
+
+import hashlib
+
+from flask import request, Response
+
+from . import instance
+from .compression import compress, compressible
+from .json_encoder import dumps
+from .path_trie import canonical
+from .static_loader import parse_static
+
+def etag(body):
+    """
+    Returns the ETag of a response body
+    """
+    return hashlib.sha256(body).hexdigest()
+
+def pretty():
+    """
+    Whether the response to the current request is pretty JSON: as the
+    'pretty' query parameter of the request says, e.g.
+    /redfish/v1/Systems?pretty or ?pretty=false, otherwise if the instance
+    sends pretty JSON
+    """
+    value = request.args.get('pretty')
+    if value is None:
+        return instance.current().pretty
+    return value.lower() not in ('false', '0', 'no', 'off')
+
+def compressed(response, coding, kept=True):
+    """
+    Returns (body, etag, coding) of the response (body, etag, None)
+    compressed with the content coding, or the response itself if it does
+    not get smaller. The ETag of a compressed response is that of the
+    uncompressed response with the coding appended.
+    """
+    body, tag, identity = response
+    compressed_body = compress(body, coding, kept)
+    if len(compressed_body) >= len(body):
+        return response
+    return compressed_body, '%s-%s' % (tag, coding), coding
+
+def member_response(member, pretty, coding=None):
+    """
+    Returns (body, etag, coding) of the pretty or compact response with the
+    static resource member, which must not be claimed, compressed with the
+    content coding unless it is None. The pretty body of a resource kept as
+    JSON text is that text, see RawMember in static_loader.py.
+    """
+    responses = getattr(member, 'responses', None)
+    if responses is None:
+        responses = member.responses = {}
+    response = responses.get((pretty, coding))
+    if response is None:
+        response = responses.get((pretty, None))
+        if response is None:
+            raw = member.raw
+            if raw is None:
+                body = dumps(member.view, pretty)
+            elif pretty:
+                body = raw
+            else:
+                # Parsed for the compact text only, the member stays unparsed
+                body = dumps(parse_static(bytes(raw)), pretty)
+            response = responses[(pretty, None)] = (body, etag(body), None)
+        if coding is not None:
+            response = responses[(pretty, coding)] = compressed(response, coding)
+    return response
+
+def warm(resource_dictionary, pretty, codings=()):
+    """
+    Encodes the pretty or compact responses of the static resources that
+    are not claimed, and compresses them with each of the content codings,
+    and returns their number
+    """
+    count = 0
+    for path, member in resource_dictionary.walk(''):
+        if not member.claimed:
+            member_response(member, pretty)
+            for coding in codings:
+                member_response(member, pretty, coding)
+            count += 1
+    return count
+
+def conditional(resp, tag):
+    """
+    Sets the ETag of the response resp and returns it, or a 304 Not
+    Modified response if the request has that ETag in If-None-Match
+    """
+    if 'HTTP_IF_NONE_MATCH' in request.environ and request.if_none_match.contains(tag):
+        resp = Response(status=304)
+    resp.set_etag(tag)
+    return resp
+
+class ResponseCache():
+    """
+    Responses of the documents of an emulator instance other than those of
+    static resources that are not claimed
+
+    Arguments:
+        journal - Change journal of the instance
+    """
+    def __init__(self, journal):
+        self.journal = journal
+        # (document, {(pretty, coding): (body, etag, coding)}) by canonical
+        # '@odata.id'
+        self.entries = {}
+        journal.listeners.append(self.changed)
+
+    def changed(self, path, deleted):
+        self.entries.pop(canonical(path), None)
+
+    def response(self, document, pretty, coding=None):
+        """
+        Returns (body, etag, coding) of the pretty or compact response with
+        document, compressed with the content coding if it is not None and
+        the response is large enough
+        """
+        path = document.get('@odata.id') if isinstance(document, dict) else None
+        if not isinstance(path, str):
+            body = dumps(document, pretty)
+            response = (body, etag(body), None)
+            if coding is not None and compressible(body):
+                response = compressed(response, coding, kept=False)
+            return response
+        path = canonical(path)
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] is document:
+            responses = entry[1]
+            response = responses.get((pretty, coding))
+            if response is not None:
+                return response
+        else:
+            responses = {}
+        # A change recorded while encoding, e.g. by a worker thread, may not
+        # be in the text. Such a response is sent but not kept.
+        version = self.journal.version
+        identity = responses.get((pretty, None))
+        if identity is None:
+            body = dumps(document, pretty)
+            identity = (body, etag(body), None)
+        response = identity
+        if coding is not None and compressible(identity[0]):
+            response = compressed(identity, coding)
+        # Checked and kept under the journal's lock, a change recorded after
+        # the check drops the entry again once the lock is released
+        with self.journal.changed:
+            if self.journal.version == version:
+                responses[(pretty, None)] = identity
+                responses[(pretty, coding)] = response
+                self.entries[path] = (document, responses)
+        return response
@@ -0,0 +1,234 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Mockup Snapshots
+#
+# A snapshot is a mockup folder compiled into a single file so that the
+# emulator can boot without walking the mockup and parsing every index.json.
+# Snapshots are built ahead of time with:
+#
+#   python3 -m api_emulator.snapshot api_emulator/redfish/static/<mockup> [...]
+#
+# which writes api_emulator/redfish/static/<mockup>.snapshot next to the mockup
+# folder. load_static() boots from the snapshot instead of the folder when one
+# exists (see STATIC_SNAPSHOT in emulator.py), unless the folder has changed
+# since the snapshot was built.
+#
+# File layout:
+#   header | index | documents
+#
+# The header holds a magic string, the snapshot format version, and the
+# marshal and python versions the snapshot was built with. A snapshot built
+# with a different python is rejected and the mockup folder is walked instead.
+# The index is a marshal'd pair of dictionaries. The first is
+# {shortpath: (offset, length, raw)} where offset is relative to the start of
+# the documents section. The second is {shortpath: file} for the non-JSON artifacts
+# of the mockup (e.g. $metadata/index.xml), with the file relative to the
+# mockup folder. The artifacts themselves are served from the mockup folder.
+# A third item of the index, if present, is a dictionary of extras: 'links'
+# holds the links of each document (see link_graph.py), 'source' the
+# source_stamp() of the mockup folder the snapshot was built from, and
+# 'checkpoint' the state of the emulator instance that a checkpoint keeps
+# besides the documents (see checkpoint.py).
+# Each document is the marshal'd form of the parsed index.json, or, if raw is
+# set, the JSON text of a large index.json (see RawMember in static_loader.py).
+# Identical documents are only stored once and share an offset.
+
+import argparse
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+SNAPSHOT_EXT = '.snapshot'
+
+_MAGIC = b'RIESNAP\0'
+_FORMAT_VERSION = 4
+_HEADER = struct.Struct('>8sHHBBQ')
+
+class SnapshotError(Exception):
+    pass
+
+def snapshot_path(base_dir):
+    """
+    Returns the snapshot file location for the mockup folder base_dir
+    """
+    return os.path.normpath(base_dir) + SNAPSHOT_EXT
+
+def source_stamp(base_dir):
+    """
+    Returns a digest of the names, sizes and modification times of the files
+    in the mockup folder base_dir. It changes when a file of the mockup is
+    added, removed or written.
+    """
+    digest = hashlib.sha256()
+    for dirName, subdirList, fileList in os.walk(base_dir):
+        subdirList.sort()
+        for fname in sorted(fileList):
+            path = os.path.join(dirName, fname)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            digest.update(os.fsencode(os.path.relpath(path, base_dir)))
+            digest.update(struct.pack('>QQ', st.st_size, st.st_mtime_ns))
+    return digest.digest()
+
+def write_snapshot(path, documents, artifacts={}, state=None, links=None, source=None):
+    """
+    Writes a snapshot file
+
+    Arguments:
+        path      - Snapshot file to create
+        documents - Iterable of (shortpath, document) pairs in load order.  A
+                    document given as bytes is JSON text that is stored as is.
+        artifacts - Dictionary of {shortpath: file} for the non-JSON artifacts
+        state     - Dictionary of the checkpoint state, None for a snapshot
+        links     - Dictionary of {shortpath: links} of the documents, read
+                    once documents is exhausted
+        source    - source_stamp() of the mockup folder, None for a checkpoint
+    """
+    index = {}
+    blobs = []
+    offsets = {}
+    offset = 0
+    for shortpath, document in documents:
+        raw = isinstance(document, bytes)
+        blob = document if raw else marshal.dumps(document)
+        if (raw, blob) not in offsets:
+            offsets[(raw, blob)] = offset
+            blobs.append(blob)
+            offset += len(blob)
+        index[shortpath] = (offsets[(raw, blob)], len(blob), raw)
+    extras = {}
+    if links:
+        extras['links'] = dict(links)
+    if source is not None:
+        extras['source'] = source
+    if state is not None:
+        extras['checkpoint'] = state
+    if extras:
+        raw_index = marshal.dumps((index, dict(artifacts), extras))
+    else:
+        raw_index = marshal.dumps((index, dict(artifacts)))
+
+    # Write to a temporary file first so a running emulator never sees a
+    # partially written snapshot.
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, marshal.version,
+                             sys.version_info[0], sys.version_info[1], len(raw_index)))
+        f.write(raw_index)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return len(index)
+
+class Snapshot(object):
+    """
+    Read access to a snapshot file. The file is memory mapped so documents
+    are only read from disk when they are loaded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError('Snapshot %s is empty' % path)
+        if len(self._map) < _HEADER.size:
+            raise SnapshotError('Snapshot %s is truncated' % path)
+        magic, fmt, marshal_version, py_major, py_minor, index_len = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            raise SnapshotError('%s is not a snapshot file' % path)
+        if fmt != _FORMAT_VERSION:
+            raise SnapshotError('Snapshot %s has format version %d, expected %d' % (path, fmt, _FORMAT_VERSION))
+        if marshal_version != marshal.version or (py_major, py_minor) != sys.version_info[:2]:
+            raise SnapshotError('Snapshot %s was built with python %d.%d' % (path, py_major, py_minor))
+        start = _HEADER.size
+        loaded = marshal.loads(self._map[start:start + index_len])
+        self.index, self.artifacts = loaded[:2]
+        extras = loaded[2] if len(loaded) > 2 else {}
+        # Links of the documents, None for snapshots built without them
+        self.links = extras.get('links')
+        # source_stamp() of the mockup folder, None for checkpoints
+        self.source = extras.get('source')
+        # Only set for checkpoints
+        self.state = extras.get('checkpoint')
+        self._documents = start + index_len
+
+    def __len__(self):
+        return len(self.index)
+
+    def paths(self):
+        return self.index.keys()
+
+    def load(self, shortpath):
+        """
+        Parses and returns a new copy of the document stored for shortpath
+        """
+        offset, length, raw = self.index[shortpath]
+        start = self._documents + offset
+        if raw:
+            return json.loads(self._map[start:start + length])
+        return marshal.loads(self._map[start:start + length])
+
+    def raw(self, shortpath):
+        """
+        Returns a memoryview of the JSON text stored for shortpath, or None if
+        the document is stored in marshal'd form
+        """
+        offset, length, raw = self.index[shortpath]
+        if not raw:
+            return None
+        start = self._documents + offset
+        return memoryview(self._map)[start:start + length]
+
+def main():
+    from .static_loader import build_snapshot, RAW_THRESHOLD
+
+    argparser = argparse.ArgumentParser(description='Compile mockup folders into snapshot files')
+    argparser.add_argument('mockups', nargs='+', help='Mockup folders to compile')
+    argparser.add_argument('-mode', type=str, default='Local', help='Emulator mode the snapshot is built for')
+    argparser.add_argument('-raw-threshold', type=int, default=RAW_THRESHOLD,
+                           help='Store index.json files larger than this many bytes as JSON text (0 for none)')
+    args = argparser.parse_args()
+
+    for base_dir in args.mockups:
+        path = snapshot_path(base_dir)
+        count = build_snapshot(base_dir, args.mode, path, args.raw_threshold)
+        print('%s: %d documents, %d bytes' % (path, count, os.path.getsize(path)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Startup Report
+#
+# Times the phases of the emulator startup. For each phase the report has
+# the wall time, the static resources added, the static documents and bytes
+# parsed, the static resources, bytes and subtrees left out by the static
+# filters, the routes registered and the change in resident memory. Each
+# emulator instance has its own report (see instance.py). The report is
+# logged as a single JSON line once the instance has started and can be
+# fetched from GET /redfish/v1/Emulator/StartupReport.
+
+import json
+import logging
+import os
+import resource
+import time
+from contextlib import contextmanager
+
+from . import static_loader
+
+def rss():
+    """
+    Returns the resident memory of the process in bytes
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        # Peak rather than current, but the best there is without /proc
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def counters(instance):
+    return {
+        'Time': time.perf_counter(),
+        'Resources': len(instance.resource_dictionary),
+        'DocumentsParsed': static_loader.parsed_documents,
+        'BytesParsed': static_loader.parsed_bytes,
+        'ResourcesExcluded': static_loader.excluded_resources,
+        'BytesExcluded': static_loader.excluded_bytes,
+        'SubtreesPruned': static_loader.pruned_subtrees,
+        'Routes': len(list(instance.app.url_map.iter_rules())),
+        'RSS': rss(),
+    }
+
+class StartupReport():
+    """
+    Phases of the startup of instance in the order they ran
+    """
+
+    def __init__(self, instance):
+        self.instance = instance
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Adds the phase name to the report, timing the body of the with
+        statement. Phases are not nested.
+        """
+        before = counters(self.instance)
+        try:
+            yield
+        finally:
+            after = counters(self.instance)
+            self.phases.append({
+                'Phase': name,
+                'Milliseconds': round((after['Time'] - before['Time']) * 1000, 3),
+                'Resources': after['Resources'] - before['Resources'],
+                'DocumentsParsed': after['DocumentsParsed'] - before['DocumentsParsed'],
+                'BytesParsed': after['BytesParsed'] - before['BytesParsed'],
+                'ResourcesExcluded': after['ResourcesExcluded'] - before['ResourcesExcluded'],
+                'BytesExcluded': after['BytesExcluded'] - before['BytesExcluded'],
+                'SubtreesPruned': after['SubtreesPruned'] - before['SubtreesPruned'],
+                'Routes': after['Routes'] - before['Routes'],
+                'RSSDelta': after['RSS'] - before['RSS'],
+            })
+
+    def summary(self):
+        total = {'Milliseconds': 0, 'Resources': 0, 'DocumentsParsed': 0, 'BytesParsed': 0,
+                 'ResourcesExcluded': 0, 'BytesExcluded': 0, 'SubtreesPruned': 0, 'Routes': 0, 'RSSDelta': 0}
+        for p in self.phases:
+            for k in total:
+                total[k] += p[k]
+        total['Milliseconds'] = round(total['Milliseconds'], 3)
+        return {
+            'Instance': self.instance.name,
+            'Mockup': self.instance.mockup,
+            'Phases': self.phases,
+            'Total': total,
+            'RSS': rss(),
+        }
+
+    def log(self):
+        logging.info('Startup report: %s' % json.dumps(self.summary(), sort_keys=True))
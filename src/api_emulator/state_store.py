@@ -0,0 +1,301 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# State Store
+#
+# Keeps the state that clients give the emulator while it runs, e.g.
+# accounts, sessions, event subscriptions, power limits and firmware
+# versions, in an SQLite database so that it survives a restart (STATE_DB,
+# see emulator.py).
+#
+# The database is written behind the requests. A writer thread reads the
+# changes of each emulator instance from its change journal (see
+# change_journal.py) every STATE_DB_INTERVAL seconds and writes the changed
+# resources in one transaction. When an instance is set up its stored
+# resources are put into its resource dictionary on top of the static
+# mockup, before the loader runs, so the dynamic resources start from them.
+#
+# The resources are stored by instance name and mockup. Accounts are also
+# stored with their passwords, which the Account resources do not hold.
+
+import atexit
+import json
+import logging
+import os
+import signal
+import sqlite3
+import threading
+
+from . import instance
+from .path_trie import canonical
+from .resource_dictionary import collection_members
+from .static_loader import Member
+from .redfish.redfish_auth import auth, User, ROLES
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS resources (
+    instance TEXT NOT NULL,
+    mockup   TEXT NOT NULL,
+    path     TEXT NOT NULL,
+    document TEXT,
+    PRIMARY KEY (instance, mockup, path)
+);
+CREATE TABLE IF NOT EXISTS users (
+    instance TEXT NOT NULL,
+    mockup   TEXT NOT NULL,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL,
+    role     TEXT NOT NULL,
+    PRIMARY KEY (instance, mockup, username)
+);
+'''
+
+# The state store of the process, see open_store()
+store = None
+_store_lock = threading.Lock()
+# The SIGTERM handler that terminate() replaced
+_previous_handler = None
+
+def open_store(path, interval=1):
+    """
+    Returns the state store of the process, which is opened on the first
+    call. All emulator instances share it.
+    """
+    global store, _previous_handler
+    with _store_lock:
+        if store is None:
+            store = StateStore(path, interval)
+            if threading.current_thread() is threading.main_thread():
+                _previous_handler = signal.signal(signal.SIGTERM, terminate)
+    return store
+
+def terminate(signum, frame):
+    """
+    SIGTERM handler that writes the pending changes and then hands the
+    signal to the handler it replaced, or terminates the process as it
+    would without a handler. atexit alone does not cover SIGTERM, which is
+    how containers are stopped.
+    """
+    store.close()
+    if callable(_previous_handler):
+        _previous_handler(signum, frame)
+    elif _previous_handler != signal.SIG_IGN:
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+class StateStore():
+    """
+    Arguments:
+        path     - File name of the SQLite database
+        interval - Seconds between writes
+    """
+    def __init__(self, path, interval=1):
+        self.path = path
+        self.interval = interval
+        # The instances whose changes are written, with the journal version
+        # written last
+        self.instances = {}
+        self.lock = threading.Lock()
+        # Held while the changes are written
+        self.write_lock = threading.Lock()
+        self.stopped = threading.Event()
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.executescript(SCHEMA)
+        connection.close()
+        logging.info('State store %s, written every %s seconds' % (path, interval))
+        self.writer = threading.Thread(target=self.run, name='StateStoreWriter', daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def restore(self, inst):
+        """
+        Puts the stored resources and accounts of instance inst into its
+        resource dictionary and authorization handler, and returns the
+        canonical paths of the restored resources. Called while the
+        instance is set up, before its change journal is started.
+        """
+        key = (inst.name, inst.mockup)
+        connection = sqlite3.connect(self.path)
+        try:
+            rows = connection.execute('SELECT path, document FROM resources WHERE instance = ? AND mockup = ?', key).fetchall()
+            users = connection.execute('SELECT username, password, role FROM users WHERE instance = ? AND mockup = ?', key).fetchall()
+        finally:
+            connection.close()
+        restored = set()
+        for path, document in rows:
+            if document is None:
+                try:
+                    inst.resource_dictionary.delete_resource(path)
+                except KeyError:
+                    pass
+            else:
+                inst.resource_dictionary.add_resource(path, Member(json.loads(document)))
+                restored.add(path)
+        if users:
+            with instance.activate(inst):
+                auth.set_users({username: User(username, password, role, ROLES.get(role, {}))
+                                for username, password, role in users})
+        logging.info('Restored %d resources and %d accounts of %s from %s' % (len(rows), len(users), inst.name, self.path))
+        return restored
+
+    def attach(self, inst):
+        """
+        Writes the changes of instance inst from now on. Called once its
+        change journal is started.
+        """
+        with self.lock:
+            self.instances[inst] = inst.journal.version
+
+    def run(self):
+        connection = sqlite3.connect(self.path)
+        try:
+            while not self.stopped.wait(self.interval):
+                with self.write_lock:
+                    self.write(connection)
+        finally:
+            connection.close()
+
+    def close(self):
+        """
+        Stops the writer and writes the changes it has not written yet.
+        Only waits for a write of the writer that is under way, it may be
+        called from a signal handler.
+        """
+        if self.stopped.is_set():
+            return
+        self.stopped.set()
+        connection = sqlite3.connect(self.path)
+        try:
+            with self.write_lock:
+                self.write(connection)
+        finally:
+            connection.close()
+
+    def write(self, connection):
+        """
+        Writes the changes of all instances since the last write in one
+        transaction
+        """
+        with self.lock:
+            pending = list(self.instances.items())
+        rows, accounts, written = [], [], {}
+        for inst, version in pending:
+            latest, complete, changes = inst.journal.since(version)
+            if not changes:
+                continue
+            try:
+                if complete:
+                    rows.extend(self.changed_rows(inst, changes))
+                    if any(canonical(path).startswith('AccountService/Accounts') for v, path, t, deleted in changes):
+                        accounts.append(inst)
+                else:
+                    logging.warning('The state store fell behind the change journal of %s, writing all of its state. Increase CHANGE_JOURNAL_SIZE or decrease STATE_DB_INTERVAL.' % inst.name)
+                    rows.extend(self.all_rows(inst, connection))
+                    accounts.append(inst)
+            except RuntimeError:
+                # A dynamic resource was changed while it was serialized.
+                # Its changes are still in the journal, try again next time.
+                continue
+            written[inst] = latest
+        if not written:
+            return
+        with connection:
+            connection.executemany('INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?)', rows)
+            for inst in accounts:
+                with instance.activate(inst):
+                    users = list(auth.get_users().values())
+                connection.execute('DELETE FROM users WHERE instance = ? AND mockup = ?', (inst.name, inst.mockup))
+                connection.executemany('INSERT INTO users VALUES (?, ?, ?, ?, ?)',
+                                       [(inst.name, inst.mockup, u.username, u.password, u.role) for u in users])
+        with self.lock:
+            self.instances.update(written)
+        logging.debug('State store wrote %d resources' % len(rows))
+
+    @staticmethod
+    def all_rows(inst, connection):
+        """
+        Returns the rows of all the resources of instance inst that clients
+        may have changed, for when changes fell out of its change journal:
+        the documents of the dynamic resources and the resources handed out
+        for modification. Stored resources that no longer exist are written
+        as deleted.
+        """
+        documents = instance.dynamic_documents(inst)
+        for p, obj in list(inst.resource_dictionary.walk('')):
+            if obj.claimed and p not in documents:
+                documents[p] = obj.view
+        rows = dict((p, json.dumps(document)) for p, document in documents.items())
+        stored = connection.execute('SELECT path FROM resources WHERE instance = ? AND mockup = ? AND document IS NOT NULL',
+                                    (inst.name, inst.mockup)).fetchall()
+        for (p,) in stored:
+            if p in rows:
+                continue
+            try:
+                inst.resource_dictionary.find_object(p)
+            except KeyError:
+                rows[p] = None
+        return [(inst.name, inst.mockup, p, document) for p, document in rows.items()]
+
+    @staticmethod
+    def changed_rows(inst, changes):
+        """
+        Returns the rows of the resources of instance inst in changes, with
+        their current documents. The documents of deleted resources are NULL.
+        A changed collection is written with its members, which may have
+        been created at startup, so that it is complete when restored.
+        """
+        documents = instance.dynamic_documents(inst)
+
+        def find(p):
+            document = documents.get(p)
+            if document is None:
+                try:
+                    document = inst.resource_dictionary.find_object(p).view
+                except KeyError:
+                    pass
+            return document
+
+        rows = {}
+        for version, path, time, deleted in changes:
+            p = canonical(path)
+            if deleted:
+                rows[p] = None
+                continue
+            document = find(p)
+            if document is None:
+                continue
+            rows[p] = json.dumps(document)
+            for m in collection_members(document) or []:
+                if m not in rows:
+                    member_document = find(m)
+                    if member_document is not None:
+                        rows[m] = json.dumps(member_document)
+        return [(inst.name, inst.mockup, p, document) for p, document in rows.items()]
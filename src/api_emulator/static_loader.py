@@ -34,68 +34,829 @@
 
 # Module for loading in static data (mockups)
 
+import fnmatch
+import hashlib
 import json
+import logging
+import multiprocessing
+import marshal
+import mimetypes
 import os
 import re
+import tarfile
+import threading
+import types
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+try:
+    # Optional, only needed to load .tar.zst mockup archives
+    import zstandard
+except ImportError:
+    zstandard = None
 
 import sys, traceback
 from .utils import process_id
-from .resource_dictionary import ResourceDictionary
+from .snapshot import Snapshot, SnapshotError, snapshot_path, source_stamp, write_snapshot
+from .link_graph import document_links
+from .path_trie import canonical
+
+# Mockup archives that load_static() can read in place of a mockup folder
+ARCHIVE_EXTS = ['.tar.gz', '.tgz', '.tar.zst', '.zip']
+
+# Per-mockup include/exclude rules, see load_filters()
+FILTERS_EXT = '.filters.json'
+
+# index.json files larger than this are kept as JSON text by default, see
+# RawMember
+RAW_THRESHOLD = 64 * 1024
+
+# Number and size of the static documents parsed by this process, see
+# count_parsed().  Read by the startup report.
+parsed_documents = 0
+parsed_bytes = 0
+
+# Static resources, bytes and subtrees left out by the static filters of the
+# mockups loaded by this process, see log_filtered().  Read by the startup
+# report.
+excluded_resources = 0
+excluded_bytes = 0
+pruned_subtrees = 0
+
+# Strings, with the ':' that follows keys, and brackets of JSON text, see
+# peek_type()
+JSON_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"(\s*:)?|[][{}]')
 
 class StaticLoadError(Exception):
     pass
 
 class Member():
+    """
+    Static resource in the resource dictionary.
+
+    .configuration returns the resource for callers that may modify it, e.g.
+    the loaders and the dynamic resources.  Such a resource is claimed and is
+    left alone when the mockup is reloaded (see static_watcher.py).  .view
+    returns the resource for read-only use, e.g. to answer a GET.
+    """
     def __init__(self, config):
         self.config = config
+        self.claimed = False
 
     @property
     def configuration(self):
+        self.claimed = True
+        return self.config
+
+    @property
+    def view(self):
         return self.config
 
-def load_static(name, spec, mode, rest_base, resource_dictionary):
+    @property
+    def raw(self):
+        """
+        The resource as JSON text if it is kept that way, otherwise None
+        """
+        return None
+
+    @property
+    def odata_type(self):
+        """
+        The @odata.type of the resource, or None
+        """
+        config = self.view
+        if isinstance(config, dict):
+            return config.get('@odata.type')
+        return None
+
+class SharedMember(Member):
+    """
+    Static resource whose parsed document is shared with the other resources
+    of the mockup that have identical contents.
+
+    The shared document is never modified.  The first access through
+    .configuration, whose result callers may modify, gives the resource its
+    own copy of the document.  Access through .view does not copy.
+
+    Arguments:
+        shared - The shared document
+    """
+    _copy_lock = threading.Lock()
+
+    def __init__(self, shared):
+        self.config = None
+        self.claimed = False
+        self.shared = shared
+
+    @property
+    def configuration(self):
+        if self.config is None:
+            with self._copy_lock:
+                if self.config is None:
+                    # The documents only hold JSON types, which marshal
+                    # copies much faster than copy.deepcopy.
+                    self.config = marshal.loads(marshal.dumps(self.shared))
+        self.claimed = True
+        return self.config
+
+    @property
+    def view(self):
+        config = self.config
+        if config is None:
+            return self.shared
+        return config
+
+class LazyMember(Member):
+    """
+    Static resource that is only parsed the first time it is accessed.
+
+    Arguments:
+        load   - Function that parses and returns the resource given source
+        source - File path or snapshot shortpath of the resource
+    """
+    def __init__(self, load, source):
+        self.config = None
+        self.claimed = False
+        self.load = load
+        self.source = source
+
+    def parse(self):
+        if self.config is None:
+            # Two requests racing on the first access both parse the
+            # resource and only one result is kept. The resource has not
+            # been handed out for modification yet so either copy is fine.
+            config = self.load(self.source)
+            if self.config is None:
+                self.config = config
+        return self.config
+
+    @property
+    def configuration(self):
+        self.claimed = True
+        return self.parse()
+
+    @property
+    def view(self):
+        return self.parse()
+
+    @property
+    def loaded(self):
+        return self.config is not None
+
+class RawMember(Member):
+    """
+    Large static resource that is kept as its JSON text, read from the
+    index.json file or memory mapped from the snapshot.  A GET sends the text
+    as is.
+
+    The JSON is only parsed when the resource is accessed through
+    .configuration or .view.  Once the resource has been handed out for
+    modification .raw returns None and the parsed resource is used.
+
+    Arguments:
+        data - The JSON text as bytes, or a memoryview of a memory mapping of
+               a file that is never modified in place
+    """
+    def __init__(self, data):
+        self.config = None
+        self.claimed = False
+        self.data = data
+
+    def parse(self):
+        if self.config is None:
+            config = parse_static(bytes(self.data))
+            if self.config is None:
+                self.config = config
+        return self.config
+
+    @property
+    def configuration(self):
+        self.claimed = True
+        return self.parse()
+
+    @property
+    def view(self):
+        return self.parse()
+
+    @property
+    def raw(self):
+        if self.claimed:
+            return None
+        return self.data
+
+    @property
+    def odata_type(self):
+        if self.config is None:
+            return peek_type(self.data)
+        return super().odata_type
+
+def read_raw(path):
+    """
+    Returns the contents of the index.json file path for a RawMember.  The
+    files of a mockup folder are not memory mapped, they may be rewritten
+    while the emulator runs (see STATIC_WATCH) and reading a mapping of a
+    file that was truncated kills the process with SIGBUS.  Snapshots and
+    checkpoints are only ever replaced by a rename, so they are mapped.
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+class StaticFilter():
+    """
+    Include/exclude rules for the static resources of a mockup.
+
+    Rules are glob patterns matched against the resource path relative to
+    the ServiceRoot, e.g. 'JsonSchemas' or 'Registries/*'.  A rule also
+    matches everything below the paths it matches.  A resource is loaded if
+    it matches an include rule (or there are none) and no exclude rule.  The
+    ServiceRoot itself is always loaded.
+
+    Keeps count of what was left out so the savings can be reported.
+    """
+    def __init__(self, include=[], exclude=[]):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.excluded = 0
+        self.excluded_bytes = 0
+        self.pruned = 0
+
+    def __bool__(self):
+        return bool(self.include or self.exclude)
+
+    @staticmethod
+    def _match(rules, path):
+        for rule in rules:
+            if fnmatch.fnmatchcase(path, rule) or fnmatch.fnmatchcase(path, rule + '/*'):
+                return True
+        return False
+
+    def allows(self, path):
+        if path == '':
+            return True
+        if self.include and not self._match(self.include, path):
+            return False
+        return not self._match(self.exclude, path)
+
+    def excludes_subtree(self, path):
+        """
+        True if path and everything below it are excluded
+        """
+        return path != '' and self._match(self.exclude, path)
+
+    def skip(self, size=0):
+        self.excluded += 1
+        self.excluded_bytes += size
+
+def load_filters(base_dir, config_data={}):
+    """
+    Returns the StaticFilter for the mockup folder base_dir.
+
+    The rules are read from <base_dir>.filters.json, a JSON object with
+    optional "include" and "exclude" lists.  config_data['static_include']
+    and config_data['static_exclude'] replace the corresponding list when set.
+    """
+    include, exclude = [], []
+    path = os.path.normpath(base_dir) + FILTERS_EXT
+    if os.path.exists(path):
+        with open(path) as f:
+            rules = json.load(f)
+        include = rules.get('include', [])
+        exclude = rules.get('exclude', [])
+    if config_data.get('static_include'):
+        include = config_data['static_include']
+    if config_data.get('static_exclude'):
+        exclude = config_data['static_exclude']
+    return StaticFilter(include, exclude)
+
+def static_dir(name, spec):
+    """
+    Returns the directory holding the static data for mockup <name>
+    """
+    dirname = os.path.dirname(__file__)
+    return os.path.join(dirname, spec.lower(), 'static', name)
+
+def walk_static(base_dir, mode, static_filter=None, artifacts=None):
+    """
+    Walks the mockup folder base_dir and yields (shortpath, file path) for
+    each index.json found. The shortpath starts at the ServiceRoot, which
+    has a shortpath of ''.
+
+    Resources left out by static_filter are skipped and excluded subtrees
+    are not walked at all.
+
+    If artifacts is a list, (shortpath, file) is appended to it for each
+    artifact found, with file relative to base_dir.  See Artifact.
+    """
+    for dirName, subdirList, fileList in os.walk(base_dir):
+        # print('Found directory: %s' % dirName)
+        if static_filter:
+            kept = []
+            for subdir in subdirList:
+                dirpath = os.path.relpath(os.path.join(dirName, subdir), base_dir).replace('\\', '/')
+                if static_filter.excludes_subtree(dirpath):
+                    static_filter.pruned += 1
+                else:
+                    kept.append(subdir)
+            subdirList[:] = kept
+        for fname in fileList:
+            if fname != 'index.json':
+                if artifacts is not None and is_artifact(fname):
+                    relpath = os.path.relpath(os.path.join(dirName, fname), base_dir).replace('\\', '/')
+                    shortpath = os.path.dirname(relpath)
+                    if not static_filter or static_filter.allows(shortpath):
+                        artifacts.append((shortpath, relpath))
+                continue
+            path = os.path.join(dirName, fname)
+
+            # Create shortpath starting at ServiceRoot
+            if mode == 'Cloud':
+                shortpath = re.sub(base_dir + '/', '', path)
+            else:
+                shortpath = os.path.relpath(path, base_dir)
+                shortpath = shortpath.replace('\\', '/')
+            if dirName == base_dir:
+                shortpath = ''
+            else:
+                shortpath = re.sub('/index.json', '', shortpath)
+            if static_filter and not static_filter.allows(shortpath):
+                static_filter.skip(os.path.getsize(path))
+                continue
+            yield shortpath, path
+
+def is_artifact(fname):
+    """
+    True if fname is an artifact: any index.* file other than index.json,
+    e.g. the CSDL in $metadata/index.xml
+    """
+    return fname.startswith('index.') and fname != 'index.json'
+
+class Artifact(object):
+    """
+    Non-JSON file of a mockup, e.g. $metadata/index.xml. It is served as is
+    from the mockup folder at the URL of the directory holding it, unless
+    there is an index.json for that URL.
+
+    Arguments:
+        path - The file
+    """
+    def __init__(self, path):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+def load_artifacts(base_dir, artifacts, resource_dictionary):
+    """
+    Adds the (shortpath, file) artifacts found in mockup folder base_dir to
+    the resource dictionary
+    """
+    size = 0
+    for shortpath, relpath in artifacts:
+        try:
+            artifact = Artifact(os.path.join(base_dir, relpath))
+        except OSError as e:
+            logging.warning('Not serving %s: %s' % (relpath, e))
+            continue
+        resource_dictionary.add_artifact(shortpath, artifact)
+        size += artifact.size
+    if artifacts:
+        logging.info('Serving %d static artifacts (%d bytes) from %s' % (len(artifacts), size, base_dir))
+
+def find_archive(base_dir):
+    """
+    Returns the path of the archive for the mockup folder base_dir, if any
+    """
+    for ext in ARCHIVE_EXTS:
+        path = os.path.normpath(base_dir) + ext
+        if os.path.exists(path):
+            return path
+    return None
+
+def archive_shortpath(member_name, name):
+    """
+    Returns the shortpath for the archive member member_name, or None if the
+    member is not an index.json. Members can either be relative to the mockup
+    folder (./Systems/index.json) or include it (<name>/Systems/index.json).
+    """
+    parts = [part for part in member_name.split('/') if part not in ('', '.')]
+    if len(parts) == 0 or parts[-1] != 'index.json':
+        return None
+    if len(parts) > 1 and parts[0] == name:
+        parts = parts[1:]
+    return '/'.join(parts[:-1])
+
+def walk_tar(tar, name):
+    for member in tar:
+        if not member.isfile():
+            continue
+        shortpath = archive_shortpath(member.name, name)
+        if shortpath is not None:
+            yield shortpath, tar.extractfile(member).read()
+
+def walk_archive(path, name):
+    """
+    Yields (shortpath, contents) for each index.json in the mockup archive at
+    path, in archive order. Nothing is extracted to disk. Tar archives are
+    read in a single sequential pass.
+    """
+    if path.endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                shortpath = archive_shortpath(info.filename, name)
+                if shortpath is not None:
+                    yield shortpath, archive.read(info)
+    elif path.endswith('.tar.zst'):
+        if zstandard is None:
+            raise StaticLoadError('The zstandard package is required to load ' + path)
+        with open(path, 'rb') as f:
+            with zstandard.ZstdDecompressor().stream_reader(f) as stream:
+                with tarfile.open(fileobj=stream, mode='r|') as tar:
+                    yield from walk_tar(tar, name)
+    else:
+        with tarfile.open(path, mode='r|gz') as tar:
+            yield from walk_tar(tar, name)
+
+def count_parsed(size):
+    """
+    Counts a static document of size bytes as parsed
+    """
+    global parsed_documents, parsed_bytes
+    parsed_documents += 1
+    parsed_bytes += size
+
+def peek_type(data):
+    """
+    Returns the top level @odata.type of the JSON text data without parsing
+    all of it, or None. The scan stops at the @odata.type member, which
+    mockups usually list first.
+    """
+    depth = 0
+    found = False
+    for match in JSON_TOKEN.finditer(data):
+        token = match.group()
+        if found:
+            if token[:1] == b'"' and not match.group(1):
+                return json.loads(token)
+            return None
+        if token[:1] == b'"':
+            found = depth == 1 and match.group(1) is not None and token.startswith(b'"@odata.type"')
+        elif token in (b'{', b'['):
+            depth += 1
+        else:
+            depth -= 1
+    return None
+
+def parse_static(contents):
+    """
+    Parses the contents of an index.json file
+    """
+    count_parsed(len(contents))
+    return json.loads(contents)
+
+def read_static(path):
+    """
+    Parses a single index.json file
+    """
+    with open(path, 'rb') as f:
+        return parse_static(f.read())
+
+def content_key(contents):
+    """
+    Returns a key that is equal for index.json files with identical contents
+    """
+    return hashlib.sha256(contents).digest()
+
+def read_static_chunk(paths):
+    """
+    Parses a list of index.json files. Runs in the worker processes of
+    read_static_parallel().
+    """
+    documents = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            contents = f.read()
+        documents.append((content_key(contents), json.loads(contents)))
+    return documents
+
+@contextmanager
+def hidden_main():
+    """
+    Hides the main script from the worker processes started in the block.
+    They would otherwise run it again, and emulator.py starts the emulator
+    when it is imported. read_static_chunk() needs nothing from it.
+    """
+    main = sys.modules['__main__']
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = main
+
+def read_static_parallel(paths, workers):
+    """
+    Parses the index.json files in paths with a pool of worker processes.
+
+    Returns (content key, document) for each file in the same order as paths.
+    """
+    # Start the workers as new processes. The emulator runs threads by now
+    # (e.g. the UpdateWorker), and a forked worker could deadlock on a lock
+    # that one of them held at the time of the fork.
+    context = multiprocessing.get_context('spawn')
+    # A few chunks per worker keeps the workers busy without paying the
+    # inter-process overhead for every file.
+    chunksize = max(1, -(-len(paths) // (workers * 4)))
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    documents = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        # The workers are started by the submits of map()
+        with hidden_main():
+            results = pool.map(read_static_chunk, chunks)
+        for chunk in results:
+            documents.extend(chunk)
+    # The workers count in their own processes
+    for path in paths:
+        count_parsed(os.path.getsize(path))
+    return documents
+
+def build_snapshot(base_dir, mode='Local', path=None, raw_threshold=RAW_THRESHOLD):
+    """
+    Compiles the mockup folder base_dir into a snapshot file. The snapshot is
+    written next to the mockup folder unless path is given. index.json files
+    larger than raw_threshold bytes are stored as JSON text, see RawMember.
+
+    Returns the number of documents in the snapshot.
+    """
+    index = os.path.join(base_dir, 'index.json')
+    if not os.path.exists(index):
+        raise StaticLoadError('Static data for ' + base_dir + ' does not exist')
+    if path is None:
+        path = snapshot_path(base_dir)
+    # Taken first so that a file changed while building makes it stale
+    source = source_stamp(base_dir)
+    artifacts = []
+    entries = list(walk_static(base_dir, mode, artifacts=artifacts))
+    links = {}
+
+    def documents():
+        for shortpath, fpath in entries:
+            document = read_snapshot_document(fpath, raw_threshold)
+            parsed = json.loads(document) if isinstance(document, bytes) else document
+            links[shortpath] = document_links(parsed, canonical(shortpath))
+            yield shortpath, document
+    return write_snapshot(path, documents(), artifacts, links=links, source=source)
+
+def read_snapshot_document(path, raw_threshold):
+    """
+    Returns the document to store in a snapshot for the index.json file path
+    """
+    with open(path, 'rb') as f:
+        contents = f.read()
+    if raw_threshold and len(contents) > raw_threshold:
+        # Checks that it is valid JSON
+        json.loads(contents)
+        return contents
+    return json.loads(contents)
+
+def load_snapshot(path, resource_dictionary, lazy=False, static_filter=None, dedup=False, artifacts=None,
+                  raw_threshold=RAW_THRESHOLD, base_dir=None):
+    """
+    Populates the resource dictionary from a snapshot file. With lazy set,
+    only the path index is read and each resource is parsed on first access.
+    Resources left out by static_filter are not loaded. With dedup set,
+    resources that are stored once in the snapshot share one document.
+    Documents stored as JSON text that are larger than raw_threshold bytes
+    are served from the snapshot's memory mapping, see RawMember.
+
+    If artifacts is a list, the (shortpath, file) artifacts recorded in the
+    snapshot are appended to it.
+
+    If base_dir is given, the snapshot is only used if the mockup folder
+    base_dir has not changed since the snapshot was built, see source_stamp().
+
+    Returns the number of documents loaded, or None if the snapshot could not
+    be used.
+    """
+    try:
+        snapshot = Snapshot(path)
+    except (SnapshotError, OSError) as e:
+        logging.warning('Not using snapshot %s: %s' % (path, e))
+        return None
+    if base_dir is not None and os.path.isdir(base_dir) and snapshot.source != source_stamp(base_dir):
+        logging.warning('Not using snapshot %s, %s has changed since it was built' % (path, base_dir))
+        return None
+    paths = []
+    for shortpath in snapshot.paths():
+        if static_filter and not static_filter.allows(shortpath):
+            static_filter.skip(snapshot.index[shortpath][1])
+            continue
+        paths.append(shortpath)
+    if artifacts is not None:
+        artifacts.extend((shortpath, relpath) for shortpath, relpath in snapshot.artifacts.items()
+                         if not static_filter or static_filter.allows(shortpath))
+    def load(shortpath):
+        count_parsed(snapshot.index[shortpath][1])
+        return snapshot.load(shortpath)
+    members = {}
+    if raw_threshold:
+        for shortpath in paths:
+            offset, length, raw = snapshot.index[shortpath]
+            if raw and length > raw_threshold:
+                members[shortpath] = RawMember(snapshot.raw(shortpath))
+    if lazy:
+        members.update((shortpath, LazyMember(load, shortpath))
+                       for shortpath in paths if shortpath not in members)
+    else:
+        # Identical documents are stored once, at the same offset
+        members.update(shared_members(((shortpath, snapshot.index[shortpath][0] if dedup else shortpath, shortpath)
+                                       for shortpath in paths if shortpath not in members), load))
+    if snapshot.links is not None:
+        # The members have not been modified yet, see member_links()
+        for shortpath in paths:
+            members[shortpath].links = snapshot.links.get(shortpath)
+    for shortpath in paths:
+        resource_dictionary.add_resource(shortpath, members[shortpath])
+    log_raw(members)
+    logging.info('Loaded %d static resources from snapshot %s' % (len(paths), path))
+    return len(paths)
+
+def log_raw(members):
+    raw = [m for m in members.values() if isinstance(m, RawMember)]
+    if raw:
+        logging.info('Keeping %d large static resources (%d bytes) as JSON text' %
+                     (len(raw), sum(len(m.data) for m in raw)))
+
+def read_entries(entries, dedup):
+    """
+    Reads the index.json files of the (shortpath, file path) entries and
+    yields (shortpath, key, contents) for shared_members()
+    """
+    for shortpath, path in entries:
+        with open(path, 'rb') as f:
+            contents = f.read()
+        yield shortpath, content_key(contents) if dedup else shortpath, contents
+
+def shared_members(entries, parse):
+    """
+    Creates the members for the resources in entries. One parsed document is
+    shared between all resources with the same key, see SharedMember.
+
+    Arguments:
+        entries - Iterable of (shortpath, key, source).  Resources with the
+                  same key must have identical contents.
+        parse   - Function that parses and returns the document given a
+                  source.  Called once per key.
+
+    Returns a list of (shortpath, member) in the order of entries.
+    """
+    members = []
+    first = {}
+    for shortpath, key, source in entries:
+        i = first.get(key)
+        if i is None:
+            first[key] = len(members)
+            members.append((shortpath, Member(parse(source))))
+            continue
+        m = members[i][1]
+        if not isinstance(m, SharedMember):
+            m = SharedMember(m.config)
+            members[i] = (members[i][0], m)
+        members.append((shortpath, SharedMember(m.shared)))
+    if len(first) < len(members):
+        logging.info('Sharing %d documents between %d static resources' %
+                     (len(first), len(members)))
+    return members
+
+def log_filtered(static_filter):
+    global excluded_resources, excluded_bytes, pruned_subtrees
+    if static_filter:
+        excluded_resources += static_filter.excluded
+        excluded_bytes += static_filter.excluded_bytes
+        pruned_subtrees += static_filter.pruned
+        logging.info('Static filters excluded %d resources (%d bytes) and %d subtrees' %
+                     (static_filter.excluded, static_filter.excluded_bytes, static_filter.pruned))
+
+def load_static(name, spec, mode, rest_base, resource_dictionary, config_data={}):
     """
     Loads the static data starting at the directory ./<spec>/static/<name>, recursively.
 
-    Populates the resdict dictionary, with the file path as the key.
+    Populates resource_dictionary, with the file path as the key.
 
     Expects a single index.json file in each directory.  Ignores other files.
 
+    If a snapshot of the mockup exists (./<spec>/static/<name>.snapshot) it is
+    loaded instead of walking the directory, unless config_data['static_snapshot']
+    is 'Disable' or the directory has changed since the snapshot was built.
+
+    If config_data['static_lazy'] is 'Enable' only the paths of the resources
+    are indexed at startup. Each resource is parsed the first time it is
+    accessed and then kept.
+
+    If config_data['static_workers'] is greater than 1 the index.json files are
+    parsed by that many worker processes. The resulting dictionary is the same
+    as a serial load.
+
+    The mockup can also be an archive (./<spec>/static/<name>.tar.gz, .tgz,
+    .tar.zst or .zip) which is read directly without extracting it. An archive
+    is used in place of the mockup directory when both exist. Archives are
+    always loaded in full at startup.
+
+    The non-JSON artifacts of the mockup (see Artifact) are indexed as well,
+    except when the mockup is an archive.
+
+    Resources can be left out with include/exclude rules, see load_filters()
+    and StaticFilter.  A resource that is left out is not found by the emulator.
+
+    index.json files larger than config_data['static_raw_threshold'] bytes
+    (RAW_THRESHOLD by default, 0 for none) are kept as JSON text, memory mapped
+    from a snapshot, and only parsed when needed, see RawMember.  This does not apply to
+    archives.
+
+    If config_data['static_dedup'] is 'Enable' resources with identical
+    contents share a single parsed document until one of them is accessed for
+    modification, see SharedMember.  This does not apply to lazy loads.
+
+    If config_data['checkpoint'] is a checkpoint of the mockup (see
+    checkpoint.py) its resources are loaded instead, without filters.
+
     Arguments:
-        name      - Name of the static data
-        spec      - Which spec the data is under, must be either redfish
-                    or chinook
-        rest_base - Base URL of the RESTful interface
+        name        - Name of the static data
+        spec        - Which spec the data is under, must be either redfish
+                      or chinook
+        rest_base   - Base URL of the RESTful interface
+        config_data - Emulator configuration (see emulator.py)
     """
+    shortpath = ''
     try:
         assert spec.lower() in ['redfish'], 'Unknown spec: ' + spec
         assert mode.lower() in ['local', 'cloud'], 'Unknown mode: ' + mode
-        dirname = os.path.dirname(__file__)
-        base_dir = os.path.join(dirname, spec.lower(), 'static', name)
-        index = os.path.join(base_dir, 'index.json')
-        assert os.path.exists(index), 'Static data for ' + name + ' does not exist'
+        base_dir = static_dir(name, spec)
+        lazy = config_data.get('static_lazy', 'Disable').lower() == 'enable'
+        workers = int(config_data.get('static_workers', 0))
+        static_filter = load_filters(base_dir, config_data)
+        dedup = config_data.get('static_dedup', 'Enable').lower() == 'enable'
+        raw_threshold = int(config_data.get('static_raw_threshold', RAW_THRESHOLD))
+        artifacts = []
+
+        if config_data.get('checkpoint'):
+            # checkpoint.py imports this module
+            from .checkpoint import checkpoint_for
+            checkpoint = checkpoint_for(config_data, name)
+            if checkpoint is not None and load_snapshot(checkpoint.path, resource_dictionary, lazy, None,
+                                                        dedup, artifacts, raw_threshold) is not None:
+                load_artifacts(base_dir, artifacts, resource_dictionary)
+                return shortpath
+
+        if config_data.get('static_snapshot', 'Enable').lower() == 'enable':
+            snapshot = snapshot_path(base_dir)
+            if os.path.exists(snapshot) and load_snapshot(snapshot, resource_dictionary, lazy, static_filter,
+                                                          dedup, artifacts, raw_threshold, base_dir) is not None:
+                load_artifacts(base_dir, artifacts, resource_dictionary)
+                log_filtered(static_filter)
+                return shortpath
 
-        for dirName, subdirList, fileList in os.walk(base_dir):
-            # print('Found directory: %s' % dirName)
-            for fname in fileList:
-                if fname != 'index.json':
+        archive = find_archive(base_dir)
+        if archive is not None:
+            if lazy or workers > 1:
+                logging.info('Loading archive %s serially' % archive)
+            entries = []
+            for shortpath, contents in walk_archive(archive, name):
+                if static_filter and not static_filter.allows(shortpath):
+                    static_filter.skip(len(contents))
                     continue
-                path = os.path.join(dirName, fname)
-                f = open(path)
-                index = json.load(f)
-                m = Member(index)
-
-                # Create shortpath starting at ServiceRoot
-                if mode == 'Cloud':
-                    shortpath = re.sub(base_dir + '/', '', path)
-                else:
-                    shortpath = os.path.relpath(path, base_dir)
-                    shortpath = shortpath.replace('\\', '/')
-                if dirName == base_dir:
-                    shortpath = ''
-                else:
-                    shortpath = re.sub('/index.json', '', shortpath)
+                entries.append((shortpath, content_key(contents) if dedup else shortpath, contents))
+            members = shared_members(entries, parse_static)
+            for shortpath, m in members:
                 resource_dictionary.add_resource(shortpath, m)
+            assert members, 'Archive ' + archive + ' does not contain any index.json files'
+            logging.info('Loaded %d static resources from archive %s' % (len(members), archive))
+            log_filtered(static_filter)
+            return shortpath
+
+        index = os.path.join(base_dir, 'index.json')
+        assert os.path.exists(index), 'Static data for ' + name + ' does not exist'
+
+        entries = list(walk_static(base_dir, mode, static_filter, artifacts))
+        members = {}
+        if raw_threshold:
+            for shortpath, path in entries:
+                if os.path.getsize(path) > raw_threshold:
+                    members[shortpath] = RawMember(read_raw(path))
+        parsed = [(shortpath, path) for shortpath, path in entries if shortpath not in members]
+        if lazy:
+            members.update((shortpath, LazyMember(read_static, path)) for shortpath, path in parsed)
+        elif workers > 1:
+            documents = read_static_parallel([path for shortpath, path in parsed], workers)
+            members.update(shared_members(((shortpath, key if dedup else shortpath, document)
+                                           for (shortpath, path), (key, document) in zip(parsed, documents)),
+                                          lambda document: document))
+        else:
+            members.update(shared_members(read_entries(parsed, dedup), parse_static))
+        for shortpath, path in entries:
+            resource_dictionary.add_resource(shortpath, members[shortpath])
+        log_raw(members)
+        logging.info('Loaded %d static resources from %s' % (len(entries), base_dir))
+        load_artifacts(base_dir, artifacts, resource_dictionary)
+        log_filtered(static_filter)
 # debug print
 #        resource_dictionary.print_dictionary()
 
@@ -103,3 +864,35 @@ def load_static(name, spec, mode, rest_base, resource_dictionary):
         traceback.print_exc()
         raise StaticLoadError(e)
     return shortpath
+
+# Mockups loaded by load_shared_static(), by name
+shared_mockups = {}
+# Watchers of the mockups in shared_mockups, by name, see STATIC_WATCH
+shared_watchers = {}
+
+def load_shared_static(name, spec, mode, rest_base, config_data={}):
+    """
+    Returns a ResourceDictionary with the static data of the mockup name for
+    emulator instances to share, see resource_dictionary.OverlayResourceDictionary.
+    The mockup is loaded by the first call, see load_static(), and the later
+    calls return the same dictionary.  It must not be modified, other than
+    by its watcher in shared_watchers when STATIC_WATCH is set.
+    """
+    # resource_dictionary imports this module
+    from .resource_dictionary import ResourceDictionary
+
+    base = shared_mockups.get(name)
+    if base is None:
+        base = ResourceDictionary()
+        load_static(name, spec, mode, rest_base, base, config_data)
+        shared_mockups[name] = base
+        if config_data.get('static_watch', 'Disable').lower() != 'disable':
+            base_dir = static_dir(name, spec)
+            if os.path.isdir(base_dir):
+                from .static_watcher import StaticWatcher
+                shared_watchers[name] = StaticWatcher(base_dir, base, config_data)
+            else:
+                logging.warning('Can not watch %s, it is not a mockup folder' % base_dir)
+    else:
+        logging.info('Sharing static resources of %s' % name)
+    return base
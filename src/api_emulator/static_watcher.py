@@ -0,0 +1,298 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Mockup Watcher
+#
+# Reloads the index.json files of a mockup folder while the emulator is
+# running (see STATIC_WATCH in emulator.py). Only the files that changed are
+# parsed again. Each one replaces its resource in the resource dictionary in a
+# single assignment so a request sees either the old or the new resource.
+#
+# No Flask routes are added, and resources that the loaders or the dynamic
+# resources have taken (see Member in static_loader.py) are never replaced or
+# deleted. Restart the emulator to pick up changes to those.
+#
+# Changes are picked up with inotify on Linux. Elsewhere, or when inotify
+# can't be used, the mockup folder is polled for changed files instead.
+
+import ctypes
+import ctypes.util
+import errno
+import json
+import logging
+import os
+import select
+import struct
+import threading
+import time
+
+from .static_loader import Member, load_filters
+
+# inotify event masks, see <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT = struct.Struct('iIII')
+
+# Time to wait for more changes before reloading, so that a batch of changes
+# (e.g. a git checkout) is reloaded in one go.
+SETTLE_TIME = 0.1
+
+class Inotify(object):
+    """
+    Minimal inotify binding. Raises OSError if inotify can't be used.
+    """
+    def __init__(self):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            self._add_watch = libc.inotify_add_watch
+            self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError) as e:
+            raise OSError(errno.ENOSYS, 'inotify is not available: %s' % e)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.fd = fd
+
+    def add_watch(self, path, mask):
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def read(self, timeout=None):
+        """
+        Returns a list of (wd, mask, name) for the pending events. Waits up to
+        timeout seconds (forever if None) for an event to arrive.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        data = os.read(self.fd, 65536)
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+class StaticWatcher(threading.Thread):
+    """
+    Thread that watches the mockup folder base_dir and reloads changed
+    index.json files into the resource dictionary.
+
+    Must be created right after load_static() so that it knows which
+    resources came from the mockup folder.
+
+    A mockup shared by several emulator instances (see
+    load_shared_static()) has one watcher, which reloads the shared
+    dictionary. The instances add their OverlayResourceDictionary to
+    overlays, which are told of each reloaded resource.
+
+    Arguments:
+        base_dir            - The mockup folder
+        resource_dictionary - The ResourceDictionary the mockup was loaded into
+        config_data         - Emulator configuration (see emulator.py)
+    """
+    def __init__(self, base_dir, resource_dictionary, config_data={}):
+        threading.Thread.__init__(self, name='StaticWatcher', daemon=True)
+        self.base_dir = os.path.normpath(base_dir)
+        self.resource_dictionary = resource_dictionary
+        self.overlays = []
+        self.static_filter = load_filters(base_dir, config_data)
+        self.poll = config_data.get('static_watch', 'Enable').lower() == 'poll'
+        self.interval = float(config_data.get('static_watch_interval', 1.0))
+
+        # Resources loaded from the mockup folder, by shortpath. Only these
+        # are replaced or deleted on a reload.
+        self.members = {}
+        # Modification time and size of each index.json, for polling
+        self.files = self.scan()
+        for dirpath in self.files:
+            shortpath = self.shortpath(dirpath)
+            try:
+                self.members[shortpath] = resource_dictionary.find_object(shortpath)
+            except KeyError:
+                pass
+
+    def shortpath(self, dirpath):
+        """
+        Returns the shortpath of the resource in mockup folder dirpath
+        """
+        shortpath = os.path.relpath(dirpath, self.base_dir).replace('\\', '/')
+        if shortpath == '.':
+            return ''
+        return shortpath
+
+    def scan(self):
+        """
+        Returns {directory: (mtime, size)} for each index.json below base_dir
+        """
+        files = {}
+        for dirName, subdirList, fileList in os.walk(self.base_dir):
+            if 'index.json' in fileList:
+                try:
+                    st = os.stat(os.path.join(dirName, 'index.json'))
+                except OSError:
+                    continue
+                files[dirName] = (st.st_mtime_ns, st.st_size)
+        return files
+
+    def reload(self, dirs):
+        """
+        Reloads the resources of the mockup directories in dirs
+        """
+        start = time.time()
+        reloaded, deleted, kept = 0, 0, 0
+        for dirpath in sorted(dirs):
+            shortpath = self.shortpath(dirpath)
+            if shortpath.startswith('..') or not self.static_filter.allows(shortpath):
+                continue
+            try:
+                current = self.resource_dictionary.find_object(shortpath)
+            except KeyError:
+                current = None
+            if current is not None and (current is not self.members.get(shortpath) or current.claimed):
+                logging.info('Not reloading %s, it is in use by a dynamic resource' % shortpath)
+                kept += 1
+                continue
+
+            path = os.path.join(dirpath, 'index.json')
+            try:
+                with open(path, 'rb') as f:
+                    config = json.loads(f.read())
+            except FileNotFoundError:
+                if current is not None and shortpath != '':
+                    self.resource_dictionary.delete_resource(shortpath)
+                    del self.members[shortpath]
+                    for overlay in self.overlays:
+                        overlay.rebase(shortpath, True)
+                    deleted += 1
+                continue
+            except (OSError, ValueError) as e:
+                # Most likely a file that is still being written
+                logging.warning('Not reloading %s: %s' % (path, e))
+                continue
+
+            m = Member(config)
+            self.resource_dictionary.add_resource(shortpath, m)
+            self.members[shortpath] = m
+            for overlay in self.overlays:
+                overlay.rebase(shortpath)
+            reloaded += 1
+        logging.info('Reloaded %d static resources, deleted %d, kept %d in %.1f ms' %
+                     (reloaded, deleted, kept, (time.time() - start) * 1000))
+
+    def run(self):
+        if not self.poll:
+            try:
+                inotify = Inotify()
+            except OSError as e:
+                logging.warning('Polling %s for changes: %s' % (self.base_dir, e))
+            else:
+                return self.watch(inotify)
+        logging.info('Polling %s for changes every %.1f s' % (self.base_dir, self.interval))
+        self.poll_changes()
+
+    def poll_changes(self):
+        while True:
+            time.sleep(self.interval)
+            files = self.scan()
+            changed = set(d for d in files if self.files.get(d) != files[d])
+            changed.update(d for d in self.files if d not in files)
+            self.files = files
+            if changed:
+                self.reload(changed)
+
+    def subtree(self, dirpath):
+        """
+        Returns the directories of the resources loaded from dirpath and below
+        """
+        shortpath = self.shortpath(dirpath)
+        return set(os.path.join(self.base_dir, s) for s, obj in self.resource_dictionary.walk(shortpath)
+                   if s in self.members)
+
+    def add_watches(self, inotify, watches, top):
+        """
+        Watches top and the directories below it. Returns the directories
+        holding an index.json.
+        """
+        dirs = set()
+        for dirName, subdirList, fileList in os.walk(top):
+            try:
+                watches[inotify.add_watch(dirName, WATCH_MASK)] = dirName
+            except OSError as e:
+                logging.warning('Can not watch %s: %s' % (dirName, e))
+            if 'index.json' in fileList:
+                dirs.add(dirName)
+        return dirs
+
+    def watch(self, inotify):
+        watches = {}
+        self.add_watches(inotify, watches, self.base_dir)
+        logging.info('Watching %d directories of %s for changes' % (len(watches), self.base_dir))
+        while True:
+            changed = set()
+            events = inotify.read()
+            while events:
+                for wd, mask, name in events:
+                    if mask & IN_Q_OVERFLOW:
+                        # Events were lost, reload everything
+                        changed.update(self.subtree(self.base_dir))
+                        changed.update(self.add_watches(inotify, watches, self.base_dir))
+                        continue
+                    if mask & IN_IGNORED:
+                        watches.pop(wd, None)
+                        continue
+                    dirName = watches.get(wd)
+                    if dirName is None:
+                        continue
+                    path = os.path.join(dirName, name)
+                    if mask & IN_ISDIR:
+                        if mask & (IN_CREATE | IN_MOVED_TO):
+                            changed.update(self.add_watches(inotify, watches, path))
+                        elif mask & (IN_DELETE | IN_MOVED_FROM):
+                            changed.update(self.subtree(path))
+                    elif name == 'index.json' and mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE | IN_MOVED_FROM):
+                        changed.add(dirName)
+                events = inotify.read(SETTLE_TIME)
+            if changed:
+                self.reload(changed)
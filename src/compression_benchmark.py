@@ -0,0 +1,108 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Compression Benchmark
+#
+# Measures what compressed responses (see api_emulator/compression.py) cost
+# and save on a crawl of each mockup, the way HSM discovery reads a BMC (see
+# crawl_benchmark.py). Each mockup is crawled once with each RESPONSE_CACHE
+# setting and each content coding in Accept-Encoding, identity for none.
+# First is the first crawl, which fills the response cache, crawl the median
+# of the repeats after it, and network the time of a crawl including the
+# time to send the bytes over a link of -mbps Mbit/s that the emulators
+# share.
+#
+#   python3 compression_benchmark.py [-mockups EX235a DL325] [-repeat 5] [-mbps 100]
+
+import argparse
+import os
+import statistics
+
+from werkzeug.test import EnvironBuilder
+
+# Imported first, it sets up the default instance before the emulator is
+# imported
+from crawl_benchmark import AUTHORIZATION, crawl_paths, crawl
+import emulator
+from api_emulator import instance
+from api_emulator.compression import OFFERS
+from api_emulator.redfish.redfish_auth import auth
+from api_emulator.resource_manager import ResourceManager
+from api_emulator.static_loader import static_dir
+
+CACHES = ['Disable', 'Enable']
+
+
+def bench_setting(name, host, cache, codings, repeat):
+    users = auth.get_users()
+    with instance.activate(instance.create(host, name)) as inst:
+        auth.set_users(users.copy())
+        ResourceManager(emulator.REST_BASE, emulator.SPEC, emulator.MODE,
+                        dict(emulator.CONFIG_DATA, xname=host, response_cache=cache))
+        paths = crawl_paths(inst)
+    app = instance.default.app
+    results = []
+    for coding in codings:
+        headers = {'Authorization': AUTHORIZATION, 'Host': host, 'Accept-Encoding': coding}
+        environs = [EnvironBuilder(path=path, headers=headers).get_environ() for path in paths]
+        first, size = crawl(app, environs)
+        rate = statistics.median(crawl(app, environs)[0] for i in range(repeat))
+        results.append((coding, len(paths), first, rate, size))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-mockups', nargs='+', default=None, help='Mockups to benchmark (default: all)')
+    parser.add_argument('-repeat', type=int, default=5, help='Crawls per setting, the median is reported')
+    parser.add_argument('-mbps', type=float, default=100, help='Bandwidth of the link in Mbit/s')
+    args = parser.parse_args()
+
+    mockups = args.mockups
+    if mockups is None:
+        static = static_dir('', 'redfish')
+        mockups = sorted(d for d in os.listdir(static) if os.path.isdir(os.path.join(static, d)))
+    codings = ['identity'] + OFFERS
+
+    print('%-24s %-8s %-8s %9s %10s %10s %10s %7s %13s' % ('Mockup', 'Cache', 'Coding', 'Resources', 'First',
+                                                      'Crawl', 'Sent (KB)', 'Ratio', 'Network (ms)'))
+    index = 0
+    for name in mockups:
+        for cache in CACHES:
+            # Host names of the instances, xnames for the loaders that need one
+            host = 'x9000c0s%db0' % index
+            index += 1
+            identity = None
+            for coding, count, first, rate, size in bench_setting(name, host, cache, codings, args.repeat):
+                identity = identity or size
+                network = 1000 * (count / rate + size * 8 / (args.mbps * 1e6))
+                print('%-24s %-8s %-8s %9d %10.0f %10.0f %10d %6.1fx %13.1f' % (name, cache, coding, count, first, rate,
+                                                                            size / 1024, identity / size, network))
+    os._exit(0)
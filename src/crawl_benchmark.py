@@ -0,0 +1,165 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Crawl Benchmark
+#
+# Measures the GETs per second and the bytes sent by a crawl of each mockup,
+# the way HSM discovery reads a BMC: every resource that the link graph
+# (see api_emulator/link_graph.py) reaches from the ServiceRoot is read once,
+# breadth first. The emulator runs in this process and its WSGI app is
+# called with WSGI environments built before the crawl, so the rates are
+# those of the emulator alone, without a network or a WSGI server.
+#
+#   python3 crawl_benchmark.py [-mockups EX235a DL325] [-repeat 5] [-encoders json orjson]
+#
+# Mockups are read from ./api_emulator/redfish/static (see setup.sh). Each
+# mockup is emulated once for each JSON encoder, JSON_OUTPUT and
+# RESPONSE_CACHE setting. First is the first crawl, which fills the response
+# cache, crawl the median of the repeats after it, and revalidate the median
+# of crawls that send the ETags of the first crawl in If-None-Match. The
+# speedup is that of the crawl over the first setting, the one of the
+# emulator before the response cache.
+
+import argparse
+import base64
+import collections
+import logging
+import os
+import statistics
+import time
+
+from werkzeug.test import EnvironBuilder
+
+import g
+
+# The default instance emulates the smallest mockup, the benchmarked mockups
+# are emulated by instances of their own
+g.staticfolder = 'public-rackmount1'
+logging.getLogger().setLevel(logging.WARNING)
+
+import emulator
+from api_emulator import instance, json_encoder
+from api_emulator.link_graph import link_graph, link_path
+from api_emulator.redfish.redfish_auth import auth
+from api_emulator.resource_manager import ResourceManager
+from api_emulator.static_loader import static_dir
+
+OUTPUTS = ['Pretty', 'Compact']
+CACHES = ['Disable', 'Enable']
+
+AUTHORIZATION = 'Basic ' + base64.b64encode(b'root:root_password').decode()
+
+
+def crawl_paths(inst):
+    graph = link_graph(inst)
+    paths = []
+    seen = {''}
+    queue = collections.deque([''])
+    while queue:
+        path = queue.popleft()
+        paths.append(link_path(path))
+        for target in graph.outgoing[path]:
+            if target in graph.outgoing and target not in seen:
+                seen.add(target)
+                queue.append(target)
+    return paths
+
+
+def start_response(status, headers, exc_info=None):
+    pass
+
+
+def crawl(app, environs):
+    start = time.perf_counter()
+    size = 0
+    for environ in environs:
+        resp = app(dict(environ), start_response)
+        try:
+            for data in resp:
+                size += len(data)
+        finally:
+            if hasattr(resp, 'close'):
+                resp.close()
+    return len(environs) / (time.perf_counter() - start), size
+
+
+def bench_setting(name, host, encoder, output, cache, repeat):
+    json_encoder.select(encoder)
+    users = auth.get_users()
+    with instance.activate(instance.create(host, name)) as inst:
+        auth.set_users(users.copy())
+        ResourceManager(emulator.REST_BASE, emulator.SPEC, emulator.MODE,
+                        dict(emulator.CONFIG_DATA, xname=host, json_output=output, response_cache=cache))
+        paths = crawl_paths(inst)
+    app = instance.default.app
+    headers = {'Authorization': AUTHORIZATION, 'Host': host}
+    environs = [EnvironBuilder(path=path, headers=headers).get_environ() for path in paths]
+
+    first, size = crawl(app, environs)
+    rate = statistics.median(crawl(app, environs)[0] for i in range(repeat))
+    revalidate = None
+    if cache.lower() != 'disable':
+        client = app.test_client()
+        etags = {path: client.get(path, headers=headers).headers.get('ETag', '') for path in paths}
+        environs = [EnvironBuilder(path=path, headers=dict(headers, **{'If-None-Match': etags[path]})).get_environ()
+                    for path in paths]
+        revalidate = statistics.median(crawl(app, environs)[0] for i in range(repeat))
+    return len(paths), first, rate, revalidate, size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-mockups', nargs='+', default=None, help='Mockups to benchmark (default: all)')
+    parser.add_argument('-repeat', type=int, default=5, help='Crawls per setting, the median is reported')
+    parser.add_argument('-encoders', nargs='+', default=None, help='JSON encoders (default: all that are installed)')
+    args = parser.parse_args()
+
+    mockups = args.mockups
+    if mockups is None:
+        static = static_dir('', 'redfish')
+        mockups = sorted(d for d in os.listdir(static) if os.path.isdir(os.path.join(static, d)))
+    encoders = args.encoders or ['json'] + [e for e in json_encoder.installed() if e != 'json']
+    settings = [(encoder, output, cache) for encoder in encoders for output in OUTPUTS for cache in CACHES]
+
+    print('%-24s %-7s %-8s %-8s %9s %10s %10s %8s %10s %10s' % ('Mockup', 'Encoder', 'Output', 'Cache', 'Resources',
+                                                            'First', 'Crawl', 'Speedup', 'Revalidate', 'Sent (KB)'))
+    index = 0
+    for name in mockups:
+        baseline = None
+        for encoder, output, cache in settings:
+            # Host names of the instances, xnames for the loaders that need one
+            host = 'x9000c0s%db0' % index
+            index += 1
+            count, first, rate, revalidate, size = bench_setting(name, host, encoder, output, cache, args.repeat)
+            baseline = baseline or rate
+            print('%-24s %-7s %-8s %-8s %9d %10.0f %10.0f %7.1fx %10s %10d' % (name, encoder, output, cache, count, first, rate,
+                                                                       rate / baseline, '%.0f' % revalidate if revalidate else '-',
+                                                                       size / 1024))
+    os._exit(0)
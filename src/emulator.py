@@ -38,14 +38,12 @@
 #   python emulator.py
 
 import os
-import json
 import argparse
 import traceback
 import xml.etree.ElementTree as ET
 import logging
 import copy
 
-from OpenSSL import crypto, SSL
 from socket import gethostname
 
 logging.basicConfig(level=logging.DEBUG)
@@ -61,7 +59,10 @@ from api_emulator.version import __version__
 from api_emulator.resource_manager import ResourceManager
 from api_emulator.redfish.response import simple_error_response
 from api_emulator.redfish.redfish_auth import auth, User, ADMIN_USER
-from api_emulator import vault_adapter
+from api_emulator import instance
+from api_emulator import json_encoder
+from api_emulator.compression import negotiate, compress, compressible, set_coding
+from api_emulator.response_cache import conditional, pretty
 
 SPEC = 'Redfish'
 MODE = 'Local'
@@ -79,31 +80,18 @@ resource_manager = None
 parser = reqparse.RequestParser()
 parser.add_argument('Action', type=str, required=True)
 
-CERT_FILE = "server.crt"
-KEY_FILE = "server.key"
-
 def generate_certs():
+    """
+    Returns the certificate and key files for HTTPS. A certificate stored by an
+    earlier run is reused when it is still valid, see api_emulator/cert_store.py
+    """
+    # Only HTTPS needs the cryptography package, import it here to keep it
+    # off the cold start path of HTTP instances.
+    from api_emulator.cert_store import CertStore
 
-    # create a key pair
-    k = crypto.PKey()
-    k.generate_key(crypto.TYPE_RSA, 2048)
-
-    # create a self-signed cert
-    cert = crypto.X509()
-    cert.get_subject().C = "US"
-    cert.get_subject().O = "Hewlett Packard Enterprise Development LP"
-    cert.get_subject().CN = gethostname()
-    cert.set_serial_number(1000)
-    cert.gmtime_adj_notBefore(0)
-    cert.gmtime_adj_notAfter(10*365*24*60*60)
-    cert.set_issuer(cert.get_subject())
-    cert.set_pubkey(k)
-    cert.sign(k, 'sha1')
-
-    with open(CERT_FILE, "wt") as f:
-        f.write(crypto.dump_certificate(crypto.FILETYPE_PEM, cert).decode("utf-8"))
-    with open(KEY_FILE, "wt") as f:
-        f.write(crypto.dump_privatekey(crypto.FILETYPE_PEM, k).decode("utf-8"))
+    store = CertStore(CONFIG_DATA['tls_cert_dir'], CONFIG_DATA['tls_key_type'],
+                      CONFIG_DATA['tls_ca_cert'], CONFIG_DATA['tls_ca_key'])
+    return store.certificate(CONFIG_DATA.get('xname') or gethostname())
 
 # Execution starts a main(), at end of file
 
@@ -117,39 +105,56 @@ def init_resource_manager():
 
     resource_manager = ResourceManager(REST_BASE, SPEC, MODE, CONFIG_DATA)
 
+def init_instances():
+    """
+    Sets up the emulator instances listed in INSTANCES next to the default one
+    """
+    users = auth.get_users()
+    for name, mockup in CONFIG_DATA.get('instances', []):
+        with instance.activate(instance.create(name, mockup)) as inst:
+            # Accounts from AUTH_CONFIG apply to every instance
+            auth.set_users(users.copy())
+            ResourceManager(REST_BASE, SPEC, MODE, dict(CONFIG_DATA, xname=name))
+            inst.report.log()
+
 class PathError(Exception):
     pass
 
 @g.api.representation('application/json')
 def output_json(data, code, headers=None):
     """
-    Overriding how JSON is returned by the server so that it looks nice
+    Overriding how JSON is returned by the server so that it looks nice, or
+    is compact with JSON_OUTPUT=Compact, and is compressed if the client
+    accepts it
     """
-    resp = make_response(json.dumps(data, indent=4), code)
+    cache = instance.current().response_cache
+    if cache is not None and code == 200 and request.method in ('GET', 'HEAD'):
+        # Encoded once until the resource changes, see api_emulator/response_cache.py
+        body, tag, coding = cache.response(data, pretty(), negotiate())
+        resp = make_response(body, code)
+        resp.headers.extend(headers or {})
+        return set_coding(conditional(resp, tag), coding)
+    body = json_encoder.dumps(data, pretty())
+    coding = negotiate()
+    if coding is not None and compressible(body):
+        body = compress(body, coding)
+    else:
+        coding = None
+    resp = make_response(body, code)
     resp.headers.extend(headers or {})
-    return resp
-
-#
-# If DELETE /redfish/v1/reset, then reset the resource manager
-#
-# TODO: Get this working to reload resources. Doesn't work right
-#       now because of the way routes are added.
-# @g.app.route('/redfish/v1/reset/', methods=['DELETE'])
-# def reset():
-    # try:
-        # init_resource_manager(True)
-        # data = {'Message': 'Emulator reset successfully'}
-        # resp = json.dumps(data, indent=4), 200
-    # except Exception:
-        # traceback.print_exc()
-        # resp = simple_error_response('Internal Server Error', 500)
-    # return resp
+    return set_coding(resp, coding)
 
 #
 #
 def startup():
 
+    # Mockups emulated by more than one instance are loaded once and shared
+    mockups = [g.staticfolder] + [mockup for name, mockup in CONFIG_DATA.get('instances', [])]
+    if CONFIG_DATA.get('static_share', 'Enable').lower() == 'enable':
+        CONFIG_DATA['static_shared'] = [m for m in set(mockups) if mockups.count(m) > 1]
+
     init_resource_manager()
+    init_instances()
 
 #
 # Main method
@@ -160,6 +165,63 @@ def startup():
 #   HTTPS = Specifies whether the emulator supports "http" or "https"
 #   SPEC =  The emulator may support multiple specifications or revisions of a specification.
 #           This flag specifies the specification/version to which to conform
+#   TLS_CERT_DIR = Directory in which the HTTPS certificate and key are kept as <name>.crt and
+#           <name>.key, where name is XNAME or the hostname (default ./certs). A stored certificate
+#           is reused across restarts while it is valid.
+#   TLS_KEY_TYPE = Key type of new HTTPS certificates, 'RSA' (2048 bit, default) or 'ECDSA' (P-256).
+#   TLS_CA_CERT, TLS_CA_KEY = Certificate and key files of a local CA. When set the HTTPS
+#           certificate is issued by this CA instead of being self-signed.
+#   STATIC_SNAPSHOT = Specifies whether the static resources are loaded from a precompiled
+#           snapshot of the mockup (./api_emulator/redfish/static/<mockup>.snapshot) when one
+#           exists. Snapshots are built with 'python3 -m api_emulator.snapshot <mockup dir>'.
+#   STATIC_LAZY = Specifies whether static resources are parsed on first access instead of
+#           all at startup. Only the resource paths are indexed when the emulator starts.
+#   STATIC_WORKERS = Number of worker processes used to parse the mockup when it is fully
+#           loaded at startup (no snapshot and STATIC_LAZY disabled). 0 or 1 parses serially.
+#   STATIC_DEDUP = Specifies whether static resources with identical contents share one parsed
+#           document at startup. A resource gets its own copy when it is first accessed for
+#           modification. Does not apply when STATIC_LAZY is enabled.
+#   STATIC_RAW_THRESHOLD = Size in bytes above which an index.json is kept as JSON text
+#           instead of being parsed (default 65536, 0 disables). GETs send the text as is. It
+#           is parsed when a dynamic resource needs to modify it.
+#   STATIC_WATCH = Specifies whether changes to the mockup folder are reloaded while the emulator
+#           runs. 'Enable' uses inotify where available and polls otherwise, 'Poll' always polls.
+#           Only changed index.json files are reloaded. Resources in use by dynamic resources are kept.
+#   STATIC_WATCH_INTERVAL = Seconds between polls of the mockup folder when polling (default 1).
+#   STATIC_INCLUDE = Comma separated list of glob patterns. When set only the static resources
+#           matching one of them (and the resources below them) are loaded, e.g. 'Systems,Chassis'.
+#   STATIC_EXCLUDE = Comma separated list of glob patterns. Static resources matching one of
+#           them (and the resources below them) are not loaded, e.g. 'JsonSchemas,Registries/*'.
+#           Both replace the lists in ./api_emulator/redfish/static/<mockup>.filters.json.
+#   INSTANCES = Comma separated list of <name>:<mockup> pairs of additional BMCs to emulate in
+#           this process, e.g. 'x3000c0s3b0:DL325,x1000c0s0b0:EX425'. Requests are served by the
+#           instance whose name is the host name of the request, and by the MOCKUPFOLDER instance
+#           otherwise. The name is used as the XNAME of the instance.
+#   STATIC_SHARE = Specifies whether instances that emulate the same mockup share one read-only
+#           copy of it (default Enable). Each instance only keeps the resources it modifies.
+#   STATE_DB = SQLite database file in which the state that clients change, e.g. accounts, sessions,
+#           event subscriptions, power limits and firmware versions, is kept across restarts. Not
+#           set by default, which keeps the state in memory only.
+#   STATE_DB_INTERVAL = Seconds between the writes of the changed state to STATE_DB (default 1).
+#   CHECKPOINT = Checkpoint file, from GET /redfish/v1/Emulator/Checkpoint, to boot the instances
+#           that emulate its mockup from, with the resources, accounts and pending updates of the
+#           BMC it was taken from. Not set by default.
+#   RESPONSE_CACHE = Specifies whether the JSON text of the responses to GETs is kept until the
+#           resource changes, and sent with an ETag (default Enable). 'Warm' also encodes the
+#           static resources at startup instead of on their first GET. 'Disable' encodes every
+#           response again and sends no ETag.
+#   JSON_OUTPUT = 'Pretty' (default) sends indented JSON, 'Compact' sends JSON without whitespace,
+#           which is smaller and faster to encode. Clients get pretty JSON with the 'pretty' query
+#           parameter, e.g. /redfish/v1/Systems?pretty.
+#   JSON_ENCODER = JSON encoder of the responses, 'orjson', 'ujson' or 'json' (the standard library).
+#           'Auto' (default) uses the fastest one that is installed for compact JSON and 'json'
+#           for pretty JSON.
+#   RESPONSE_COMPRESSION = 'Enable' (default) compresses responses with gzip, or brotli if it is
+#           installed, when the client accepts it in Accept-Encoding. 'Disable' sends them uncompressed.
+#   COMPRESSION_THRESHOLD = Size in bytes from which responses that the response cache does not keep
+#           are compressed (default 1024). Responses of static resources are always compressed.
+#   CHANGE_JOURNAL_SIZE = Number of resource changes kept for GET /redfish/v1/Emulator/Changes
+#           (default 1000). Clients that fall further behind have to read the resources again.
 #   MOCKUPFOLDERS = This parameter will supercede SPEC.  Specifies a list of
 #           folder which contain mockup files in ./static.  For example, if the
 #           list contains ["Redfish", "Swordfish"], the files in
@@ -187,8 +249,73 @@ def main():
     CONFIG_DATA['xname'] = os.getenv('XNAME')
     CONFIG_DATA['mac_schema'] = os.getenv('MAC_SCHEMA')
 
+    CONFIG_DATA['tls_cert_dir'] = os.getenv('TLS_CERT_DIR', 'certs')
+    CONFIG_DATA['tls_key_type'] = os.getenv('TLS_KEY_TYPE', 'RSA').upper()
+    assert CONFIG_DATA['tls_key_type'] in ['RSA', 'ECDSA'], 'Unknown TLS_KEY_TYPE setting:' + CONFIG_DATA['tls_key_type']
+    CONFIG_DATA['tls_ca_cert'] = os.getenv('TLS_CA_CERT')
+    CONFIG_DATA['tls_ca_key'] = os.getenv('TLS_CA_KEY')
+
+    STATIC_SNAPSHOT = os.getenv('STATIC_SNAPSHOT', 'Enable')
+    assert STATIC_SNAPSHOT.lower() in ['enable', 'disable'], 'Unknown STATIC_SNAPSHOT setting:' + STATIC_SNAPSHOT
+    CONFIG_DATA['static_snapshot'] = STATIC_SNAPSHOT
+
+    STATIC_LAZY = os.getenv('STATIC_LAZY', 'Disable')
+    assert STATIC_LAZY.lower() in ['enable', 'disable'], 'Unknown STATIC_LAZY setting:' + STATIC_LAZY
+    CONFIG_DATA['static_lazy'] = STATIC_LAZY
+
+    CONFIG_DATA['static_workers'] = int(os.getenv('STATIC_WORKERS', 0))
+
+    STATIC_DEDUP = os.getenv('STATIC_DEDUP', 'Enable')
+    assert STATIC_DEDUP.lower() in ['enable', 'disable'], 'Unknown STATIC_DEDUP setting:' + STATIC_DEDUP
+    CONFIG_DATA['static_dedup'] = STATIC_DEDUP
+
+    CONFIG_DATA['static_raw_threshold'] = int(os.getenv('STATIC_RAW_THRESHOLD', 64 * 1024))
+
+    STATIC_WATCH = os.getenv('STATIC_WATCH', 'Disable')
+    assert STATIC_WATCH.lower() in ['enable', 'disable', 'poll'], 'Unknown STATIC_WATCH setting:' + STATIC_WATCH
+    CONFIG_DATA['static_watch'] = STATIC_WATCH
+    CONFIG_DATA['static_watch_interval'] = float(os.getenv('STATIC_WATCH_INTERVAL', 1))
+
+    CONFIG_DATA['static_include'] = [p.strip() for p in os.getenv('STATIC_INCLUDE', '').split(',') if p.strip()]
+    CONFIG_DATA['static_exclude'] = [p.strip() for p in os.getenv('STATIC_EXCLUDE', '').split(',') if p.strip()]
+
+    CONFIG_DATA['instances'] = []
+    for pair in os.getenv('INSTANCES', '').split(','):
+        if pair.strip():
+            assert ':' in pair, 'Unknown INSTANCES setting, expected <name>:<mockup>:' + pair
+            name, mockup = pair.strip().split(':', 1)
+            CONFIG_DATA['instances'].append((name.lower(), mockup))
+
+    STATIC_SHARE = os.getenv('STATIC_SHARE', 'Enable')
+    assert STATIC_SHARE.lower() in ['enable', 'disable'], 'Unknown STATIC_SHARE setting:' + STATIC_SHARE
+    CONFIG_DATA['static_share'] = STATIC_SHARE
+
+    RESPONSE_CACHE = os.getenv('RESPONSE_CACHE', 'Enable')
+    assert RESPONSE_CACHE.lower() in ['enable', 'warm', 'disable'], 'Unknown RESPONSE_CACHE setting:' + RESPONSE_CACHE
+    CONFIG_DATA['response_cache'] = RESPONSE_CACHE
+
+    JSON_OUTPUT = os.getenv('JSON_OUTPUT', 'Pretty')
+    assert JSON_OUTPUT.lower() in ['pretty', 'compact'], 'Unknown JSON_OUTPUT setting:' + JSON_OUTPUT
+    CONFIG_DATA['json_output'] = JSON_OUTPUT
+    JSON_ENCODER = os.getenv('JSON_ENCODER', 'Auto')
+    assert JSON_ENCODER.lower() in ['auto'] + json_encoder.installed(), 'JSON_ENCODER is not installed:' + JSON_ENCODER
+    json_encoder.select(JSON_ENCODER)
+    RESPONSE_COMPRESSION = os.getenv('RESPONSE_COMPRESSION', 'Enable')
+    assert RESPONSE_COMPRESSION.lower() in ['enable', 'disable'], 'Unknown RESPONSE_COMPRESSION setting:' + RESPONSE_COMPRESSION
+    CONFIG_DATA['response_compression'] = RESPONSE_COMPRESSION
+    CONFIG_DATA['compression_threshold'] = int(os.getenv('COMPRESSION_THRESHOLD', 1024))
+
+    CONFIG_DATA['change_journal_size'] = int(os.getenv('CHANGE_JOURNAL_SIZE', 1000))
+    CONFIG_DATA['state_db'] = os.getenv('STATE_DB', '')
+    CONFIG_DATA['state_db_interval'] = float(os.getenv('STATE_DB_INTERVAL', 1))
+    CONFIG_DATA['checkpoint'] = os.getenv('CHECKPOINT', '')
+    if CONFIG_DATA['checkpoint']:
+        assert os.path.isfile(CONFIG_DATA['checkpoint']), 'CHECKPOINT file does not exist: ' + CONFIG_DATA['checkpoint']
+
     auth_config = os.getenv('AUTH_CONFIG', '')
     if auth_config == "from_vault":
+        # hvac is only needed for vault credentials, defer its import
+        from api_emulator import vault_adapter
         vault_client = vault_adapter.create_adapter()
         username, password = vault_client.retrieve_credentials(CONFIG_DATA['xname'])
 
@@ -229,8 +356,8 @@ def main():
     startup()
     if (HTTPS == 'Enable'):
         print (' * Use HTTPS')
-        generate_certs()
-        context = (CERT_FILE, KEY_FILE)
+        with instance.default.report.phase('generate_certs'):
+            context = generate_certs()
         kwargs = {'debug': args.debug, 'port': args.port, 'ssl_context' : context}
     else:
         print (' * Use HTTP')
@@ -239,6 +366,8 @@ def main():
     if not args.debug:
         kwargs['host'] = '0.0.0.0'
 
+    instance.default.report.log()
+
     print (' * Running in', SPEC, 'mode')
     g.app.run(**kwargs)
 
@@ -247,3 +376,4 @@ if __name__ == '__main__':
     main()
 else:
     startup()
+    instance.default.report.log()
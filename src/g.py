@@ -39,7 +39,9 @@
 # should be called config.py.  But too late, now.
 
 from flask import Flask
-from flask_restful import Api
+from werkzeug.local import LocalProxy
+
+from api_emulator import instance
 
 # Settings from emulator-config.json
 #
@@ -48,8 +50,10 @@ staticfolder = 'Generic'
 # Base URI. Will get overwritten in emulator.py
 rest_base = 'base'
 
-# Create Flask server
-app = Flask(__name__)
+# Create Flask server and RESTful API of the default emulator instance
+instance.create_default(Flask(__name__))
 
-# Create RESTful API
-api = Api(app)
+# Flask server and RESTful API of the current emulator instance, see
+# api_emulator/instance.py
+app = LocalProxy(lambda: instance.current().app)
+api = LocalProxy(lambda: instance.current().api)
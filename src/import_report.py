@@ -0,0 +1,155 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Import Report
+#
+# Reports where the cold start import time of the emulator goes, as measured
+# by python's -X importtime, and what the imports that are deferred until a
+# mockup or setting needs them would have cost.
+#
+#   python3 import_report.py [-mockup public-rackmount1] [-repeat 5] [-top 15]
+#
+# Every run imports emulator in a fresh interpreter for the given mockup with
+# HTTP and the default accounts, so neither the vault adapter nor the
+# certificate store is needed. The deferred modules are then imported on
+# their own, their time is what an HTTP instance of this mockup saves.
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Imports that are only done when the mockup or a setting needs them.
+DEFERRED = [
+    'api_emulator.vault_adapter',                                   # AUTH_CONFIG=from_vault
+    'api_emulator.cert_store',                                      # HTTPS
+    'api_emulator.static_watcher',                                  # STATIC_WATCH
+    'api_emulator.ex235a_loader',                                   # EX235a
+    'api_emulator.redfish.hpe_cray_ex_power_control_api',           # HPE Cray EX power limits
+    'api_emulator.redfish.hpe_cray_ex_certificate_service_api',     # HPE Cray EX certificates
+    'api_emulator.redfish.proliant_ilo_power_control_api',          # HPE iLO power limits
+    'api_emulator.redfish.templates.hpe_cray_ex_events',
+    'api_emulator.redfish.templates.proliant_ilo_events',
+    'api_emulator.redfish.templates.gigabyte_events',
+    'api_emulator.redfish.templates.intel_events',
+]
+
+MARKER = '--- deferred ---'
+
+# The UpdateWorker started by update_service_api keeps the interpreter alive,
+# so the child leaves with os._exit.
+CHILD = '''
+import os, sys
+import g
+g.staticfolder = %r
+import emulator
+sys.stderr.write(%r + '\\n')
+for name in %r:
+    __import__(name)
+sys.stderr.flush()
+os._exit(0)
+'''
+
+
+def parse_importtime(output):
+    """
+    Returns ([(name, self_us, cumulative_us, depth)], [...]) for the imports
+    done at startup and the deferred imports, from -X importtime output.
+    """
+    phases = [[], []]
+    phase = phases[0]
+    for line in output.splitlines():
+        if line == MARKER:
+            phase = phases[1]
+            continue
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        phase.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return phases
+
+
+def run(mockup):
+    code = CHILD % (mockup, MARKER, DEFERRED)
+    env = dict(os.environ, HTTPS='Disable', AUTH_CONFIG='')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return parse_importtime(result.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-mockup', default='public-rackmount1', help='Mockup to start the emulator with')
+    parser.add_argument('-repeat', type=int, default=5, help='Runs, the median is reported')
+    parser.add_argument('-top', type=int, default=15, help='Number of slowest top level imports to list')
+    args = parser.parse_args()
+
+    runs = [run(args.mockup) for i in range(args.repeat)]
+
+    startup = {}
+    deferred = {}
+    for startup_imports, deferred_imports in runs:
+        for name, self_us, cumulative_us, depth in startup_imports:
+            if depth == 0:
+                startup.setdefault(name, []).append(cumulative_us)
+        loaded = set(name for name, self_us, cumulative_us, depth in startup_imports)
+        for name in DEFERRED:
+            if name in loaded:
+                deferred.setdefault(name, []).append(None)
+        for name, self_us, cumulative_us, depth in deferred_imports:
+            if name in DEFERRED:
+                deferred.setdefault(name, []).append(cumulative_us)
+
+    total = statistics.median(sum(c for n, s, c, d in imports if d == 0) for imports, _ in runs)
+    modules = statistics.median(len(imports) for imports, _ in runs)
+    saved = statistics.median(sum(c for n, s, c, d in imports if d == 0) for _, imports in runs)
+    saved_modules = statistics.median(len(imports) for _, imports in runs)
+
+    print('Mockup: %s, %d runs' % (args.mockup, args.repeat))
+    print('Startup imports:  %8.1f ms  %5d modules' % (total / 1000, modules))
+    print('Deferred imports: %8.1f ms  %5d modules' % (saved / 1000, saved_modules))
+    print()
+    print('%-64s %10s' % ('Top level import', 'Time (ms)'))
+    slowest = sorted(startup.items(), key=lambda item: -statistics.median(item[1]))
+    for name, times in slowest[:args.top]:
+        print('%-64s %10.1f' % (name, statistics.median(times) / 1000))
+    print()
+    print('%-64s %10s' % ('Deferred import', 'Time (ms)'))
+    for name in DEFERRED:
+        times = deferred.get(name, [])
+        if None in times:
+            print('%-64s %10s' % (name, 'startup'))
+        elif times:
+            print('%-64s %10.1f' % (name, statistics.median(times) / 1000))
+        else:
+            print('%-64s %10s' % (name, '-'))
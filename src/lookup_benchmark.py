@@ -0,0 +1,125 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Lookup Benchmark
+#
+# Compares resource lookups in the path trie of the ResourceDictionary (see
+# api_emulator/path_trie.py) with the flat dict keyed by os.path.normpath()
+# that it replaced.
+#
+#   python3 lookup_benchmark.py [-mockups EX235a DL325] [-repeat 5]
+#
+# Mockups are read from ./api_emulator/redfish/static (see setup.sh). Each
+# mockup is looked up by path, by '@odata.id', and walked by the subtrees
+# of the top level collections. The links row compares finding the links
+# of each resource in its document with reading them from the link graph
+# (see api_emulator/link_graph.py), as a crawl does. Rates are the median of
+# the repeats, in thousands of operations per second.
+
+import argparse
+import os
+import statistics
+import time
+
+from api_emulator.link_graph import LinkGraph, document_links
+from api_emulator.path_trie import PathTrie
+from api_emulator.resource_dictionary import ResourceDictionary
+from api_emulator.static_loader import static_dir, load_static
+
+
+def normpath_get(resdict, path):
+    # The lookup of ResourceDictionary before the path trie
+    if path != '':
+        p = os.path.normpath(path)
+    else:
+        p = path
+    return resdict[p]
+
+
+def normpath_walk(resdict, path):
+    # A prefix walk without the trie has to scan every path
+    return [p for p in resdict if p == path or p.startswith(path + '/')]
+
+
+def rate(func, items, repeat):
+    rates = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        rates.append(len(items) / (time.perf_counter() - start))
+    return statistics.median(rates) / 1000
+
+
+def bench_mockup(name, repeat):
+    resource_dictionary = ResourceDictionary()
+    load_static(name, 'redfish', 'Local', '/redfish/v1/', resource_dictionary, {})
+    trie = resource_dictionary.resdict
+    flat = dict(trie.items())
+
+    paths = list(flat)
+    # The Loader looks resources up by the '@odata.id' of collection members
+    odata_ids = ['/redfish/v1/' + p for p in paths]
+    # Paths as the catch-all route gets them, e.g. with a trailing '/'
+    untidy = [p + '/' for p in paths if p]
+    prefixes = trie.children('')
+    graph = LinkGraph(resource_dictionary)
+
+    results = [
+        ('path',      rate(lambda p: normpath_get(flat, p), paths, repeat),
+                      rate(lambda p: trie[p], paths, repeat)),
+        ('@odata.id', rate(lambda p: normpath_get(flat, p.replace('/redfish/v1/', '')), odata_ids, repeat),
+                      rate(lambda p: trie[p], odata_ids, repeat)),
+        ('path/',     rate(lambda p: normpath_get(flat, p), untidy, repeat),
+                      rate(lambda p: trie[p], untidy, repeat)),
+        ('walk',      rate(lambda p: normpath_walk(flat, p), prefixes, repeat),
+                      rate(lambda p: list(trie.walk(p)), prefixes, repeat)),
+        ('links',     rate(lambda p: document_links(flat[p].view, p), paths, repeat),
+                      rate(lambda p: graph.outgoing[p], paths, repeat)),
+    ]
+    return len(paths), results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-mockups', nargs='+', default=None, help='Mockups to benchmark (default: all)')
+    parser.add_argument('-repeat', type=int, default=5, help='Runs per lookup, the median is reported')
+    args = parser.parse_args()
+
+    mockups = args.mockups
+    if mockups is None:
+        static = static_dir('', 'redfish')
+        mockups = sorted(d for d in os.listdir(static) if os.path.isdir(os.path.join(static, d)))
+
+    print('%-24s %9s %-10s %14s %14s %8s' % ('Mockup', 'Resources', 'Lookup', 'normpath (k/s)', 'trie (k/s)', 'Speedup'))
+    for name in mockups:
+        count, results = bench_mockup(name, args.repeat)
+        for lookup, before, after in results:
+            print('%-24s %9d %-10s %14.1f %14.1f %7.1fx' % (name, count, lookup, before, after, after / before))
@@ -0,0 +1,182 @@
+# BSD 3-Clause License
+#
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+# Startup Benchmark
+#
+# Measures how long load_static() takes for each mockup with each of the
+# supported ways of loading static resources.
+#
+#   python3 startup_benchmark.py [-mockups EX4252 XL675d_A40] [-repeat 5] [-workers 2 4 8]
+#
+# Mockups are read from ./api_emulator/redfish/static (see setup.sh). Any
+# snapshot or archive that has to be built for the benchmark is removed
+# afterwards.
+#
+# Memory is the size of the python objects allocated by one load, as traced
+# by tracemalloc, and is measured separately from the load times. Disk is the
+# size of the files the mockup is loaded from.
+
+import argparse
+import io
+import os
+import statistics
+import tarfile
+import time
+import tracemalloc
+import zipfile
+
+from api_emulator.resource_dictionary import ResourceDictionary
+from api_emulator.snapshot import snapshot_path
+from api_emulator.static_loader import static_dir, load_static, build_snapshot, zstandard
+
+# Name, config_data and source for each way of loading a mockup. The source
+# is the file the mockup is loaded from: the mockup folder, its snapshot, or
+# an archive with the given extension.
+METHODS = [
+    ('walker',        {'static_snapshot': 'Disable', 'static_dedup': 'Disable', 'static_raw_threshold': 0}, 'folder'),
+    ('snapshot',      {'static_snapshot': 'Enable', 'static_dedup': 'Disable', 'static_raw_threshold': 0}, 'snapshot'),
+    ('raw',           {'static_snapshot': 'Disable', 'static_dedup': 'Disable'}, 'folder'),
+    ('dedup',         {'static_snapshot': 'Disable', 'static_dedup': 'Enable'}, 'folder'),
+    ('snapshot+dedup', {'static_snapshot': 'Enable', 'static_dedup': 'Enable'}, 'snapshot'),
+    ('lazy',          {'static_snapshot': 'Disable', 'static_lazy': 'Enable'}, 'folder'),
+    ('snapshot+lazy', {'static_snapshot': 'Enable', 'static_lazy': 'Enable'}, 'snapshot'),
+    ('tar.gz',        {'static_snapshot': 'Disable'}, '.tar.gz'),
+    ('zip',           {'static_snapshot': 'Disable'}, '.zip'),
+]
+if zstandard is not None:
+    METHODS.append(('tar.zst', {'static_snapshot': 'Disable'}, '.tar.zst'))
+
+
+def folder_size(base_dir):
+    size = 0
+    for dirName, subdirList, fileList in os.walk(base_dir):
+        for fname in fileList:
+            size += os.path.getsize(os.path.join(dirName, fname))
+    return size
+
+
+def make_archive(base_dir, ext):
+    path = os.path.normpath(base_dir) + ext
+    if ext == '.zip':
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for dirName, subdirList, fileList in os.walk(base_dir):
+                for fname in fileList:
+                    fpath = os.path.join(dirName, fname)
+                    archive.write(fpath, os.path.relpath(fpath, base_dir))
+    elif ext == '.tar.zst':
+        data = io.BytesIO()
+        with tarfile.open(fileobj=data, mode='w') as tar:
+            tar.add(base_dir, arcname='.')
+        with open(path, 'wb') as f:
+            f.write(zstandard.ZstdCompressor(level=19).compress(data.getvalue()))
+    else:
+        with tarfile.open(path, mode='w:gz') as tar:
+            tar.add(base_dir, arcname='.')
+    return path
+
+
+def time_load(name, config_data, repeat):
+    times = []
+    for i in range(repeat):
+        resource_dictionary = ResourceDictionary()
+        start = time.perf_counter()
+        load_static(name, 'redfish', 'Local', '/redfish/v1/', resource_dictionary, config_data)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), len(resource_dictionary.resdict)
+
+
+def memory_load(name, config_data):
+    tracemalloc.start()
+    resource_dictionary = ResourceDictionary()
+    load_static(name, 'redfish', 'Local', '/redfish/v1/', resource_dictionary, config_data)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def bench_method(name, config_data, repeat):
+    elapsed, count = time_load(name, config_data, repeat)
+    return elapsed, count, memory_load(name, config_data)
+
+
+def bench_mockup(name, repeat, methods):
+    base_dir = static_dir(name, 'redfish')
+    snapshot = snapshot_path(base_dir)
+    built_snapshot = False
+    if not os.path.exists(snapshot):
+        build_snapshot(base_dir)
+        built_snapshot = True
+    try:
+        results = {}
+        for method, config_data, source in methods:
+            if source == 'folder':
+                results[method] = bench_method(name, config_data, repeat) + (folder_size(base_dir),)
+            elif source == 'snapshot':
+                results[method] = bench_method(name, config_data, repeat) + (os.path.getsize(snapshot),)
+            else:
+                archive = make_archive(base_dir, source)
+                try:
+                    results[method] = bench_method(name, config_data, repeat) + (os.path.getsize(archive),)
+                finally:
+                    os.remove(archive)
+    finally:
+        if built_snapshot:
+            os.remove(snapshot)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-mockups', nargs='+', default=None, help='Mockups to benchmark (default: all)')
+    parser.add_argument('-repeat', type=int, default=5, help='Loads per method, the median is reported')
+    parser.add_argument('-workers', type=int, nargs='*', default=[2, 4], help='Worker process counts for parallel loads')
+    parser.add_argument('-exclude', nargs='*', default=[], help='Glob patterns of static resources to leave out (see STATIC_EXCLUDE)')
+    args = parser.parse_args()
+
+    methods = METHODS + [('parallel-%d' % workers, {'static_snapshot': 'Disable', 'static_workers': workers}, 'folder')
+                         for workers in args.workers]
+    if args.exclude:
+        methods += [(method + '+exclude', dict(config_data, static_exclude=args.exclude), source)
+                    for method, config_data, source in METHODS[:2]]
+
+    mockups = args.mockups
+    if mockups is None:
+        static = static_dir('', 'redfish')
+        mockups = sorted(d for d in os.listdir(static) if os.path.isdir(os.path.join(static, d)))
+
+    baseline = methods[0][0]
+    print('CPUs: %d' % os.cpu_count())
+    print('%-24s %-18s %9s %10s %8s %12s %10s' % ('Mockup', 'Method', 'Documents', 'Time (ms)', 'Speedup', 'Memory (KB)', 'Disk (KB)'))
+    for name in mockups:
+        results = bench_mockup(name, args.repeat, methods)
+        for method, config_data, source in methods:
+            elapsed, count, size, disk = results[method]
+            speedup = results[baseline][0] / elapsed
+            print('%-24s %-18s %9d %10.1f %7.1fx %12d %10d' % (name, method, count, elapsed * 1000, speedup, size / 1024, disk / 1024))